@@ -0,0 +1,112 @@
+"""
+Benchmark of the analytics snapshot.
+
+Builds a snapshot of synthetic contracts (one million by default) and events from row chunks, as streamed
+from the database, then times saving it to a cache directory, memory-mapping it back, and repeated slices
+against grouping the same rows in a Python loop. Needs no database.
+
+Usage:
+    python benchmarks/bench_analytics.py [--contracts 1000000] [--events 200000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from utils.analytics import (  # noqa: E402
+    CONTRACT_COLUMNS,
+    EVENT_COLUMNS,
+    SLICE_GROUPINGS,
+    AnalyticsSnapshot,
+    Frame,
+)
+
+CHUNK_SIZE = 10000
+FIRST_DAY = date(2020, 1, 1)
+
+
+def contract_rows(generator: random.Random, count: int) -> list:
+    return [
+        (
+            i + 1,
+            generator.randrange(1, 5000),
+            generator.randrange(0, 50),
+            generator.randrange(100000, 10000000),
+            generator.randrange(0, 100000),
+            generator.random() < 0.6,
+            FIRST_DAY + timedelta(days=generator.randrange(5 * 365)),
+        )
+        for i in range(count)
+    ]
+
+
+def event_rows(generator: random.Random, count: int, contracts: int) -> list:
+    rows = []
+    for i in range(count):
+        start = datetime(2020, 1, 1, 8) + timedelta(hours=generator.randrange(5 * 365 * 24))
+        end = start + timedelta(hours=4)
+        attendees = generator.randrange(2000)
+        rows.append((i + 1, generator.randrange(1, contracts + 1), generator.randrange(0, 20), start, end, attendees))
+    return rows
+
+
+def chunks(rows: list):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        yield rows[start : start + CHUNK_SIZE]
+
+
+def timed(label: str, function, repeat: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<32} {elapsed * 1000:10.3f} ms")
+    return result
+
+
+def python_by_month(rows: list) -> dict:
+    totals = defaultdict(lambda: [0, 0])
+    for row in rows:
+        total = totals[row[6].strftime("%Y-%m")]
+        total[0] += 1
+        total[1] += row[3]
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=1000000)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    contracts = contract_rows(generator, args.contracts)
+    events = event_rows(generator, args.events, args.contracts)
+    print(f"{args.contracts} contracts, {args.events} events")
+
+    snapshot = timed(
+        "build from row chunks",
+        lambda: AnalyticsSnapshot(
+            Frame.from_chunks(chunks(contracts), CONTRACT_COLUMNS), Frame.from_chunks(chunks(events), EVENT_COLUMNS), {}
+        ),
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        timed("save cache", lambda: snapshot.save(directory))
+        cached = timed("load cache (mmap)", lambda: AnalyticsSnapshot.load(directory, {}))
+        for by in SLICE_GROUPINGS:
+            timed(f"slice by {by}", lambda: cached.slice(by), args.repeat)
+        year = date(2023, 1, 1), date(2023, 12, 31)
+        timed("slice by month, signed, 2023", lambda: cached.slice("month", True, *year), args.repeat)
+    timed("python loop by month", lambda: python_by_month(contracts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Throughput benchmark of the database export and restore, in rows per second.
+
+Fills the test database with a synthetic dataset (one million rows by default, spread over users, clients,
+contracts and events), then times the export and the restore in both formats. The content of the test
+database is backed up first and restored at the end. Requires the MySQL server and the .env configuration
+used by the tests.
+
+Usage:
+    python benchmarks/bench_backup.py [--rows 1000000] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from sqlalchemy import insert, text  # noqa: E402
+from config import Base, Config  # noqa: E402
+from utils.backup_manager import BackupManager  # noqa: E402
+from utils.session_manager import get_engine_root  # noqa: E402
+
+BATCH_SIZE = 10000
+
+
+def insert_batches(connection, table, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            connection.execute(insert(table), batch)
+            batch = []
+    if batch:
+        connection.execute(insert(table), batch)
+
+
+def synthetic_rows(users: int, clients: int, contracts: int, events: int) -> dict:
+    """
+    Generators of the synthetic rows of each table.
+    """
+    start = datetime(2030, 1, 1, 9, 0, 0)
+    first_day = date(2024, 1, 1)
+    return {
+        "Department": (
+            {"id": i, "name": name} for i, name in enumerate(["Commercial", "Support", "Gestion"], 1)
+        ),
+        "User": (
+            {
+                "id": i,
+                "username": f"user{i}",
+                "password": "x" * 60,
+                "email": f"user{i}@example.com",
+                "name": f"User {i}",
+                "department_id": i % 3 + 1,
+            }
+            for i in range(1, users + 1)
+        ),
+        "Client": (
+            {
+                "id": i,
+                "full_name": f"Client {i}",
+                "email": f"client{i}@example.com",
+                "phone": "+33 6 12 34 56 78",
+                "company_name": f"Company {i % 5000}",
+                "date_created": first_day + timedelta(days=i % 365),
+                "last_contact_date": None,
+                "commercial_contact_id": i % users + 1,
+            }
+            for i in range(1, clients + 1)
+        ),
+        "Contract": (
+            {
+                "id": i,
+                "client_id": i % clients + 1,
+                "commercial_contact_id": i % users + 1,
+                "total_amount": 1000.0 + i % 9000,
+                "amount_due": float(i % 1000),
+                "date_created": first_day + timedelta(days=i % 365),
+                "signed": i % 4 != 0,
+            }
+            for i in range(1, contracts + 1)
+        ),
+        "Event": (
+            {
+                "id": i,
+                "contract_id": i % contracts + 1,
+                "client_id": i % clients + 1,
+                "event_name": f"Event {i}",
+                "event_date_start": start + timedelta(hours=i),
+                "event_date_end": start + timedelta(hours=i + 6),
+                "support_contact_id": i % users + 1 if i % 3 else None,
+                "location": "Paris",
+                "attendees": 10 + i % 490,
+                "notes": None if i % 2 else "Some notes",
+            }
+            for i in range(1, events + 1)
+        ),
+    }
+
+
+def fill_database(total: int) -> int:
+    """
+    Replaces the content of the test database with a synthetic dataset and returns its number of rows.
+    """
+    users = max(10, total // 1000)
+    clients = total * 2 // 10
+    contracts = total * 3 // 10
+    events = total - users - clients - contracts
+
+    with get_engine_root().connect() as connection:
+        connection.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(text(f"TRUNCATE TABLE `{table.name}`"))
+        connection.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+        for name, rows in synthetic_rows(users, clients, contracts, events).items():
+            insert_batches(connection, Base.metadata.tables[name], rows)
+        connection.commit()
+    return 3 + users + clients + contracts + events
+
+
+def directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def report(name: str, rows: int, elapsed: float, extra: str = ""):
+    print(f"{name:<22} {rows:>9} rows  {elapsed:>8.2f} s  {rows / elapsed:>10,.0f} rows/s  {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    Config.set_use_test_database(True)
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = os.path.join(directory, "snapshot")
+        BackupManager.export(snapshot)
+        try:
+            started = time.perf_counter()
+            rows = fill_database(args.rows)
+            report("generate", rows, time.perf_counter() - started)
+
+            for output_format in ("jsonl", "csv"):
+                backup = os.path.join(directory, output_format)
+                started = time.perf_counter()
+                BackupManager.export(backup, output_format)
+                size = f"{directory_size(backup) / 1e6:.1f} MB"
+                report(f"export {output_format}", rows, time.perf_counter() - started, size)
+
+                for workers in sorted({1, args.workers}):
+                    started = time.perf_counter()
+                    BackupManager.restore(backup, workers)
+                    report(f"restore {output_format} x{workers}", rows, time.perf_counter() - started)
+        finally:
+            BackupManager.restore(snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of BatchValidator against the one-value-at-a-time DataValidator checks.
+
+Validates synthetic client and event columns without a database, so that only the checks are measured.
+
+Usage:
+    python benchmarks/bench_batch_validator.py [--rows 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from utils.batch_validator import BatchValidator  # noqa: E402
+from utils.data_validator import DataValidator  # noqa: E402
+
+
+def make_columns(count: int) -> dict:
+    return {
+        "full_name": [f"Client {i}" if i % 100 else "" for i in range(count)],
+        "email": [f"client{i}@example.com" if i % 50 else f"client{i}@invalid" for i in range(count)],
+        "phone": [f"+33 6 12 34 {i % 100:02d} 00" for i in range(count)],
+        "attendees": [str(i % 300) for i in range(count)],
+        "event_date_start": [f"2030-{i % 12 + 1:02d}-01 09:00:00" for i in range(count)],
+        "event_date_end": [f"2030-{i % 12 + 1:02d}-01 {8 + i % 10:02d}:00:00" for i in range(count)],
+    }
+
+
+RULES = [
+    ("full_name", BatchValidator.check_strings, {"field_name": "Full Name"}),
+    ("email", BatchValidator.check_emails, {}),
+    ("phone", BatchValidator.check_phones, {}),
+    ("attendees", BatchValidator.check_attendees, {}),
+    ("event_date_start", BatchValidator.check_datetimes, {"field_name": "Event Date Start"}),
+    ("event_date_end", BatchValidator.check_datetimes, {"field_name": "Event Date End"}),
+]
+
+
+def bench_batch(columns: dict) -> tuple:
+    started = time.perf_counter()
+    errors = BatchValidator.validate(columns, RULES)
+    errors += BatchValidator.check_datetime_ranges(columns["event_date_start"], columns["event_date_end"])
+    return time.perf_counter() - started, len(errors)
+
+
+def bench_per_value(columns: dict) -> tuple:
+    started = time.perf_counter()
+    errors = 0
+    for i in range(len(columns["email"])):
+        checks = [
+            DataValidator.check_string(columns["full_name"][i], "Full Name"),
+            DataValidator.check_email(columns["email"][i]),
+            DataValidator.check_phone(columns["phone"][i]),
+            DataValidator.check_attendees(columns["attendees"][i], "Attendees"),
+            DataValidator.check_datetime(columns["event_date_start"][i], "Start"),
+            DataValidator.check_datetime(
+                columns["event_date_end"][i], "Event Date End", start_datetime=columns["event_date_start"][i]
+            ),
+        ]
+        errors += sum(1 for check in checks if check)
+    return time.perf_counter() - started, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    columns = make_columns(args.rows)
+    for name, bench in (("BatchValidator", bench_batch), ("DataValidator per value", bench_per_value)):
+        elapsed, errors = bench(columns)
+        print(f"{name:<24} {elapsed * 1000:>9.1f} ms  {args.rows / elapsed:>12,.0f} rows/s  {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Throughput benchmark of the bulk client import, in rows per second.
+
+Imports a synthetic CSV file into the test database with ImportController, and inserts a sample of the
+same rows one at a time with ClientController.create_client for comparison. The benchmark clients are
+deleted afterwards. Requires the MySQL server and the .env configuration used by the tests.
+
+Usage:
+    python benchmarks/bench_client_import.py [--rows 20000] [--chunk-size 1000] [--single-rows 500]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from config import Config  # noqa: E402
+from controllers.client_controller import ClientController  # noqa: E402
+from controllers.import_controller import ImportController  # noqa: E402
+from models.client import Client  # noqa: E402
+from models.contract import Contract  # noqa: E402,F401
+from models.department import Department  # noqa: E402,F401
+from models.event import Event  # noqa: E402,F401
+from models.user import User  # noqa: E402
+from utils.session_manager import get_session_root  # noqa: E402
+
+EMAIL_PREFIX = "bench-import-"
+
+
+def write_csv(path: str, count: int):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["full_name", "email", "phone", "company_name"])
+        for i in range(count):
+            writer.writerow([f"Bench Client {i}", f"{EMAIL_PREFIX}{i}@example.com", "+33 6 12 34 56 78", "Bench Inc"])
+
+
+def delete_bench_clients():
+    session = get_session_root()
+    session.query(Client).filter(Client.email.like(f"{EMAIL_PREFIX}%")).delete(synchronize_session=False)
+    session.commit()
+    session.close()
+
+
+def report(name: str, rows: int, elapsed: float):
+    print(f"{name:<14} {rows:>8} rows  {elapsed:>8.2f} s  {rows / elapsed:>10,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--single-rows", type=int, default=500, help="Rows inserted one at a time for comparison.")
+    args = parser.parse_args()
+
+    Config.set_use_test_database(True)
+    session = get_session_root()
+    commercial = session.query(User).first()
+    session.close()
+    if commercial is None:
+        sys.exit("The test database has no user, run the tests or `main.py initialize` first.")
+
+    delete_bench_clients()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clients.csv")
+            write_csv(path, args.rows)
+            started = time.perf_counter()
+            result = ImportController.import_clients(path, commercial.id, args.chunk_size)
+            elapsed = time.perf_counter() - started
+        report("bulk import", result.imported, elapsed)
+
+        started = time.perf_counter()
+        for i in range(args.single_rows):
+            ClientController.create_client(
+                f"Bench Single {i}", f"{EMAIL_PREFIX}single-{i}@example.com", "+33 6 12 34 56 78", "Bench Inc",
+                date.today(), commercial.id,
+            )
+        elapsed = time.perf_counter() - started
+        report("one at a time", args.single_rows, elapsed)
+    finally:
+        delete_bench_clients()
+
+
+if __name__ == "__main__":
+    main()
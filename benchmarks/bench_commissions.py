@@ -0,0 +1,74 @@
+"""
+Benchmark of the commission engine.
+
+Computes the commissions of a team of commercials (fifty by default, each with its own tiered rule) on a
+year of synthetic contracts (one million by default, 60% signed), as AnalyticsController.commissions does
+on the analytics snapshot: selecting the signed contracts of the year, then grouping and applying the
+rules with utils.commissions. Loading the snapshot is measured by bench_analytics.py. Needs no database.
+
+Usage:
+    python benchmarks/bench_commissions.py [--contracts 1000000] [--commercials 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from utils.analytics import EVENT_COLUMNS, AnalyticsSnapshot, Frame  # noqa: E402
+from utils.commissions import compute_commissions, parse_rules  # noqa: E402
+
+YEAR = date(2026, 1, 1), date(2026, 12, 31)
+
+
+def synthetic_snapshot(contracts: int, commercials: int) -> AnalyticsSnapshot:
+    generator = np.random.default_rng(0)
+    columns = {
+        "id": np.arange(1, contracts + 1),
+        "client_id": generator.integers(1, 5000, contracts),
+        "commercial_contact_id": generator.integers(0, commercials + 1, contracts),
+        "total_cents": generator.integers(100000, 10000000, contracts),
+        "due_cents": generator.integers(0, 100000, contracts),
+        "signed": generator.random(contracts) < 0.6,
+        "date_created": np.datetime64(YEAR[0]) + generator.integers(0, 365, contracts),
+    }
+    events = Frame({name: np.zeros(0, dtype=dtype) for name, dtype in EVENT_COLUMNS.items()})
+    return AnalyticsSnapshot(Frame(columns), events, {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=1000000)
+    parser.add_argument("--commercials", type=int, default=50)
+    args = parser.parse_args()
+
+    snapshot = synthetic_snapshot(args.contracts, args.commercials)
+    rules = parse_rules(
+        {
+            "default": 5,
+            "commercials": {
+                str(commercial_id): [
+                    {"from": 0, "rate": 2 + commercial_id % 3},
+                    {"from": 100000 * (1 + commercial_id % 4), "rate": 5},
+                    {"from": 1000000, "rate": 7.5},
+                ]
+                for commercial_id in range(1, args.commercials + 1)
+            },
+        }
+    )
+
+    started = time.perf_counter()
+    contracts = snapshot.contracts.filter(snapshot.contract_mask(True, *YEAR), ["commercial_contact_id", "total_cents"])
+    rows = compute_commissions(contracts["commercial_contact_id"], contracts["total_cents"], rules)
+    elapsed = time.perf_counter() - started
+    print(f"{args.contracts} contracts, {args.commercials} commercials: {elapsed * 1000:.1f} ms")
+    print(f"{len(contracts)} signed contracts, {sum(row.commission for row in rows):,} paid in commissions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark of the deletion of a collaborator with a large portfolio.
+
+Creates two collaborators in the test database, each owning the same number of clients with one contract
+and one event per client, then times UserController.delete_user in one transaction for the first and by
+chunks for the second, bottom-up: events, contracts, then clients. None of the rows is
+loaded by the ORM. Requires the MySQL server and the .env configuration used by the tests.
+
+Usage:
+    python benchmarks/bench_delete_user.py [--clients 33000] [--chunk-size 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from sqlalchemy import insert, select  # noqa: E402
+from config import Config  # noqa: E402
+from controllers.user_controller import UserController  # noqa: E402
+from models.client import Client  # noqa: E402
+from models.contract import Contract  # noqa: E402
+from models.department import Department  # noqa: E402,F401
+from models.event import Event  # noqa: E402
+from models.user import User  # noqa: E402
+from utils.session_manager import get_session_root  # noqa: E402
+
+BATCH_SIZE = 5000
+USERNAME_PREFIX = "bench-delete-"
+
+
+def insert_batches(session, table, rows: list):
+    for start in range(0, len(rows), BATCH_SIZE):
+        session.execute(insert(table), rows[start : start + BATCH_SIZE])
+
+
+def create_portfolio(session, name: str, clients: int) -> int:
+    """
+    Creates a collaborator owning ``clients`` clients, each with a contract and an event, and returns its ID.
+    """
+    user = User(username=f"{USERNAME_PREFIX}{name}", password="x" * 60, email=f"{name}@bench.example.com", name=name)
+    session.add(user)
+    session.commit()
+
+    insert_batches(
+        session,
+        Client.__table__,
+        [
+            {
+                "full_name": f"Bench Client {i}",
+                "email": f"bench-delete-{name}-{i}@example.com",
+                "phone": "+33 6 12 34 56 78",
+                "company_name": "Bench Inc",
+                "date_created": date.today(),
+                "commercial_contact_id": user.id,
+            }
+            for i in range(clients)
+        ],
+    )
+    client_ids = session.scalars(select(Client.id).where(Client.commercial_contact_id == user.id)).all()
+    insert_batches(
+        session,
+        Contract.__table__,
+        [
+            {
+                "client_id": client_id,
+                "commercial_contact_id": user.id,
+                "total_amount": 1000.0,
+                "amount_due": 0.0,
+                "date_created": date.today(),
+                "signed": True,
+            }
+            for client_id in client_ids
+        ],
+    )
+    contracts = session.execute(
+        select(Contract.id, Contract.client_id).where(Contract.commercial_contact_id == user.id)
+    ).all()
+    insert_batches(
+        session,
+        Event.__table__,
+        [
+            {
+                "contract_id": contract_id,
+                "client_id": client_id,
+                "event_name": "Bench Event",
+                "event_date_start": datetime(2030, 1, 1, 9),
+                "event_date_end": datetime(2030, 1, 1, 18),
+                "location": "Paris",
+                "attendees": 10,
+                "notes": "",
+            }
+            for contract_id, client_id in contracts
+        ],
+    )
+    session.commit()
+    return user.id
+
+
+def delete_bench_users():
+    session = get_session_root()
+    for user in session.query(User).filter(User.username.like(f"{USERNAME_PREFIX}%")).all():
+        UserController.delete_user(session, user.id, BATCH_SIZE)
+    session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=33000, help="Clients per collaborator, each with 2 children.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    Config.set_use_test_database(True)
+    delete_bench_users()
+    session = get_session_root()
+    try:
+        rows = args.clients * 3
+        for name, label, chunk_size in (
+            ("single", "one transaction", None),
+            ("chunked", f"chunks of {args.chunk_size}", args.chunk_size),
+        ):
+            user_id = create_portfolio(session, name, args.clients)
+            started = time.perf_counter()
+            if not UserController.delete_user(session, user_id, chunk_size):
+                sys.exit(f"Deleting the {name} collaborator failed.")
+            elapsed = time.perf_counter() - started
+            print(f"{label:<20} {rows:>8} rows  {elapsed:>8.2f} s")
+    finally:
+        session.close()
+        delete_bench_users()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Throughput benchmark of the list/filter output paths, in rows per second.
+
+Compares the machine-readable streaming formats with the rich table rendering on synthetic event rows,
+without a database so that only the formatting cost is measured.
+
+Usage:
+    python benchmarks/bench_output_formats.py [--rows 50000]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from rich.console import Console  # noqa: E402
+from utils.stream_writer import write_rows  # noqa: E402
+from utils.table_printer import build_table  # noqa: E402
+
+EventRow = namedtuple(
+    "EventRow",
+    "id contract_id client_id event_name event_date_start event_date_end support_contact_id location attendees notes",
+)
+
+
+def make_rows(count: int) -> list:
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    return [
+        EventRow(i, i // 3, i // 9, f"Event {i}", start + timedelta(hours=i), start + timedelta(hours=i + 4), i % 7,
+                 "Paris", 50 + i % 200, "Some notes")
+        for i in range(count)
+    ]
+
+
+def bench_stream(rows: list, output_format: str) -> float:
+    sink = io.StringIO()
+    started = time.perf_counter()
+    write_rows((row._asdict() for row in rows), output_format, sink)
+    return len(rows) / (time.perf_counter() - started)
+
+
+def bench_rich(rows: list) -> float:
+    console = Console(file=io.StringIO(), width=200, force_terminal=True)
+    started = time.perf_counter()
+    console.print(build_table([row._asdict() for row in rows], "Events"))
+    return len(rows) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = {fmt: bench_stream(rows, fmt) for fmt in ("json", "jsonl", "csv", "tsv")}
+    # The rich path is orders of magnitude slower, so it is measured on a smaller sample.
+    results["rich table"] = bench_rich(rows[: min(len(rows), 2000)])
+
+    for name, rate in results.items():
+        print(f"{name:>10}: {rate:>12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
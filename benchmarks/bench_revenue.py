@@ -0,0 +1,120 @@
+"""
+Benchmark of the revenue report on a large contract table.
+
+Inserts synthetic contracts (one million by default) spread over a few commercials and several years in the
+test database, then times the GROUP BY reports of ReportController against streaming every contract and
+summing in Python. The benchmark collaborators and their contracts are deleted afterwards. Requires the
+MySQL server and the .env configuration used by the tests.
+
+Usage:
+    python benchmarks/bench_revenue.py [--contracts 1000000] [--commercials 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "epicevents"))
+
+from sqlalchemy import insert  # noqa: E402
+from config import Config  # noqa: E402
+from controllers.report_controller import ReportController  # noqa: E402
+from controllers.user_controller import UserController  # noqa: E402
+from models.client import Client  # noqa: E402,F401
+from models.contract import Contract  # noqa: E402
+from models.department import Department  # noqa: E402,F401
+from models.event import Event  # noqa: E402,F401
+from models.user import User  # noqa: E402
+from utils.session_manager import get_session_root  # noqa: E402
+
+BATCH_SIZE = 10000
+USERNAME_PREFIX = "bench-revenue-"
+
+
+def create_contracts(session, contracts: int, commercials: int):
+    users = [
+        User(username=f"{USERNAME_PREFIX}{i}", password="x" * 60, email=f"revenue{i}@bench.example.com", name=f"C{i}")
+        for i in range(commercials)
+    ]
+    session.add_all(users)
+    session.commit()
+    user_ids = [user.id for user in users]
+
+    first_day = date(2020, 1, 1)
+    batch = []
+    for i in range(contracts):
+        batch.append(
+            {
+                "client_id": None,
+                "commercial_contact_id": user_ids[i % commercials],
+                "total_amount": 1000.0 + i % 9000,
+                "amount_due": float(i % 3 * 250),
+                "date_created": first_day + timedelta(days=i % 1800),
+                "signed": i % 4 != 0,
+            }
+        )
+        if len(batch) == BATCH_SIZE:
+            session.execute(insert(Contract.__table__), batch)
+            session.commit()
+            batch = []
+    if batch:
+        session.execute(insert(Contract.__table__), batch)
+        session.commit()
+
+
+def delete_bench_users():
+    session = get_session_root()
+    for user in session.query(User).filter(User.username.like(f"{USERNAME_PREFIX}%")).all():
+        UserController.delete_user(session, user.id, BATCH_SIZE)
+    session.close()
+
+
+def sum_in_python(session) -> int:
+    """
+    The report computed by streaming every contract, as done by hand from the contract list.
+    """
+    totals = defaultdict(lambda: [0, 0, 0.0, 0.0])
+    query = session.query(
+        Contract.commercial_contact_id, Contract.signed, Contract.total_amount, Contract.amount_due
+    ).yield_per(BATCH_SIZE)
+    for commercial_contact_id, signed, total_amount, amount_due in query:
+        group = totals[commercial_contact_id]
+        group[0] += 1
+        group[1] += signed
+        group[2] += total_amount
+        group[3] += amount_due
+    return len(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=1000000)
+    parser.add_argument("--commercials", type=int, default=20)
+    args = parser.parse_args()
+
+    Config.set_use_test_database(True)
+    delete_bench_users()
+    session = get_session_root()
+    try:
+        started = time.perf_counter()
+        create_contracts(session, args.contracts, args.commercials)
+        print(f"{'setup':<22} {time.perf_counter() - started:>8.2f} s")
+
+        for name, report in (
+            ("GROUP BY commercial", lambda: list(ReportController.revenue_by_commercial(session))),
+            ("GROUP BY month", lambda: list(ReportController.revenue_by_month(session))),
+            ("Python sum", lambda: range(sum_in_python(session))),
+        ):
+            started = time.perf_counter()
+            groups = len(report())
+            print(f"{name:<22} {time.perf_counter() - started:>8.2f} s  {groups:>6} groups")
+    finally:
+        session.close()
+        delete_bench_users()
+
+
+if __name__ == "__main__":
+    main()
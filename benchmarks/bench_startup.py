@@ -0,0 +1,65 @@
+"""
+CLI startup benchmark based on `python -X importtime`.
+
+Runs light commands that should not load the database layer, sums the import time of their top-level
+modules and fails if the median exceeds the budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 150] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MAIN = os.path.join(ROOT, "epicevents", "main.py")
+
+COMMANDS = [["--help"], ["logout", "--help"], ["client", "--help"]]
+
+
+def import_time_ms(args: list) -> tuple:
+    """
+    Run the CLI once and return (total import time in ms, heaviest top-level modules).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN, *args], capture_output=True, text=True, cwd=ROOT, check=True
+    )
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Only top-level imports (no indentation) are summed, their cumulative time includes their children.
+        if not name.startswith("  "):
+            total += int(cumulative)
+            modules.append((int(cumulative), name.strip()))
+    return total / 1000, sorted(modules, reverse=True)[:3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = False
+    for command in COMMANDS:
+        timings = []
+        for _ in range(args.runs):
+            total, heaviest = import_time_ms(command)
+            timings.append(total)
+        median = statistics.median(timings)
+        status = "OK" if median <= args.budget_ms else "OVER BUDGET"
+        over_budget = over_budget or median > args.budget_ms
+        print(f"main.py {' '.join(command):<16} {median:8.1f} ms  [{status}]")
+        print("    heaviest: " + ", ".join(f"{name} ({us / 1000:.1f} ms)" for us, name in heaviest))
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 from dotenv import load_dotenv, find_dotenv
 import os
-import sentry_sdk
 from sqlalchemy.ext.declarative import declarative_base
 
 
@@ -40,6 +39,18 @@ class Config:
     ADMIN_DB_USER = os.getenv("ADMIN_DB_USER")
     ADMIN_DB_PASSWORD = os.getenv("ADMIN_DB_PASSWORD")
     SENTRY_DSN = os.getenv("SENTRY_DSN")
+
+    # Telemetry: "sentry", "file" (JSON lines written to TELEMETRY_FILE, for offline environments) or "none"
+    TELEMETRY_SINK = os.getenv("TELEMETRY_SINK", "sentry").lower()
+    TELEMETRY_FILE = os.getenv("TELEMETRY_FILE", "epicevents_telemetry.jsonl")
+    # Share of controller operations traced with their SQL statements
+    TRACES_SAMPLE_RATE = float(os.getenv("TRACES_SAMPLE_RATE", "0.05"))
+    # Whether expected errors (expired tokens, invalid input...) are reported, and the minimum
+    # number of seconds between two reports of the same expected error
+    CAPTURE_EXPECTED_ERRORS = os.getenv("CAPTURE_EXPECTED_ERRORS", "true").lower() == "true"
+    EXPECTED_ERROR_INTERVAL = int(os.getenv("EXPECTED_ERROR_INTERVAL", "300"))
+    # Age in days after which ended events are moved to the EventArchive table by `event archive`
+    EVENT_ARCHIVE_AFTER_DAYS = int(os.getenv("EVENT_ARCHIVE_AFTER_DAYS", "365"))
     USE_TEST_DATABASE = False  # Variable to control the use of test database
 
     @staticmethod
@@ -82,15 +93,13 @@ class Config:
             "DB_PORT",
             "ADMIN_DB_USER",
             "ADMIN_DB_PASSWORD",
-            "SENTRY_DSN",
         ]
+        if Config.TELEMETRY_SINK == "sentry":
+            required_vars.append("SENTRY_DSN")
         for var in required_vars:
             if not getattr(Config, var):
                 raise ValueError(f"The environment variable {var} is not set.")
 
 
-# Initialize Sentry
-sentry_sdk.init(dsn=Config.SENTRY_DSN, traces_sample_rate=1.0)
-
 # Define the Base class for SQLAlchemy models
 Base = declarative_base()
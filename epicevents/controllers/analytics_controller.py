@@ -0,0 +1,124 @@
+import numpy as np
+from sqlalchemy import BigInteger, cast, func, select, union_all
+from models.contract import Contract
+from models.event import Event
+from models.event_archive import EventArchive
+from models.user import User
+from utils.analytics import CONTRACT_COLUMNS, EVENT_COLUMNS, AnalyticsSnapshot, Frame
+from utils.commissions import CommissionRules, compute_commissions
+
+# Columns of the contracts in the snapshot. Amounts are converted to cents by the database, which multiplies
+# the DECIMAL values exactly.
+CONTRACT_SNAPSHOT_COLUMNS = [
+    Contract.id,
+    func.coalesce(Contract.client_id, 0),
+    func.coalesce(Contract.commercial_contact_id, 0),
+    cast(Contract.total_amount * 100, BigInteger),
+    cast(Contract.amount_due * 100, BigInteger),
+    Contract.signed,
+    Contract.date_created,
+]
+
+# Tables read by the snapshot, whose row count and last update make up its stamp. The events are read
+# together with the archived ones.
+STAMPED_TABLES = {"contracts": Contract, "events": Event, "archived_events": EventArchive}
+
+
+def _event_snapshot_columns(model) -> list:
+    """
+    Returns the columns of the events in the snapshot, for the Event or the EventArchive table.
+    """
+    return [
+        model.id,
+        model.contract_id,
+        func.coalesce(model.support_contact_id, 0),
+        model.event_date_start,
+        model.event_date_end,
+        func.coalesce(model.attendees, 0),
+    ]
+
+
+class AnalyticsController:
+    """
+    Loads the analytics snapshot: the projected contract and event columns, archived events included, read
+    once with a streamed query per table and kept as NumPy arrays, optionally through a cache directory.
+    The commissions are computed on the snapshot too.
+    """
+
+    @staticmethod
+    def snapshot_stamp(session) -> dict:
+        """
+        Describes the current content of the snapshot tables with one cheap query per table: the number of
+        rows and the last updated_at, read from its index. Every insert and update sets updated_at, at the
+        microsecond, and every deletion changes the row count. The number of users is added, since deleting a
+        user changes the events and archived events through the ON DELETE rules of the database, which do not
+        set updated_at.
+        """
+        stamp = {}
+        for name, model in STAMPED_TABLES.items():
+            query = select(func.count(), func.max(model.updated_at)).select_from(model)
+            count, last_update = session.execute(query).one()
+            stamp[name] = [count, last_update.isoformat() if last_update else None]
+        stamp["users"] = session.execute(select(func.count()).select_from(User)).scalar()
+        return stamp
+
+    @staticmethod
+    def _read_frame(session, query, dtypes: dict, batch_size: int) -> Frame:
+        result = session.execute(query.execution_options(yield_per=batch_size))
+        return Frame.from_chunks(result.partitions(), dtypes)
+
+    @staticmethod
+    def load_snapshot(session, cache_dir: str = None, batch_size: int = 10000) -> AnalyticsSnapshot:
+        """
+        Loads the analytics snapshot, from the cache directory when its stamp matches the database, and from
+        the database otherwise, refreshing the cache.
+
+        The stamp is read before the columns, so a write committed in between makes the cache look stale at
+        the next load rather than hiding the write.
+        Args:
+            session (Session): The SQLAlchemy session.
+            cache_dir (str, optional): Directory of the memory-mapped cache.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Returns:
+            AnalyticsSnapshot: The snapshot.
+        """
+        stamp = AnalyticsController.snapshot_stamp(session)
+        if cache_dir:
+            snapshot = AnalyticsSnapshot.load(cache_dir, stamp)
+            if snapshot is not None:
+                return snapshot
+
+        contracts = select(*CONTRACT_SNAPSHOT_COLUMNS).order_by(Contract.id)
+        events = union_all(
+            select(*_event_snapshot_columns(Event)), select(*_event_snapshot_columns(EventArchive))
+        ).order_by("id")
+        snapshot = AnalyticsSnapshot(
+            AnalyticsController._read_frame(session, contracts, CONTRACT_COLUMNS, batch_size),
+            AnalyticsController._read_frame(session, events, EVENT_COLUMNS, batch_size),
+            stamp,
+        )
+        if cache_dir:
+            snapshot.save(cache_dir)
+        return snapshot
+
+    @staticmethod
+    def commissions(session, rules: CommissionRules, date_from=None, date_to=None, cache_dir: str = None) -> list:
+        """
+        Computes the commissions of the commercial contacts on their signed contracts created in a period,
+        from the analytics snapshot.
+        Args:
+            session (Session): The SQLAlchemy session.
+            rules (CommissionRules): The commission rules.
+            date_from (date, optional): First creation date of the contracts.
+            date_to (date, optional): Last creation date of the contracts.
+            cache_dir (str, optional): Directory of the snapshot cache.
+        Returns:
+            list: One CommissionRow per commercial contact with signed contracts in the period, ordered by ID.
+        """
+        snapshot = AnalyticsController.load_snapshot(session, cache_dir)
+        contracts = snapshot.contracts.filter(
+            snapshot.contract_mask(True, date_from, date_to), ["commercial_contact_id", "total_cents"]
+        )
+        commercial_ids = np.unique(contracts["commercial_contact_id"]).tolist()
+        names = dict(session.execute(select(User.id, User.name).where(User.id.in_(commercial_ids))).all())
+        return compute_commissions(contracts["commercial_contact_id"], contracts["total_cents"], rules, names)
@@ -1,32 +1,96 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload, selectinload
+from controllers.summary_controller import SummaryController
 from models.client import Client
-import sentry_sdk
+from models.event import Event
+from utils.batch_validator import BatchValidator
+from utils.telemetry import Telemetry
 from utils.token_manager import TokenManager
-from utils.session_manager import get_session
+from utils.session_manager import get_session, iter_by_key
 from datetime import date
 
 
 class ClientController:
     @staticmethod
-    def get_all_clients(token: str) -> list:
+    def get_all_clients(token: str, offset: int = None, limit: int = None) -> list:
         """
         Retrieves all clients if the user is authenticated and authorized.
         Args:
             token (str): JWT token of the authenticated user.
+            offset (int, optional): Number of clients to skip, for paginated retrieval.
+            limit (int, optional): Maximum number of clients to return, for paginated retrieval.
         Returns:
-            list: List of Client objects.
+            list: List of Client objects ordered by ID.
         """
         try:
             key = TokenManager.load_key()
             payload = TokenManager.verify_token(token, key)
             if payload:
                 session = get_session()
-                clients = session.query(Client).all()
-                return clients
+                query = session.query(Client).order_by(Client.id)
+                if offset:
+                    query = query.offset(offset)
+                if limit:
+                    query = query.limit(limit)
+                return query.all()
             return []
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return []
 
+    @staticmethod
+    def iter_clients(token: str, batch_size: int = 1000):
+        """
+        Streams all clients as lightweight column rows if the user is authenticated and authorized.
+        Args:
+            token (str): JWT token of the authenticated user.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Yields:
+            Row: Client rows ordered by ID, exposing the client columns as attributes.
+        """
+        try:
+            key = TokenManager.load_key()
+            payload = TokenManager.verify_token(token, key)
+            if payload:
+                session = get_session()
+                yield from iter_by_key(session.query(*Client.__table__.columns), Client.id, batch_size)
+        except Exception as e:
+            Telemetry.capture_exception(e)
+
+    @staticmethod
+    def get_client_detail(token: str, client_id: int = None, full_name: str = None) -> Client:
+        """
+        Retrieves a client with everything attached to it if the user is authenticated: the commercial contact,
+        the contracts and the events with their support contacts. The client and its commercial contact are
+        read with a join, the contracts and the events with one SELECT ... WHERE client_id IN each, so three
+        queries are issued whatever the number of contracts and events, and none is lazy loaded afterwards.
+        Args:
+            token (str): JWT token of the authenticated user.
+            client_id (int, optional): The ID of the client.
+            full_name (str, optional): The full name of the client, when no ID is given.
+        Returns:
+            Client: The Client object with its relationships loaded, or None if not found.
+        """
+        try:
+            key = TokenManager.load_key()
+            payload = TokenManager.verify_token(token, key)
+            if not payload:
+                return None
+            session = get_session()
+            query = session.query(Client).options(
+                joinedload(Client.commercial_contact),
+                selectinload(Client.contracts),
+                selectinload(Client.events).joinedload(Event.support_contact),
+            )
+            if client_id is not None:
+                query = query.filter(Client.id == client_id)
+            else:
+                query = query.filter(Client.full_name == full_name)
+            return query.first()
+        except Exception as e:
+            Telemetry.capture_exception(e)
+            return None
+
     @staticmethod
     def create_client(
         full_name: str, email: str, phone: str, company_name: str, date_created: date, commercial_contact_id: int
@@ -45,13 +109,55 @@ class ClientController:
                 commercial_contact_id=commercial_contact_id,
             )
             session.add(client)
+            SummaryController.add_commercials(
+                session, SummaryController.count_clients([{"commercial_contact_id": commercial_contact_id}])
+            )
             session.commit()
             return True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             session.rollback()
             return False
 
+    @staticmethod
+    def insert_clients(session, clients: list):
+        """
+        Inserts clients in a single executemany statement, without loading them as ORM objects, and adds
+        them to the summaries of their commercials. The caller commits or rolls back the session.
+        Args:
+            session (Session): The SQLAlchemy session.
+            clients (list): Dictionaries of client column values.
+        """
+        if clients:
+            session.execute(insert(Client.__table__), clients)
+            SummaryController.add_commercials(session, SummaryController.count_clients(clients))
+
+    @staticmethod
+    def get_existing_emails(session, emails: list) -> set:
+        """
+        Returns the lowercased emails already used by a client, with one IN query.
+        Args:
+            session (Session): The SQLAlchemy session.
+            emails (list): The emails to look up.
+        Returns:
+            set: The lowercased emails found in the database.
+        """
+        found = BatchValidator.lookup(session, Client.email, emails)
+        return {email.lower() for email in found}
+
+    @staticmethod
+    def get_commercial_contact_ids(session, client_ids) -> dict:
+        """
+        Retrieve the commercial contact ID of several clients with one IN query.
+        Args:
+            session (Session): The SQLAlchemy session.
+            client_ids (iterable): The IDs of the clients.
+        Returns:
+            dict: Commercial contact ID (possibly None) by client ID, for the clients that exist.
+        """
+        found = BatchValidator.lookup(session, Client.id, client_ids, Client.commercial_contact_id)
+        return {client_id: row.commercial_contact_id for client_id, row in found.items()}
+
     @staticmethod
     def update_client(
         client_id: int, full_name: str = None, email: str = None, phone: str = None, company_name: str = None
@@ -79,7 +185,7 @@ class ClientController:
             session.commit()
             return True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             session.rollback()
             return False
 
@@ -99,7 +205,7 @@ class ClientController:
                 return client.id
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
@@ -118,5 +224,5 @@ class ClientController:
                 return client.commercial_contact_id
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
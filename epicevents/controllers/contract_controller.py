@@ -1,31 +1,60 @@
+from decimal import Decimal
+from sqlalchemy import func, insert, select, update
+from controllers.summary_controller import SummaryController
 from models.contract import Contract
-import sentry_sdk
+from utils.batch_validator import IN_CHUNK_SIZE, BatchValidator
+from utils.telemetry import Telemetry
 from utils.token_manager import TokenManager
-from utils.session_manager import get_session
+from utils.session_manager import get_session, iter_by_key
 
 
 class ContractController:
     @staticmethod
-    def get_all_contracts(token: str) -> list:
+    def get_all_contracts(token: str, offset: int = None, limit: int = None) -> list:
         """
         Retrieves all contracts if the user is authenticated and authorized.
         Args:
             token (str): JWT token of the authenticated user.
+            offset (int, optional): Number of contracts to skip, for paginated retrieval.
+            limit (int, optional): Maximum number of contracts to return, for paginated retrieval.
         Returns:
-            list: List of Contract objects.
+            list: List of Contract objects ordered by ID.
         """
         try:
             key = TokenManager.load_key()
             payload = TokenManager.verify_token(token, key)
             if payload:
                 session = get_session()
-                contracts = session.query(Contract).all()
-                return contracts
+                query = session.query(Contract).order_by(Contract.id)
+                if offset:
+                    query = query.offset(offset)
+                if limit:
+                    query = query.limit(limit)
+                return query.all()
             return []
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return []
 
+    @staticmethod
+    def iter_contracts(token: str, batch_size: int = 1000):
+        """
+        Streams all contracts as lightweight column rows if the user is authenticated and authorized.
+        Args:
+            token (str): JWT token of the authenticated user.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Yields:
+            Row: Contract rows ordered by ID, exposing the contract columns as attributes.
+        """
+        try:
+            key = TokenManager.load_key()
+            payload = TokenManager.verify_token(token, key)
+            if payload:
+                session = get_session()
+                yield from iter_by_key(session.query(*Contract.__table__.columns), Contract.id, batch_size)
+        except Exception as e:
+            Telemetry.capture_exception(e)
+
     @staticmethod
     def get_contract_by_id(contract_id: int):
         """
@@ -40,7 +69,7 @@ class ContractController:
             contract = session.query(Contract).filter_by(id=contract_id).first()
             return contract
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
@@ -61,8 +90,8 @@ class ContractController:
     def create_contract(
         client_id: int,
         commercial_contact_id: int,
-        total_amount: float,
-        amount_due: float,
+        total_amount: Decimal,
+        amount_due: Decimal,
         date_created: str,
         signed: bool,
     ) -> bool:
@@ -80,23 +109,58 @@ class ContractController:
                 signed=signed,
             )
             session.add(contract)
+            new_contract = {
+                "commercial_contact_id": commercial_contact_id,
+                "signed": signed,
+                "total_amount": total_amount,
+                "amount_due": amount_due,
+            }
+            SummaryController.add_commercials(session, SummaryController.count_contracts([new_contract]))
             session.commit()
             return True
         except ValueError as ve:
-            sentry_sdk.capture_exception(ve)
+            Telemetry.capture_exception(ve, expected=True)
             print(f"Validation Error: {ve}")
             return False
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Error creating contract: {e}")
             return False
 
+    @staticmethod
+    def insert_contracts(session, contracts: list):
+        """
+        Inserts contracts in a single executemany statement, without loading them as ORM objects, and adds
+        them to the summaries of their commercials. The caller commits or rolls back the session.
+        Args:
+            session (Session): The SQLAlchemy session.
+            contracts (list): Dictionaries of contract column values.
+        """
+        if contracts:
+            session.execute(insert(Contract.__table__), contracts)
+            SummaryController.add_commercials(session, SummaryController.count_contracts(contracts))
+
+    @staticmethod
+    def get_contracts_by_ids(session, contract_ids) -> dict:
+        """
+        Retrieve the client, commercial contact and signed status of several contracts with one IN query.
+        Args:
+            session (Session): The SQLAlchemy session.
+            contract_ids (iterable): The IDs of the contracts.
+        Returns:
+            dict: Row with the client_id, commercial_contact_id and signed attributes by contract ID,
+                for the contracts that exist.
+        """
+        return BatchValidator.lookup(
+            session, Contract.id, contract_ids, Contract.client_id, Contract.commercial_contact_id, Contract.signed
+        )
+
     @staticmethod
     def update_contract(
         contract_id: int,
         client_id: int = None,
-        total_amount: float = None,
-        amount_due: float = None,
+        total_amount: Decimal = None,
+        amount_due: Decimal = None,
         signed: bool = None,
     ) -> bool:
         """
@@ -107,6 +171,7 @@ class ContractController:
             contract = session.query(Contract).filter_by(id=contract_id).first()
             if not contract:
                 raise ValueError("Contract not found.")
+            previous = SummaryController.contract_deltas(session, Contract.id == contract_id, -1)
 
             if client_id:
                 contract.client_id = client_id
@@ -117,12 +182,119 @@ class ContractController:
             if signed is not None:
                 contract.signed = signed
 
+            session.flush()
+            SummaryController.add_commercials(
+                session, previous, SummaryController.contract_deltas(session, Contract.id == contract_id)
+            )
             session.commit()
             return True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return False
 
+    @staticmethod
+    def bulk_update(session, contract_ids, values: dict, commercial_contact_id: int = None, condition=None) -> list:
+        """
+        Updates several contracts with set-based UPDATE statements in one transaction (split every
+        IN_CHUNK_SIZE IDs), and reports the contracts actually updated.
+
+        The permission check is part of the statement: with ``commercial_contact_id``, only the contracts of
+        that commercial are updated. The matching rows are first selected with FOR UPDATE, which locks them
+        until the commit, and updated by ID; the summaries of their commercials get the difference between the
+        figures of those contracts before and after the update.
+
+        Args:
+            session (Session): The SQLAlchemy session.
+            contract_ids (iterable): The IDs of the contracts to update.
+            values (dict): New values by column, possibly SQL expressions of the current values.
+            commercial_contact_id (int, optional): Restricts the update to the contracts of this commercial.
+            condition (optional): Additional SQL condition the contracts must meet, e.g. ``Contract.signed.is_(False)``.
+
+        Returns:
+            list: The sorted IDs of the updated contracts. Missing, unauthorized or non-matching IDs are left out.
+        """
+        distinct_ids = sorted({contract_id for contract_id in contract_ids if contract_id is not None})
+        updated = []
+        try:
+            for start in range(0, len(distinct_ids), IN_CHUNK_SIZE):
+                predicate = [Contract.id.in_(distinct_ids[start : start + IN_CHUNK_SIZE])]
+                if commercial_contact_id is not None:
+                    predicate.append(Contract.commercial_contact_id == commercial_contact_id)
+                if condition is not None:
+                    predicate.append(condition)
+
+                matched = session.scalars(select(Contract.id).where(*predicate).with_for_update()).all()
+                if matched:
+                    previous = SummaryController.contract_deltas(session, Contract.id.in_(matched), -1)
+                    session.execute(
+                        update(Contract)
+                        .where(Contract.id.in_(matched))
+                        .values(values)
+                        .execution_options(synchronize_session=False)
+                    )
+                    SummaryController.add_commercials(
+                        session, previous, SummaryController.contract_deltas(session, Contract.id.in_(matched))
+                    )
+                    updated += matched
+            session.commit()
+            return sorted(updated)
+        except Exception:
+            session.rollback()
+            raise
+
+    @staticmethod
+    def mark_signed(session, contract_ids, commercial_contact_id: int = None) -> list:
+        """
+        Marks the unsigned contracts among the given ones as signed. See bulk_update.
+        """
+        return ContractController.bulk_update(
+            session, contract_ids, {Contract.signed: True}, commercial_contact_id, Contract.signed.is_(False)
+        )
+
+    @staticmethod
+    def settle(session, contract_ids, commercial_contact_id: int = None) -> list:
+        """
+        Sets the amount due of the given contracts to 0, for the contracts with an amount still due.
+        See bulk_update.
+        """
+        return ContractController.bulk_update(
+            session, contract_ids, {Contract.amount_due: 0}, commercial_contact_id, Contract.amount_due != 0
+        )
+
+    @staticmethod
+    def adjust_amounts(session, contract_ids, percentage: float, commercial_contact_id: int = None) -> list:
+        """
+        Applies a percentage adjustment to the total amount and amount due of the given contracts, rounded
+        to the cent. See bulk_update.
+
+        Raises:
+            ValueError: If the adjustment would make the amounts zero or negative.
+        """
+        if percentage <= -100:
+            raise ValueError("The adjustment must be greater than -100%.")
+        factor = 1 + Decimal(repr(percentage)) / 100
+        values = {
+            Contract.total_amount: func.round(Contract.total_amount * factor, 2),
+            Contract.amount_due: func.round(Contract.amount_due * factor, 2),
+        }
+        return ContractController.bulk_update(session, contract_ids, values, commercial_contact_id)
+
+    @staticmethod
+    def apply_filters(query, filters: dict):
+        """
+        Applies the contract filters to a query.
+        Args:
+            query (Query): Query selecting contracts or contract columns.
+            filters (dict): Dictionary of filters.
+        Returns:
+            Query: The filtered query.
+        """
+        if "signed" in filters:
+            query = query.filter(Contract.signed == filters["signed"])
+        if "unpaid" in filters:
+            query = query.filter(Contract.amount_due > 0)
+        return query
+
     @staticmethod
     def get_filtered_contracts(filters: dict) -> list:
         """
@@ -134,12 +306,25 @@ class ContractController:
         """
         try:
             session = get_session()
-            query = session.query(Contract)
-            if "signed" in filters:
-                query = query.filter(Contract.signed == filters["signed"])
-            if "unpaid" in filters:
-                query = query.filter(Contract.amount_due > 0)
+            query = ContractController.apply_filters(session.query(Contract), filters)
             return query.all()
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return []
+
+    @staticmethod
+    def iter_filtered_contracts(filters: dict, batch_size: int = 1000):
+        """
+        Streams contracts matching the specified filters as lightweight column rows.
+        Args:
+            filters (dict): Dictionary of filters.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Yields:
+            Row: Contract rows ordered by ID that match the filters.
+        """
+        try:
+            session = get_session()
+            query = ContractController.apply_filters(session.query(*Contract.__table__.columns), filters)
+            yield from iter_by_key(query, Contract.id, batch_size)
+        except Exception as e:
+            Telemetry.capture_exception(e)
@@ -1,33 +1,93 @@
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from heapq import merge
+from itertools import groupby
+from operator import attrgetter
+from controllers.summary_controller import SummaryController
+from models.client import Client
+from models.department import Department
 from models.event import Event
+from models.event_archive import EventArchive
 from models.user import User
-import sentry_sdk
+from utils.backup_manager import DEFAULT_LAG_SECONDS
+from utils.batch_validator import IN_CHUNK_SIZE
+from utils.data_validator import DATETIME_FORMAT, MAX_EVENT_DURATION
+from utils.ics_writer import (
+    FEED_PROPERTY,
+    ICS_DATETIME_FORMAT,
+    UNTIL_PROPERTY,
+    event_uid,
+    format_event,
+    read_calendar,
+    write_calendar,
+    write_calendar_file,
+)
+from utils.scheduler import Slot, find_overlaps, schedule
+from utils.telemetry import Telemetry
 from utils.token_manager import TokenManager
-from utils.session_manager import get_session
-from sqlalchemy import func
+from utils.session_manager import get_session, iter_by_key
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+
+# Columns of the Event table, in order; the archive has the same columns plus archived_at.
+EVENT_COLUMN_NAMES = [column.name for column in Event.__table__.columns]
+
+# Two events of the same support contact whose time ranges overlap, and the overlapping range.
+EventConflict = namedtuple(
+    "EventConflict", ["support_contact_id", "event_id", "conflicting_event_id", "overlap_start", "overlap_end"]
+)
+
+# Outcome of a calendar export: VEVENTs written by this run, VEVENTs dropped from the file, events in the file.
+CalendarExport = namedtuple("CalendarExport", ["written", "removed", "total"])
 
 
 class EventController:
     @staticmethod
-    def get_all_events(token: str) -> list:
+    def get_all_events(token: str, offset: int = None, limit: int = None) -> list:
         """
         Retrieves all events if the user is authenticated and authorized.
         Args:
             token (str): JWT token of the authenticated user.
+            offset (int, optional): Number of events to skip, for paginated retrieval.
+            limit (int, optional): Maximum number of events to return, for paginated retrieval.
         Returns:
-            list: List of Event objects.
+            list: List of Event objects ordered by ID.
         """
         try:
             key = TokenManager.load_key()
             payload = TokenManager.verify_token(token, key)
             if payload:
                 session = get_session()
-                events = session.query(Event).all()
-                return events
+                query = session.query(Event).order_by(Event.id)
+                if offset:
+                    query = query.offset(offset)
+                if limit:
+                    query = query.limit(limit)
+                return query.all()
             return []
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return []
 
+    @staticmethod
+    def iter_events(token: str, batch_size: int = 1000):
+        """
+        Streams all events as lightweight column rows if the user is authenticated and authorized.
+        Args:
+            token (str): JWT token of the authenticated user.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Yields:
+            Row: Event rows ordered by ID, exposing the event columns as attributes.
+        """
+        try:
+            key = TokenManager.load_key()
+            payload = TokenManager.verify_token(token, key)
+            if payload:
+                session = get_session()
+                yield from iter_by_key(session.query(*Event.__table__.columns), Event.id, batch_size)
+        except Exception as e:
+            Telemetry.capture_exception(e)
+
     @staticmethod
     def create_event(
         contract_id: int,
@@ -45,6 +105,9 @@ class EventController:
         """
         try:
             session = get_session()
+            EventController.check_duration(
+                EventController._as_datetime(event_date_start), EventController._as_datetime(event_date_end)
+            )
 
             event = Event(
                 contract_id=contract_id,
@@ -58,13 +121,32 @@ class EventController:
                 notes=notes,
             )
             session.add(event)
+            SummaryController.add_supports(
+                session, SummaryController.count_events([{"support_contact_id": support_contact_id}])
+            )
             session.commit()
             return True
+        except ValueError:
+            session.rollback()
+            raise
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             session.rollback()
             return False
 
+    @staticmethod
+    def insert_events(session, events: list):
+        """
+        Inserts events in a single executemany statement, without loading them as ORM objects, and adds
+        them to the summaries of their support contacts. The caller commits or rolls back the session.
+        Args:
+            session (Session): The SQLAlchemy session.
+            events (list): Dictionaries of event column values.
+        """
+        if events:
+            session.execute(insert(Event.__table__), events)
+            SummaryController.add_supports(session, SummaryController.count_events(events))
+
     @staticmethod
     def update_event(
         token: str,
@@ -88,6 +170,7 @@ class EventController:
             event = session.query(Event).filter_by(id=event_id).first()
             if not event:
                 raise ValueError("Event not found.")
+            previous_support_contact_id = event.support_contact_id
 
             if support_contact_id is not None:
                 event.support_contact_id = support_contact_id
@@ -110,47 +193,440 @@ class EventController:
                 if notes:
                     event.notes = notes
 
+            start = EventController._as_datetime(event.event_date_start)
+            end = EventController._as_datetime(event.event_date_end)
+            if event_date_start or event_date_end:
+                EventController.check_duration(start, end)
+
+            if event.support_contact_id is not None and (
+                event.support_contact_id != previous_support_contact_id or event_date_start or event_date_end
+            ):
+                EventController.lock_support_contact(session, event.support_contact_id)
+                conflict = EventController.find_conflict(session, event.support_contact_id, start, end, event.id)
+                if conflict:
+                    raise ValueError(
+                        f"The support contact already has event {conflict.id} from {conflict.event_date_start} "
+                        f"to {conflict.event_date_end}."
+                    )
+
+            if event.support_contact_id != previous_support_contact_id:
+                SummaryController.add_supports(
+                    session,
+                    SummaryController.count_events([{"support_contact_id": previous_support_contact_id}], -1),
+                    SummaryController.count_events([{"support_contact_id": event.support_contact_id}]),
+                )
             session.commit()
             return True
+        except ValueError:
+            session.rollback()
+            raise
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
+            return False
+
+    @staticmethod
+    def _as_datetime(value) -> datetime:
+        return datetime.strptime(value, DATETIME_FORMAT) if isinstance(value, str) else value
+
+    @staticmethod
+    def check_duration(start: datetime, end: datetime):
+        """
+        Checks that an event ends after it starts and lasts at most MAX_EVENT_DURATION, the bound find_conflict
+        relies on.
+        Raises:
+            ValueError: If the range is empty or too long.
+        """
+        if end < start:
+            raise ValueError("Event Date End cannot be before Event Date Start.")
+        if end - start > MAX_EVENT_DURATION:
+            raise ValueError(
+                f"Event Date End cannot be more than {MAX_EVENT_DURATION.days} days after Event Date Start."
+            )
+
+    @staticmethod
+    def lock_support_contact(session, support_contact_id: int):
+        """
+        Locks the User row of a support contact until the end of the transaction, so that two transactions
+        assigning events to the same contact check and write its schedule one after the other.
+        """
+        session.execute(select(User.id).where(User.id == support_contact_id).with_for_update())
+
+    @staticmethod
+    def find_conflict(session, support_contact_id: int, start: datetime, end: datetime, exclude_id: int = None):
+        """
+        Finds an event of the support contact overlapping [start, end).
+
+        An event lasts at most MAX_EVENT_DURATION (checked on every write by check_duration, DataValidator and
+        BatchValidator), so an overlapping event starts between ``start - MAX_EVENT_DURATION`` and ``end``. The
+        candidates are that bounded range of the (support_contact_id, event_date_start) index, read backwards
+        from ``end`` until one ends after ``start``, whatever the length of the contact's history. The caller
+        locks the contact first with lock_support_contact.
+        Args:
+            session (Session): The SQLAlchemy session.
+            support_contact_id (int): The ID of the support contact.
+            start (datetime): Start of the range.
+            end (datetime): End of the range.
+            exclude_id (int, optional): ID of the event being updated, which cannot conflict with itself.
+        Returns:
+            Row: The ID, start and end of the overlapping event starting last, or None.
+        """
+        query = (
+            select(Event.id, Event.event_date_start, Event.event_date_end)
+            .where(
+                Event.support_contact_id == support_contact_id,
+                Event.event_date_start < end,
+                Event.event_date_start > start - MAX_EVENT_DURATION,
+                Event.event_date_end > start,
+            )
+            .order_by(Event.event_date_start.desc())
+            .limit(1)
+        )
+        if exclude_id is not None:
+            query = query.where(Event.id != exclude_id)
+        return session.execute(query).first()
+
+    @staticmethod
+    def find_conflicts(session, batch_size: int = 1000):
+        """
+        Streams every pair of overlapping events assigned to the same support contact, such as those left by
+        imports, restores or reassignments. The events are read in the order of the schedule index and swept
+        once per support contact, so the report is one pass over the assigned events.
+        Args:
+            session (Session): The SQLAlchemy session.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Yields:
+            EventConflict: Each event overlapping an earlier event of its support contact, with the earlier
+                event ending last.
+        """
+        query = (
+            session.query(Event.support_contact_id, Event.id, Event.event_date_start, Event.event_date_end)
+            .filter(Event.support_contact_id.isnot(None))
+            .order_by(Event.support_contact_id, Event.event_date_start, Event.id)
+        )
+        for support_contact_id, rows in groupby(query.yield_per(batch_size), key=lambda row: row[0]):
+            slots = (Slot(event_id, start, end) for _, event_id, start, end in rows)
+            for earlier, later in find_overlaps(slots):
+                yield EventConflict(
+                    support_contact_id, earlier.id, later.id, later.start, min(earlier.end, later.end)
+                )
+
+    @staticmethod
+    def apply_filters(query, filters: dict, model=Event):
+        """
+        Applies the event filters to a query.
+        Args:
+            query (Query): Query selecting events or event columns.
+            filters (dict): Dictionary of filters.
+            model: The queried table, Event or EventArchive.
+        Returns:
+            Query: The filtered query.
+        """
+        if "no_support" in filters and filters["no_support"]:
+            query = query.filter(model.support_contact_id.is_(None))
+        if "support_contact_id" in filters:
+            query = query.filter(model.support_contact_id == filters["support_contact_id"])
+        if "client_id" in filters:
+            query = query.filter(model.client_id == filters["client_id"])
+        if "date_start" in filters:
+            date_start = filters["date_start"]
+            query = query.filter(func.date(model.event_date_start) >= date_start)
+        if "date_end" in filters:
+            date_end = filters["date_end"]
+            query = query.filter(func.date(model.event_date_end) <= date_end)
+        if "location" in filters:
+            query = query.filter(model.location == filters["location"])
+        if "min_attendees" in filters:
+            query = query.filter(model.attendees >= filters["min_attendees"])
+        if "max_attendees" in filters:
+            query = query.filter(model.attendees <= filters["max_attendees"])
+        return query
+
+    @staticmethod
+    def reaches_archive(session, filters: dict) -> bool:
+        """
+        Tells whether a filtered query must also read the archived events. Only queries with a date range
+        do: without one, the past events are not looked for. A range starting after the end of the most
+        recent archived event is answered by the Event table alone.
+        Args:
+            session (Session): The SQLAlchemy session.
+            filters (dict): Dictionary of filters.
+        Returns:
+            bool: True if the archive may hold matching events.
+        """
+        if "date_start" not in filters and "date_end" not in filters:
             return False
+        archive_end = session.query(func.max(EventArchive.event_date_end)).scalar()
+        if archive_end is None:
+            return False
+        return "date_start" not in filters or str(filters["date_start"]) <= archive_end.date().isoformat()
 
     @staticmethod
     def get_filtered_events(filters: dict) -> list:
         """
-        Retrieves events based on specified filters.
+        Retrieves events based on specified filters, including the archived events when the date range
+        reaches into the archive.
         Args:
             filters (dict): Dictionary of filters.
         Returns:
-            list: List of Event objects that match the filters.
+            list: List of Event and EventArchive objects that match the filters, ordered by ID.
         """
         try:
             session = get_session()
-            query = session.query(Event)
-            if "no_support" in filters and filters["no_support"]:
-                query = query.filter(Event.support_contact_id.is_(None))
-            if "support_contact_id" in filters:
-                query = query.filter(Event.support_contact_id == filters["support_contact_id"])
-            if "client_id" in filters:
-                query = query.filter(Event.client_id == filters["client_id"])
-            if "date_start" in filters:
-                date_start = filters["date_start"]
-                query = query.filter(func.date(Event.event_date_start) >= date_start)
-            if "date_end" in filters:
-                date_end = filters["date_end"]
-                query = query.filter(func.date(Event.event_date_end) <= date_end)
-            if "location" in filters:
-                query = query.filter(Event.location == filters["location"])
-            if "min_attendees" in filters:
-                query = query.filter(Event.attendees >= filters["min_attendees"])
-            if "max_attendees" in filters:
-                query = query.filter(Event.attendees <= filters["max_attendees"])
-            return query.all()
+            events = EventController.apply_filters(session.query(Event), filters).all()
+            if EventController.reaches_archive(session, filters):
+                archived = EventController.apply_filters(session.query(EventArchive), filters, EventArchive).all()
+                events = sorted(events + archived, key=lambda event: event.id)
+            return events
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return []
 
+    @staticmethod
+    def iter_filtered_events(filters: dict, batch_size: int = 1000):
+        """
+        Streams events matching the specified filters as lightweight column rows, merged by ID with the
+        archived events when the date range reaches into the archive. Each table is paged on its ID index.
+        Args:
+            filters (dict): Dictionary of filters.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Yields:
+            Row: Event rows ordered by ID that match the filters.
+        """
+        try:
+            session = get_session()
+            query = EventController.apply_filters(session.query(*Event.__table__.columns), filters)
+            events = iter_by_key(query, Event.id, batch_size)
+            if EventController.reaches_archive(session, filters):
+                archive_columns = [EventArchive.__table__.c[name] for name in EVENT_COLUMN_NAMES]
+                archived = EventController.apply_filters(session.query(*archive_columns), filters, EventArchive)
+                events = merge(events, iter_by_key(archived, EventArchive.id, batch_size), key=attrgetter("id"))
+            yield from events
+        except Exception as e:
+            Telemetry.capture_exception(e)
+
+    @staticmethod
+    def archive_events(session, older_than_days: int, chunk_size: int = 1000) -> int:
+        """
+        Moves the events that ended more than ``older_than_days`` days ago to the EventArchive table.
+        Each chunk is copied with INSERT ... SELECT and deleted from the Event table in its own transaction,
+        so that an event is always in exactly one of the tables and locks are only held for one chunk.
+        Args:
+            session (Session): The SQLAlchemy session.
+            older_than_days (int): Minimum age of the end of the events to archive, in days.
+            chunk_size (int): Number of events moved per transaction.
+        Returns:
+            int: The number of archived events.
+        """
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        archived = 0
+        try:
+            while True:
+                event_ids = session.scalars(
+                    select(Event.id).where(Event.event_date_end < cutoff).order_by(Event.id).limit(chunk_size)
+                ).all()
+                if not event_ids:
+                    return archived
+                removed = SummaryController.event_deltas(session, Event.id.in_(event_ids), -1)
+                columns = [Event.__table__.c[name] for name in EVENT_COLUMN_NAMES]
+                session.execute(
+                    insert(EventArchive.__table__).from_select(
+                        EVENT_COLUMN_NAMES, select(*columns).where(Event.id.in_(event_ids))
+                    )
+                )
+                session.execute(
+                    delete(Event).where(Event.id.in_(event_ids)).execution_options(synchronize_session=False)
+                )
+                SummaryController.add_supports(session, removed)
+                session.commit()
+                archived += len(event_ids)
+        except Exception:
+            session.rollback()
+            raise
+
+    @staticmethod
+    def auto_assign(session):
+        """
+        Assigns the upcoming events without a support contact across the Support department.
+
+        The support contacts and the unassigned events are locked with SELECT ... FOR UPDATE, as
+        update_event does, and the events are handed to the heap scheduler of
+        utils.scheduler, which balances the hours of upcoming events of each support contact and never gives
+        a contact two overlapping events. The assignments are written with one UPDATE ... WHERE id IN (...)
+        per support contact and committed in a single transaction with the updated summaries.
+        Args:
+            session (Session): The SQLAlchemy session.
+        Returns:
+            Schedule: The assigned event IDs by support contact ID, and the IDs of the events overlapping the
+                schedule of every support contact.
+        """
+        now = datetime.now()
+        try:
+            support_ids = session.scalars(
+                select(User.id)
+                .join(Department, User.department_id == Department.id)
+                .where(Department.name == "Support")
+                .order_by(User.id)
+                .with_for_update()
+            ).all()
+            if not support_ids:
+                raise ValueError("There is no user in the Support department.")
+
+            busy = {support_id: [] for support_id in support_ids}
+            assigned = session.execute(
+                select(Event.support_contact_id, Event.event_date_start, Event.event_date_end).where(
+                    Event.support_contact_id.in_(support_ids), Event.event_date_end > now
+                )
+            )
+            for support_id, start, end in assigned:
+                busy[support_id].append((start, end))
+
+            pending = session.execute(
+                select(Event.id, Event.event_date_start, Event.event_date_end)
+                .where(Event.support_contact_id.is_(None), Event.event_date_end > now)
+                .with_for_update()
+            )
+            result = schedule((Slot(*row) for row in pending), busy)
+
+            for support_id, event_ids in result.assignments.items():
+                for start in range(0, len(event_ids), IN_CHUNK_SIZE):
+                    session.execute(
+                        update(Event)
+                        .where(Event.id.in_(event_ids[start : start + IN_CHUNK_SIZE]))
+                        .values(support_contact_id=support_id)
+                        .execution_options(synchronize_session=False)
+                    )
+            SummaryController.add_supports(
+                session,
+                {
+                    support_id: {"assigned_events": len(event_ids)}
+                    for support_id, event_ids in result.assignments.items()
+                },
+            )
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+
+    @staticmethod
+    def _iter_calendar_blocks(query, stamp: datetime, batch_size: int):
+        """
+        Streams the VEVENT blocks of the events selected by a projected calendar query, by UID, in
+        chronological order. The MySQL Connector driver has no server-side cursors: the events are read by
+        keyset pagination on (event_date_start, id), which the feed's index serves, to keep the memory bounded.
+        """
+        last_start = last_id = None
+        while True:
+            page = query
+            if last_id is not None:
+                page = page.filter(
+                    or_(
+                        Event.event_date_start > last_start,
+                        and_(Event.event_date_start == last_start, Event.id > last_id),
+                    )
+                )
+            rows = page.order_by(Event.event_date_start, Event.id).limit(batch_size).all()
+            if not rows:
+                return
+            yield from EventController._calendar_blocks(rows, stamp)
+            last_start, last_id = rows[-1].event_date_start, rows[-1].id
+
+    @staticmethod
+    def _calendar_blocks(rows, stamp: datetime):
+        """
+        Formats calendar query rows as (UID, VEVENT block) pairs.
+        """
+        for event_id, name, start, end, location, attendees, notes, client_name in rows:
+            description = "\n".join(
+                part
+                for part in (f"Client: {client_name}" if client_name else None, f"Attendees: {attendees}", notes)
+                if part
+            )
+            yield event_uid(event_id), format_event(event_id, name, start, end, stamp, location, description)
+
+    @staticmethod
+    def export_calendar(
+        session,
+        support_contact_id: int = None,
+        client_id: int = None,
+        path: str = None,
+        stream=None,
+        incremental: bool = False,
+        batch_size: int = 1000,
+    ) -> CalendarExport:
+        """
+        Exports the events of a support contact or of a client as an iCalendar feed.
+
+        The VEVENTs are generated while streaming a query projecting only the displayed columns. The calendar
+        records its feed and the database time of the export; an incremental export to an existing file reads
+        them back, regenerates only the events modified since, drops the events that left the feed (deleted,
+        archived or reassigned) with an ID-only query, and rewrites the file atomically.
+        Args:
+            session (Session): The SQLAlchemy session.
+            support_contact_id (int, optional): The support contact whose events to export.
+            client_id (int, optional): The client whose events to export, when no support contact is given.
+            path (str, optional): The calendar file to write. Without it, the calendar goes to ``stream``.
+            stream (file, optional): Text stream receiving the calendar when no path is given.
+            incremental (bool): Update the calendar file at ``path`` instead of regenerating it.
+            batch_size (int): Number of rows fetched from the database at a time.
+        Returns:
+            CalendarExport: The number of events written, removed and in the calendar.
+        Raises:
+            ValueError: If the existing file holds the calendar of another feed.
+        """
+        if support_contact_id is not None:
+            feed, feed_filter = f"support-{support_contact_id}", Event.support_contact_id == support_contact_id
+        else:
+            feed, feed_filter = f"client-{client_id}", Event.client_id == client_id
+
+        blocks, since = {}, None
+        if incremental and path and os.path.exists(path):
+            properties, blocks = read_calendar(path)
+            if properties.get(FEED_PROPERTY) != feed:
+                raise ValueError(f"{path} does not hold the {feed} calendar.")
+            if UNTIL_PROPERTY in properties:
+                since = datetime.strptime(properties[UNTIL_PROPERTY], ICS_DATETIME_FORMAT)
+
+        # Rows committed late by transactions started before the export are caught by the next one.
+        until = session.execute(select(func.now())).scalar() - timedelta(seconds=DEFAULT_LAG_SECONDS)
+        query = (
+            session.query(
+                Event.id,
+                Event.event_name,
+                Event.event_date_start,
+                Event.event_date_end,
+                Event.location,
+                Event.attendees,
+                Event.notes,
+                Client.full_name,
+            )
+            .outerjoin(Client, Client.id == Event.client_id)
+            .filter(feed_filter)
+        )
+        if since is not None:
+            query = query.filter(Event.updated_at > since)
+        stamp = datetime.now(timezone.utc)
+        changed = EventController._iter_calendar_blocks(query, stamp, batch_size)
+        properties = {FEED_PROPERTY: feed, UNTIL_PROPERTY: f"{until:{ICS_DATETIME_FORMAT}}"}
+        name = f"Epic Events - {feed}"
+
+        if path is None:
+            written = write_calendar(stream, (block for _, block in changed), name, properties)
+            return CalendarExport(written, 0, written)
+
+        removed = 0
+        if since is not None:
+            current = {event_uid(event_id) for event_id in session.scalars(select(Event.id).where(feed_filter))}
+            removed = len(blocks)
+            blocks = {uid: block for uid, block in blocks.items() if uid in current}
+            removed -= len(blocks)
+        written = 0
+        for uid, block in changed:
+            blocks[uid] = block
+            written += 1
+        total = write_calendar_file(path, blocks.values(), name, properties)
+        return CalendarExport(written, removed, total)
+
     @staticmethod
     def get_event_by_id(event_id: int) -> Event:
         """
@@ -165,5 +641,5 @@ class EventController:
             event = session.query(Event).filter_by(id=event_id).first()
             return event
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
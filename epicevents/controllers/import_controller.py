@@ -0,0 +1,300 @@
+from datetime import date, datetime
+from controllers.client_controller import ClientController
+from controllers.contract_controller import ContractController
+from controllers.event_controller import EventController
+from utils.batch_validator import BatchValidator
+from utils.money import to_money
+from utils.bulk_import import (
+    DEFAULT_CHUNK_SIZE,
+    ImportResult,
+    RejectWriter,
+    group_errors,
+    read_csv_chunks,
+    read_csv_column,
+)
+from utils.import_checkpoint import ImportCheckpoint
+from utils.session_manager import get_session
+from utils.telemetry import Telemetry
+
+CLIENT_COLUMNS = ["full_name", "email", "phone", "company_name"]
+
+CLIENT_RULES = [
+    ("full_name", BatchValidator.check_strings, {"field_name": "Full Name"}),
+    ("email", BatchValidator.check_emails, {}),
+    ("phone", BatchValidator.check_phones, {}),
+    ("company_name", BatchValidator.check_strings, {"field_name": "Company Name"}),
+]
+
+CONTRACT_COLUMNS = ["client_id", "total_amount", "amount_due", "signed"]
+
+CONTRACT_RULES = [
+    ("client_id", BatchValidator.check_ids, {"field_name": "Client ID"}),
+    ("total_amount", BatchValidator.check_floats, {"field_name": "Total Amount"}),
+    ("amount_due", BatchValidator.check_floats, {"field_name": "Amount Due", "positive": False, "allow_zero": True}),
+    ("signed", BatchValidator.check_booleans, {"field_name": "Signed"}),
+]
+
+EVENT_COLUMNS = ["contract_id", "event_name", "event_date_start", "event_date_end", "location", "attendees", "notes"]
+REQUIRED_EVENT_COLUMNS = EVENT_COLUMNS[:-1]
+
+EVENT_RULES = [
+    ("contract_id", BatchValidator.check_ids, {"field_name": "Contract ID"}),
+    ("event_name", BatchValidator.check_strings, {"field_name": "Event Name"}),
+    ("event_date_end", BatchValidator.check_datetimes, {"field_name": "Event Date End"}),
+    ("location", BatchValidator.check_strings, {"field_name": "Location"}),
+    ("attendees", BatchValidator.check_attendees, {}),
+]
+
+
+class ImportController:
+    """
+    Loads clients, contracts and events from CSV files.
+
+    Files are streamed and processed by chunks: each chunk is validated with BatchValidator, checked against
+    the database with set-based queries, and its valid rows are inserted with a single executemany statement
+    in their own transaction. Invalid rows are written to the reject file instead of stopping the import.
+    """
+
+    @staticmethod
+    def _insert_chunk(
+        session, insert_rows, records: list, accepted: list, rejects: RejectWriter, save_progress=None
+    ) -> int:
+        """
+        Inserts the valid rows of a chunk in one transaction. If the insert fails, the transaction is rolled
+        back and the rows are rejected with the error.
+
+        Args:
+            session (Session): The SQLAlchemy session.
+            insert_rows (callable): Controller method inserting the records, e.g. ClientController.insert_clients.
+            records (list): Dictionaries of column values to insert.
+            accepted (list): (line, row) of the source rows of the records, for the reject file.
+            rejects (RejectWriter): The reject file.
+            save_progress (callable, optional): Called with the number of inserted rows to add the progress of
+                the import to the transaction of the chunk.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        try:
+            insert_rows(session, records)
+            if save_progress:
+                rejects.flush()
+                save_progress(len(records))
+            session.commit()
+            return len(records)
+        except Exception as e:
+            Telemetry.capture_exception(e)
+            session.rollback()
+            for line, row in accepted:
+                rejects.write(line, row, f"Insert failed: {e}")
+        if save_progress:
+            rejects.flush()
+            save_progress(0)
+            session.commit()
+        return 0
+
+    @staticmethod
+    def import_clients(
+        path: str, commercial_contact_id: int, chunk_size: int = DEFAULT_CHUNK_SIZE, reject_path: str = None
+    ) -> ImportResult:
+        """
+        Imports the clients of a CSV file with the columns full_name, email, phone and company_name,
+        assigned to the given commercial.
+
+        Emails must be unique: rows reusing the email of a client already in the database or of a previous
+        row of the file are rejected.
+
+        Args:
+            path (str): Path of the CSV file.
+            commercial_contact_id (int): ID of the commercial the clients are assigned to.
+            chunk_size (int): Number of rows validated and inserted at a time.
+            reject_path (str, optional): Path of the CSV file receiving the rejected rows.
+
+        Returns:
+            ImportResult: The number of imported and rejected rows.
+        """
+        imported = 0
+        seen_emails = set()
+        date_created = date.today()
+        session = get_session()
+        with RejectWriter(reject_path, CLIENT_COLUMNS) as rejects:
+            try:
+                for line, rows in read_csv_chunks(path, CLIENT_COLUMNS, chunk_size):
+                    columns = BatchValidator.to_columns(rows, CLIENT_COLUMNS)
+                    errors = group_errors(BatchValidator.validate(columns, CLIENT_RULES))
+                    existing_emails = ClientController.get_existing_emails(session, columns["email"])
+
+                    accepted, clients = [], []
+                    for row_index, row in enumerate(rows):
+                        email = (row["email"] or "").strip().lower()
+                        if row_index not in errors:
+                            if email in existing_emails:
+                                errors[row_index] = "A client with this email already exists."
+                            elif email in seen_emails:
+                                errors[row_index] = "Duplicate email in the file."
+                        if row_index in errors:
+                            rejects.write(line + row_index, row, errors[row_index])
+                            continue
+                        seen_emails.add(email)
+                        accepted.append((line + row_index, row))
+                        clients.append(
+                            {
+                                "full_name": row["full_name"].strip(),
+                                "email": row["email"].strip(),
+                                "phone": row["phone"].strip(),
+                                "company_name": row["company_name"].strip(),
+                                "date_created": date_created,
+                                "commercial_contact_id": commercial_contact_id,
+                            }
+                        )
+
+                    imported += ImportController._insert_chunk(
+                        session, ClientController.insert_clients, clients, accepted, rejects
+                    )
+            finally:
+                session.close()
+        return ImportResult(imported, rejects.count)
+
+    @staticmethod
+    def import_contracts(
+        path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, reject_path: str = None, checkpoint_name: str = None
+    ) -> ImportResult:
+        """
+        Imports the contracts of a CSV file with the columns client_id, total_amount, amount_due and signed.
+        Each contract is assigned to the commercial contact of its client.
+
+        The commercial contacts of all the clients referenced by the file are fetched with one query before
+        the import. Each chunk is inserted in its own transaction, which also saves the checkpoint: if the
+        import is interrupted, running it again with the same checkpoint resumes after the last committed chunk.
+
+        Args:
+            path (str): Path of the CSV file.
+            chunk_size (int): Number of rows validated and inserted at a time.
+            reject_path (str, optional): Path of the CSV file receiving the rejected rows.
+            checkpoint_name (str, optional): Name of the checkpoint, None to disable resuming.
+
+        Returns:
+            ImportResult: The number of imported and rejected rows, including those of the interrupted runs.
+        """
+        checkpoint = ImportCheckpoint(checkpoint_name, path)
+        date_created = date.today()
+        session = get_session()
+        try:
+            progress = checkpoint.load(session) or {"line": 2, "imported": 0, "rejected": 0}
+            imported, rejected = progress["imported"], progress["rejected"]
+            with RejectWriter(reject_path, CONTRACT_COLUMNS, append=progress["line"] > 2) as rejects:
+                client_ids = BatchValidator.parse_ints(read_csv_column(path, "client_id", progress["line"]))
+                commercial_contact_ids = ClientController.get_commercial_contact_ids(session, client_ids)
+
+                for line, rows in read_csv_chunks(path, CONTRACT_COLUMNS, chunk_size, progress["line"]):
+                    columns = BatchValidator.to_columns(rows, CONTRACT_COLUMNS)
+                    errors = group_errors(BatchValidator.validate(columns, CONTRACT_RULES))
+
+                    accepted, contracts = [], []
+                    for row_index, row in enumerate(rows):
+                        if row_index not in errors and int(row["client_id"]) not in commercial_contact_ids:
+                            errors[row_index] = "Client ID does not exist."
+                        if row_index in errors:
+                            rejects.write(line + row_index, row, errors[row_index])
+                            continue
+                        client_id = int(row["client_id"])
+                        accepted.append((line + row_index, row))
+                        contracts.append(
+                            {
+                                "client_id": client_id,
+                                "commercial_contact_id": commercial_contact_ids[client_id],
+                                "total_amount": to_money(row["total_amount"]),
+                                "amount_due": to_money(row["amount_due"]),
+                                "date_created": date_created,
+                                "signed": row["signed"].strip().lower() == "true",
+                            }
+                        )
+
+                    imported += ImportController._insert_chunk(
+                        session,
+                        ContractController.insert_contracts,
+                        contracts,
+                        accepted,
+                        rejects,
+                        lambda inserted: checkpoint.save(
+                            session, line + len(rows), imported + inserted, rejected + rejects.count
+                        ),
+                    )
+                checkpoint.clear(session)
+        finally:
+            session.close()
+        return ImportResult(imported, rejected + rejects.count)
+
+    @staticmethod
+    def import_events(
+        path: str, commercial_contact_id: int, chunk_size: int = DEFAULT_CHUNK_SIZE, reject_path: str = None
+    ) -> ImportResult:
+        """
+        Imports the events of a CSV file with the columns contract_id, event_name, event_date_start,
+        event_date_end, location, attendees and, optionally, notes.
+
+        As for a single event, the contract must exist, be signed and belong to the importing commercial,
+        the start date must not be in the past and the end date not before the start date. The contracts
+        of each chunk are checked with one IN query, and the date ranges are validated for the whole chunk.
+
+        Args:
+            path (str): Path of the CSV file.
+            commercial_contact_id (int): ID of the importing commercial.
+            chunk_size (int): Number of rows validated and inserted at a time.
+            reject_path (str, optional): Path of the CSV file receiving the rejected rows.
+
+        Returns:
+            ImportResult: The number of imported and rejected rows.
+        """
+        imported = 0
+        start_options = {"field_name": "Event Date Start", "not_before": datetime.now()}
+        rules = [("event_date_start", BatchValidator.check_datetimes, start_options), *EVENT_RULES]
+        session = get_session()
+        with RejectWriter(reject_path, EVENT_COLUMNS) as rejects:
+            try:
+                for line, rows in read_csv_chunks(path, REQUIRED_EVENT_COLUMNS, chunk_size):
+                    columns = BatchValidator.to_columns(rows, EVENT_COLUMNS)
+                    validation_errors = BatchValidator.validate(columns, rules)
+                    validation_errors += BatchValidator.check_datetime_ranges(
+                        columns["event_date_start"], columns["event_date_end"]
+                    )
+                    errors = group_errors(validation_errors)
+                    contract_ids = BatchValidator.parse_ints(columns["contract_id"])
+                    contracts = ContractController.get_contracts_by_ids(session, contract_ids)
+                    starts = BatchValidator.parse_datetimes(columns["event_date_start"])
+                    ends = BatchValidator.parse_datetimes(columns["event_date_end"])
+
+                    accepted, events = [], []
+                    for row_index, row in enumerate(rows):
+                        contract = contracts.get(contract_ids[row_index])
+                        if row_index not in errors:
+                            if contract is None:
+                                errors[row_index] = "Contract not found."
+                            elif not contract.signed:
+                                errors[row_index] = "The contract is not signed."
+                            elif contract.commercial_contact_id != commercial_contact_id:
+                                errors[row_index] = "You are not authorized to create an event for this contract."
+                        if row_index in errors:
+                            rejects.write(line + row_index, row, errors[row_index])
+                            continue
+                        accepted.append((line + row_index, row))
+                        events.append(
+                            {
+                                "contract_id": contract_ids[row_index],
+                                "client_id": contract.client_id,
+                                "event_name": row["event_name"].strip(),
+                                "event_date_start": starts[row_index],
+                                "event_date_end": ends[row_index],
+                                "support_contact_id": None,
+                                "location": row["location"].strip(),
+                                "attendees": int(row["attendees"]),
+                                "notes": (row.get("notes") or "").strip(),
+                            }
+                        )
+
+                    imported += ImportController._insert_chunk(
+                        session, EventController.insert_events, events, accepted, rejects
+                    )
+            finally:
+                session.close()
+        return ImportResult(imported, rejects.count)
@@ -5,7 +5,7 @@ from models.department import Department
 from utils.database_initializer import DatabaseInitializer
 from controllers.user_controller import UserController
 from utils.token_manager import TokenManager
-import sentry_sdk
+from utils.telemetry import Telemetry
 import os
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
@@ -13,9 +13,15 @@ import keyring
 from controllers.client_controller import ClientController
 from controllers.contract_controller import ContractController
 from controllers.event_controller import EventController
+from controllers.import_controller import ImportController
+from controllers.report_controller import ReportController
+from controllers.summary_controller import SummaryController
 from utils.session_manager import get_session_root, get_session
 from datetime import datetime, date
+from decimal import Decimal
 from utils.permissions import PermissionManager
+from utils.bulk_import import DEFAULT_CHUNK_SIZE
+from utils.backup_manager import BackupManager, DEFAULT_LAG_SECONDS, DEFAULT_ROWS_PER_FILE
 
 load_dotenv()
 
@@ -30,6 +36,7 @@ class MainController:
         Config.set_use_test_database(use_test)
 
     @staticmethod
+    @Telemetry.traced
     def initialize_database() -> bool:
         """
         Initializes the database by performing all necessary steps.
@@ -41,11 +48,12 @@ class MainController:
             print("Database initialized successfully.")
             return True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Error during database initialization: {e}")
             return False
 
     @staticmethod
+    @Telemetry.traced
     def is_database_initialized() -> bool:
         """
         Check if the database is initialized by inspecting if the User table exists.
@@ -56,10 +64,11 @@ class MainController:
             inspector = inspect(session.bind)
             return "User" in inspector.get_table_names()
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return False
 
     @staticmethod
+    @Telemetry.traced
     def authenticate(username: str, password: str) -> dict:
         """
         Authenticates a user and returns JWT and refresh tokens if successful.
@@ -81,10 +90,11 @@ class MainController:
                 return tokens
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
+    @Telemetry.traced
     def create_users() -> bool:
         """
         Create initial users with their respective departments from environment variables.
@@ -133,11 +143,12 @@ class MainController:
             print("Users creation process completed.")
             return True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Error creating users: {e}")
             return False
 
     @staticmethod
+    @Telemetry.traced
     def refresh_token(username: str) -> str:
         """
         Refreshes the JWT token using the refresh token.
@@ -163,11 +174,12 @@ class MainController:
                     return new_token
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Failed to refresh token for {username}")
             return None
 
     @staticmethod
+    @Telemetry.traced
     def check_token_status(username: str) -> str:
         """
         Checks the token status and informs the user if it needs to be refreshed.
@@ -186,6 +198,7 @@ class MainController:
             return "no_token"
 
     @staticmethod
+    @Telemetry.traced
     def logout() -> str:
         """
         Logs out the current user by deleting the stored tokens.
@@ -206,55 +219,96 @@ class MainController:
             else:
                 return "no_session"
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return str(e)
 
     @staticmethod
-    def get_clients() -> list:
+    @Telemetry.traced
+    def get_clients(offset: int = None, limit: int = None, stream: bool = False) -> list:
         """
         Retrieves all clients if the user is authenticated and authorized.
+        Args:
+            offset (int, optional): Number of clients to skip, for paginated retrieval.
+            limit (int, optional): Maximum number of clients to return, for paginated retrieval.
+            stream (bool, optional): Stream lightweight column rows instead of loading Client objects.
         Returns:
-            list: List of Client objects or an empty list if not authorized.
+            list: List of Client objects (or an iterator of rows when streaming), empty if not authorized.
         """
         username = keyring.get_password(SERVICE_NAME, "current_user")
         if not username:
             return []
         tokens = TokenManager.load_tokens(username)
         if tokens and "token" in tokens and "key" in tokens:
-            return ClientController.get_all_clients(tokens["token"])
+            if stream:
+                return ClientController.iter_clients(tokens["token"])
+            return ClientController.get_all_clients(tokens["token"], offset, limit)
         return []
 
     @staticmethod
-    def get_contracts() -> list:
+    @Telemetry.traced
+    def get_client_detail(client_id: int = None, full_name: str = None):
+        """
+        Retrieves a client with its commercial contact, contracts and events if the user is authenticated.
+        Args:
+            client_id (int, optional): The ID of the client.
+            full_name (str, optional): The full name of the client, when no ID is given.
+        Returns:
+            Client: The Client object with its relationships loaded, or None if not found or not authenticated.
+        """
+        username = keyring.get_password(SERVICE_NAME, "current_user")
+        if not username:
+            return None
+        tokens = TokenManager.load_tokens(username)
+        if tokens and "token" in tokens and "key" in tokens:
+            return ClientController.get_client_detail(tokens["token"], client_id, full_name)
+        return None
+
+    @staticmethod
+    @Telemetry.traced
+    def get_contracts(offset: int = None, limit: int = None, stream: bool = False) -> list:
         """
         Retrieves all contracts if the user is authenticated and authorized.
+        Args:
+            offset (int, optional): Number of contracts to skip, for paginated retrieval.
+            limit (int, optional): Maximum number of contracts to return, for paginated retrieval.
+            stream (bool, optional): Stream lightweight column rows instead of loading Contract objects.
         Returns:
-            list: List of Contract objects or an empty list if not authorized.
+            list: List of Contract objects (or an iterator of rows when streaming), empty if not authorized.
         """
         username = keyring.get_password(SERVICE_NAME, "current_user")
         if not username:
             return []
         tokens = TokenManager.load_tokens(username)
         if tokens and "token" in tokens and "key" in tokens:
-            return ContractController.get_all_contracts(tokens["token"])
+            if stream:
+                return ContractController.iter_contracts(tokens["token"])
+            return ContractController.get_all_contracts(tokens["token"], offset, limit)
         return []
 
     @staticmethod
-    def get_events() -> list:
+    @Telemetry.traced
+    def get_events(offset: int = None, limit: int = None, stream: bool = False) -> list:
         """
         Retrieves all events if the user is authenticated and authorized.
+        Args:
+            offset (int, optional): Number of events to skip, for paginated retrieval.
+            limit (int, optional): Maximum number of events to return, for paginated retrieval.
+            stream (bool, optional): Stream lightweight column rows instead of loading Event objects.
         Returns:
-            list: List of Event objects or an empty list if not authorized.
+            list: List of Event objects (or an iterator of rows when streaming), empty if not authorized.
         """
         username = keyring.get_password(SERVICE_NAME, "current_user")
         if not username:
             return []
         tokens = TokenManager.load_tokens(username)
         if tokens and "token" in tokens and "key" in tokens:
-            return EventController.get_all_events(tokens["token"])
+            if stream:
+                return EventController.iter_events(tokens["token"])
+            return EventController.get_all_events(tokens["token"], offset, limit)
         return []
 
     @staticmethod
+    @Telemetry.traced
     def verify_authentication_and_authorization(action: str) -> tuple:
         """
         Verify the user's authentication and authorization for a specific action.
@@ -279,11 +333,12 @@ class MainController:
                     if permission_check_method and permission_check_method(user):
                         return token, user, True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
         return None, None, False
 
     @staticmethod
-    def create_contract(client_id: int, total_amount: float, amount_due: float, signed: bool) -> str:
+    @Telemetry.traced
+    def create_contract(client_id: int, total_amount: Decimal, amount_due: Decimal, signed: bool) -> str:
         """
         Create a new contract if the user is authorized.
         Returns:
@@ -304,17 +359,18 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error creating contract: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
+    @Telemetry.traced
     def update_contract(
         contract_id: int,
         client_id: int = None,
-        total_amount: float = None,
-        amount_due: float = None,
+        total_amount: Decimal = None,
+        amount_due: Decimal = None,
         signed: bool = None,
     ) -> str:
         """
@@ -338,12 +394,81 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error updating contract: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
+    def _bulk_update_contracts(update, contract_ids: list, *args) -> str:
+        """
+        Apply a ContractController bulk update to contracts if the user is authorized. The permission is
+        checked once for the whole batch: commercials only update their own contracts.
+        Args:
+            update (callable): ContractController bulk update, e.g. ContractController.mark_signed.
+            contract_ids (list): The IDs of the contracts to update.
+            *args: Extra arguments of the update, before the commercial contact ID.
+        Returns:
+            str: Message indicating the result of the operation, with the IDs left unchanged.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("update_contract")
+        if authorized:
+            try:
+                commercial_contact_id = user.id if user.department.name == "Commercial" else None
+                updated = update(get_session(), contract_ids, *args, commercial_contact_id)
+                skipped = sorted(set(contract_ids) - set(updated))
+                if not updated:
+                    return "No contract updated: the contracts were not found, not yours or already up to date."
+                message = f"{len(updated)} contracts updated successfully."
+                if skipped:
+                    skipped_ids = ", ".join(map(str, skipped))
+                    message += f" Left unchanged (not found, not yours or already up to date): {skipped_ids}."
+                return message
+            except ValueError as ve:
+                Telemetry.capture_exception(ve, expected=True)
+                return f"Validation Error: {ve}"
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error updating contracts: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def sign_contracts(contract_ids: list) -> str:
+        """
+        Mark several contracts as signed with one statement, if the user is authorized.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        return MainController._bulk_update_contracts(ContractController.mark_signed, contract_ids)
+
+    @staticmethod
+    @Telemetry.traced
+    def settle_contracts(contract_ids: list) -> str:
+        """
+        Set the amount due of several contracts to 0 with one statement, if the user is authorized.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        return MainController._bulk_update_contracts(ContractController.settle, contract_ids)
+
+    @staticmethod
+    @Telemetry.traced
+    def adjust_contracts(contract_ids: list, percentage: float) -> str:
+        """
+        Apply a percentage adjustment to the amounts of several contracts with one statement, if the user
+        is authorized.
+        Args:
+            contract_ids (list): The IDs of the contracts.
+            percentage (float): The adjustment, e.g. 5 for +5% or -10 for -10%.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        return MainController._bulk_update_contracts(ContractController.adjust_amounts, contract_ids, percentage)
+
+    @staticmethod
+    @Telemetry.traced
     def create_event(
         contract_id: int,
         event_name: str,
@@ -361,7 +486,15 @@ class MainController:
         token, user, authorized = MainController.verify_authentication_and_authorization("create_event")
         if authorized:
             try:
-                client_id = ContractController.get_client_id_by_contract_id(contract_id)
+                contract = ContractController.get_contract_by_id(contract_id)
+                if not contract:
+                    return "Contract not found."
+                if not contract.signed:
+                    return "The contract is not signed."
+                if contract.commercial_contact_id != user.id:
+                    return "You are not authorized to create an event for this contract."
+
+                client_id = contract.client_id
                 support_contact_id = None  # Initially set to None until a support contact is assigned
                 success = EventController.create_event(
                     contract_id,
@@ -381,12 +514,13 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error creating event: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
+    @Telemetry.traced
     def update_event(
         event_id: int,
         contract_id: int = None,
@@ -418,6 +552,11 @@ class MainController:
                     )
                 elif authorized_support:
                     # If Support department, update all fields of the events they are responsible for.
+                    event = EventController.get_event_by_id(event_id)
+                    if not event:
+                        return "Event not found."
+                    if event.support_contact_id != user.id:
+                        return "You are not authorized to update this event."
                     success = EventController.update_event(
                         token,
                         user,
@@ -442,12 +581,13 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error updating event: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
+    @Telemetry.traced
     def create_collaborator(username: str, password: str, email: str, name: str, department_id: int) -> str:
         """
         Create a new collaborator if the user is authorized.
@@ -463,12 +603,13 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error creating collaborator: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
+    @Telemetry.traced
     def update_collaborator(
         user_id: int,
         username: str = None,
@@ -493,15 +634,20 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error updating collaborator: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
-    def delete_collaborator(user_id: int) -> str:
+    @Telemetry.traced
+    def delete_collaborator(user_id: int, chunk_size: int = None) -> str:
         """
         Delete an existing collaborator if the user is authorized.
+        Args:
+            user_id (int): The ID of the collaborator to delete.
+            chunk_size (int, optional): Number of clients, contracts or events deleted per transaction,
+                None to delete the collaborator and their portfolio in one transaction.
         Returns:
             str: Message indicating the result of the operation.
         """
@@ -509,19 +655,20 @@ class MainController:
         if authorized:
             try:
                 session = get_session_root()
-                if UserController.delete_user(session, user_id):
+                if UserController.delete_user(session, user_id, chunk_size):
                     return "Collaborator deleted successfully."
                 else:
                     return "Failed to delete collaborator. Please check the input data."
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error deleting collaborator: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
+    @Telemetry.traced
     def get_current_user():
         """
         Retrieve the current authenticated user.
@@ -530,10 +677,11 @@ class MainController:
             username = keyring.get_password(SERVICE_NAME, "current_user")
             return username
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
+    @Telemetry.traced
     def get_user_role(username):
         """
         Retrieve the role of the given user.
@@ -545,31 +693,185 @@ class MainController:
                 return user.department.name
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
-    def filter_events(filters: dict) -> list:
+    @Telemetry.traced
+    def filter_events(filters: dict, stream: bool = False) -> list:
         """
         Filter events based on specified criteria.
         Args:
             filters (dict): Dictionary of filters.
+            stream (bool, optional): Stream lightweight column rows instead of loading Event objects.
         Returns:
-            list: List of filtered Event objects.
+            list: List of filtered Event objects (or an iterator of rows when streaming).
         """
         token, user, authorized = MainController.verify_authentication_and_authorization("filter_events")
         if authorized:
             try:
                 if user.department.name == "Support":
                     filters["support_contact_id"] = user.id
+                if stream:
+                    return EventController.iter_filtered_events(filters)
                 return EventController.get_filtered_events(filters)
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
+                return []
+        else:
+            return []
+
+    @staticmethod
+    @Telemetry.traced
+    def revenue_report(by: str = "commercial"):
+        """
+        Compute the revenue report if the user is authorized.
+        Args:
+            by (str): "commercial" for one row per commercial contact, "month" for one row per month.
+        Returns:
+            iterator: CommercialRevenue or MonthlyRevenue rows, empty if not authorized.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("view_reports")
+        if authorized:
+            try:
+                if by == "month":
+                    return ReportController.revenue_by_month(get_session())
+                return ReportController.revenue_by_commercial(get_session())
+            except Exception as e:
+                Telemetry.capture_exception(e)
                 return []
         else:
             return []
 
     @staticmethod
+    @Telemetry.traced
+    def aging_report(by: str = "client", as_of: date = None):
+        """
+        Compute the accounts receivable aging report if the user is authorized.
+        Args:
+            by (str): "client" for one row per client, "commercial" for one row per commercial contact.
+            as_of (date, optional): Date the ages of the amounts due are computed at. Defaults to today.
+        Returns:
+            iterator: AgingRow rows, empty if not authorized.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("view_reports")
+        if authorized:
+            try:
+                return ReportController.aging(get_session(), by, as_of)
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return []
+        else:
+            return []
+
+    @staticmethod
+    @Telemetry.traced
+    def analytics_report(
+        by: str = "month", signed: bool = None, date_from: date = None, date_to: date = None, cache_dir: str = None
+    ) -> list:
+        """
+        Slice the contracts or events of the analytics snapshot if the user is authorized.
+        Args:
+            by (str): "month", "commercial" or "signed" for contracts, "attendees" for events.
+            signed (bool, optional): Keep only signed or unsigned contracts, or the events of such contracts.
+            date_from (date, optional): First creation date of the contracts, or start date of the events.
+            date_to (date, optional): Last creation date of the contracts, or start date of the events.
+            cache_dir (str, optional): Directory of the snapshot cache, reused while the tables are unchanged.
+        Returns:
+            list: ContractSlice or EventSlice rows, empty if not authorized.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("view_reports")
+        if authorized:
+            try:
+                # Imported here so that the other commands do not pay for importing NumPy.
+                from controllers.analytics_controller import AnalyticsController
+
+                snapshot = AnalyticsController.load_snapshot(get_session(), cache_dir)
+                return snapshot.slice(by, signed, date_from, date_to)
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return []
+        else:
+            return []
+
+    @staticmethod
+    @Telemetry.traced
+    def commission_report(rules, date_from: date = None, date_to: date = None, cache_dir: str = None) -> list:
+        """
+        Compute the commissions of the commercial contacts if the user is authorized.
+        Args:
+            rules (CommissionRules): The commission rules, read with utils.commissions.load_rules.
+            date_from (date, optional): First creation date of the signed contracts.
+            date_to (date, optional): Last creation date of the signed contracts.
+            cache_dir (str, optional): Directory of the analytics snapshot cache.
+        Returns:
+            list: CommissionRow rows, empty if not authorized.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("view_reports")
+        if authorized:
+            try:
+                from controllers.analytics_controller import AnalyticsController
+
+                return AnalyticsController.commissions(get_session(), rules, date_from, date_to, cache_dir)
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return []
+        else:
+            return []
+
+    @staticmethod
+    @Telemetry.traced
+    def get_dashboard(user_id: int = None) -> tuple:
+        """
+        Retrieve the dashboard figures with primary key reads of the summary tables. Commercials and support
+        contacts see their own figures; management sees those of a given collaborator, or of everyone.
+        Args:
+            user_id (int, optional): The collaborator whose figures to show, for management users.
+        Returns:
+            tuple: The list of CommercialSummary and the list of SupportSummary to display, both empty if the
+                user is not authorized.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("view_dashboard")
+        if authorized:
+            try:
+                session = get_session()
+                if user.department.name == "Gestion":
+                    if user_id is None:
+                        return SummaryController.get_all_summaries(session)
+                elif user_id not in (None, user.id):
+                    return [], []
+                else:
+                    user_id = user.id
+                commercial = SummaryController.get_commercial_summary(session, user_id)
+                support = SummaryController.get_support_summary(session, user_id)
+                return [commercial] if commercial else [], [support] if support else []
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return [], []
+        else:
+            return [], []
+
+    @staticmethod
+    @Telemetry.traced
+    def rebuild_summaries() -> str:
+        """
+        Recompute the dashboard summary tables from the clients, contracts and events, if the user is authorized.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("rebuild_summaries")
+        if authorized:
+            try:
+                commercials, supports = SummaryController.rebuild(get_session())
+                return f"Summaries rebuilt successfully ({commercials} commercials, {supports} support contacts)."
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error rebuilding the summaries: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
     def create_client(full_name: str, email: str, phone: str, company_name: str) -> str:
         """
         Create a new client if the user is authorized.
@@ -591,12 +893,13 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error creating client: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
+    @Telemetry.traced
     def update_client(
         client_id: int, full_name: str = None, email: str = None, phone: str = None, company_name: str = None
     ) -> str:
@@ -608,6 +911,12 @@ class MainController:
         token, user, authorized = MainController.verify_authentication_and_authorization("update_client")
         if authorized:
             try:
+                commercial_contact_id = ClientController.get_commercial_contact_id(client_id)
+                if commercial_contact_id is None:
+                    return "Client not found."
+                if commercial_contact_id != user.id:
+                    return "You are not authorized to update this client."
+
                 success = ClientController.update_client(client_id, full_name, email, phone, company_name)
                 if success:
                     return "Client updated successfully."
@@ -616,26 +925,368 @@ class MainController:
             except ValueError as ve:
                 return f"Validation Error: {ve}"
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return f"Error updating client: {e}"
         else:
             return "You are not authorized to perform this action."
 
     @staticmethod
-    def filter_contracts(filters: dict):
+    @Telemetry.traced
+    def reassign_collaborator(
+        user_id: int, target_ids: list, balance: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> str:
+        """
+        Move the clients, contracts and events of a departing collaborator to other collaborators of the same
+        department, then delete the collaborator, if the user is authorized.
+        Args:
+            user_id (int): The ID of the departing collaborator.
+            target_ids (list): The IDs of the collaborators receiving the portfolio.
+            balance (bool): Whether to give more rows to the collaborators having the fewest.
+            chunk_size (int): Number of rows moved per transaction.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("manage_users")
+        if authorized:
+            try:
+                session = get_session_root()
+                result = UserController.reassign_and_delete_user(session, user_id, target_ids, balance, chunk_size)
+                return (
+                    f"Collaborator deleted successfully after reassigning {result.clients} clients, "
+                    f"{result.contracts} contracts, {result.events} events and "
+                    f"{result.archived_events} archived events."
+                )
+            except ValueError as ve:
+                Telemetry.capture_exception(ve, expected=True)
+                return f"Validation Error: {ve}"
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error reassigning collaborator: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def archive_events(older_than_days: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+        """
+        Move the events that ended long ago to the EventArchive table, if the user is authorized.
+        Args:
+            older_than_days (int, optional): Minimum age of the end of the events, in days.
+                Defaults to Config.EVENT_ARCHIVE_AFTER_DAYS.
+            chunk_size (int): Number of events moved per transaction.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("archive_events")
+        if authorized:
+            try:
+                if older_than_days is None:
+                    older_than_days = Config.EVENT_ARCHIVE_AFTER_DAYS
+                archived = EventController.archive_events(get_session(), older_than_days, chunk_size)
+                if not archived:
+                    return f"No event ended more than {older_than_days} days ago."
+                return f"{archived} events archived successfully."
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error archiving events: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def auto_assign_events() -> str:
+        """
+        Assign the upcoming events without a support contact across the Support department, if the user is
+        authorized.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization(
+            "update_event_support_contact"
+        )
+        if authorized:
+            try:
+                result = EventController.auto_assign(get_session())
+                counts = {support_id: len(ids) for support_id, ids in result.assignments.items() if ids}
+                assigned = sum(counts.values())
+                if not assigned and not result.unassigned:
+                    return "No upcoming event without a support contact."
+                message = f"{assigned} events assigned successfully to {len(counts)} support contacts."
+                if result.unassigned:
+                    message += (
+                        " Left unassigned (overlapping the events of every support contact): "
+                        f"{', '.join(map(str, result.unassigned))}."
+                    )
+                return message
+            except ValueError as ve:
+                Telemetry.capture_exception(ve, expected=True)
+                return f"Validation Error: {ve}"
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error assigning events: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def find_event_conflicts():
+        """
+        List the overlapping events of each support contact if the user is authorized.
+        Returns:
+            iterator: EventConflict rows, empty if not authorized.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization(
+            "update_event_support_contact"
+        )
+        if authorized:
+            try:
+                return EventController.find_conflicts(get_session())
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return []
+        else:
+            return []
+
+    @staticmethod
+    @Telemetry.traced
+    def export_calendar(
+        support_contact_id: int = None, client_id: int = None, path: str = None, stream=None, incremental: bool = False
+    ) -> str:
+        """
+        Export the events of a support contact or of a client as an iCalendar feed, if the user is authorized.
+        Support users export their own events, commercial users the events of their clients, and management
+        any feed. Without a support contact or a client, the feed of the logged-in user is exported.
+        Args:
+            support_contact_id (int, optional): The support contact whose events to export.
+            client_id (int, optional): The client whose events to export.
+            path (str, optional): The calendar file to write, instead of ``stream``.
+            stream (file, optional): Text stream receiving the calendar when no path is given.
+            incremental (bool): Only regenerate the events modified since the previous export to ``path``.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("export_calendar")
+        if not authorized:
+            return "You are not authorized to perform this action."
+        if support_contact_id is None and client_id is None:
+            support_contact_id = user.id
+        department = user.department.name
+        if department == "Support" and (client_id is not None or support_contact_id != user.id):
+            return "You are not authorized to export this calendar."
+        if department == "Commercial":
+            if client_id is None or ClientController.get_commercial_contact_id(client_id) != user.id:
+                return "You are not authorized to export this calendar."
+        try:
+            result = EventController.export_calendar(
+                get_session(), support_contact_id, client_id, path, stream, incremental
+            )
+            return (
+                f"Calendar exported successfully: {result.written} events written, {result.removed} removed, "
+                f"{result.total} in the calendar."
+            )
+        except (OSError, ValueError) as e:
+            Telemetry.capture_exception(e, expected=True)
+            return f"Validation Error: {e}"
+        except Exception as e:
+            Telemetry.capture_exception(e)
+            return f"Error exporting the calendar: {e}"
+
+    @staticmethod
+    @Telemetry.traced
+    def import_clients(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, reject_path: str = None) -> str:
+        """
+        Import clients from a CSV file, assigned to the logged-in commercial, if the user is authorized.
+        Args:
+            path (str): Path of the CSV file.
+            chunk_size (int): Number of rows validated and inserted at a time.
+            reject_path (str, optional): Path of the CSV file receiving the rejected rows.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("create_client")
+        if authorized:
+            try:
+                result = ImportController.import_clients(path, user.id, chunk_size, reject_path)
+                return MainController._import_message("clients", result, reject_path)
+            except (OSError, ValueError) as e:
+                Telemetry.capture_exception(e, expected=True)
+                return f"Validation Error: {e}"
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error importing clients: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def import_contracts(
+        path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, reject_path: str = None, checkpoint_name: str = None
+    ) -> str:
+        """
+        Import contracts from a CSV file if the user is authorized, resuming from the checkpoint if any.
+        Args:
+            path (str): Path of the CSV file.
+            chunk_size (int): Number of rows validated and inserted at a time.
+            reject_path (str, optional): Path of the CSV file receiving the rejected rows.
+            checkpoint_name (str, optional): Name of the checkpoint, None to disable resuming.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("create_contract")
+        if authorized:
+            try:
+                result = ImportController.import_contracts(path, chunk_size, reject_path, checkpoint_name)
+                return MainController._import_message("contracts", result, reject_path)
+            except (OSError, ValueError) as e:
+                Telemetry.capture_exception(e, expected=True)
+                return f"Validation Error: {e}"
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error importing contracts: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def import_events(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, reject_path: str = None) -> str:
+        """
+        Import events from a CSV file for the signed contracts of the logged-in commercial, if the user is
+        authorized.
+        Args:
+            path (str): Path of the CSV file.
+            chunk_size (int): Number of rows validated and inserted at a time.
+            reject_path (str, optional): Path of the CSV file receiving the rejected rows.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("create_event")
+        if authorized:
+            try:
+                result = ImportController.import_events(path, user.id, chunk_size, reject_path)
+                return MainController._import_message("events", result, reject_path)
+            except (OSError, ValueError) as e:
+                Telemetry.capture_exception(e, expected=True)
+                return f"Validation Error: {e}"
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error importing events: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def export_database(
+        directory: str, output_format: str = "jsonl", rows_per_file: int = DEFAULT_ROWS_PER_FILE
+    ) -> str:
+        """
+        Export every table to a backup directory if the user is authorized.
+        Args:
+            directory (str): The backup directory.
+            output_format (str): "jsonl" or "csv".
+            rows_per_file (int): Maximum number of rows per compressed file.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("manage_backups")
+        if authorized:
+            try:
+                manifest = BackupManager.export(directory, output_format, rows_per_file)
+                rows = sum(entry["rows"] for entry in manifest["tables"])
+                return f"{rows} rows of {len(manifest['tables'])} tables exported successfully to {directory}."
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error exporting the database: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def export_changes(directory: str, output_format: str = "jsonl", lag_seconds: int = DEFAULT_LAG_SECONDS) -> str:
+        """
+        Export the clients, contracts and events modified since the previous incremental export, if the
+        user is authorized.
+        Args:
+            directory (str): Directory holding the watermark and the change sets.
+            output_format (str): "jsonl" or "csv".
+            lag_seconds (int): Delay before a modification is exported.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("manage_backups")
+        if authorized:
+            try:
+                manifest = BackupManager.export_changes(directory, output_format, lag_seconds)
+                if manifest is None:
+                    return f"No new changes to export: the previous export was less than {lag_seconds}s ago."
+                details = ", ".join(f"{entry['name']}: {entry['rows']}" for entry in manifest["tables"])
+                return f"Changes up to {manifest['until']} exported successfully ({details})."
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error exporting the changes: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    @Telemetry.traced
+    def restore_database(directory: str, workers: int = 4) -> str:
+        """
+        Replace the content of the database with a backup if the user is authorized.
+        Args:
+            directory (str): The backup directory.
+            workers (int): Number of tables loaded at the same time.
+        Returns:
+            str: Message indicating the result of the operation.
+        """
+        token, user, authorized = MainController.verify_authentication_and_authorization("manage_backups")
+        if authorized:
+            try:
+                counts = BackupManager.restore(directory, workers)
+                # The backup may predate the summary tables or come from another schema version.
+                SummaryController.rebuild(get_session_root())
+                details = ", ".join(f"{table}: {count}" for table, count in counts.items())
+                return f"Database restored successfully ({details})."
+            except (OSError, ValueError) as e:
+                Telemetry.capture_exception(e, expected=True)
+                return f"Validation Error: {e}"
+            except Exception as e:
+                Telemetry.capture_exception(e)
+                return f"Error restoring the database: {e}"
+        else:
+            return "You are not authorized to perform this action."
+
+    @staticmethod
+    def _import_message(entity: str, result, reject_path: str) -> str:
+        """
+        Build the result message of a bulk import.
+        """
+        if result.rejected and not result.imported:
+            message = f"No {entity} imported. {result.rejected} rows rejected"
+            return message + (f", see {reject_path}." if reject_path else ".")
+        message = f"{result.imported} {entity} imported successfully."
+        if result.rejected:
+            message += f" {result.rejected} rows rejected"
+            message += f", see {reject_path}." if reject_path else "."
+        return message
+
+    @staticmethod
+    @Telemetry.traced
+    def filter_contracts(filters: dict, stream: bool = False):
         """
         Filter contracts based on specified criteria.
         Args:
             filters (dict): Dictionary of filters.
+            stream (bool, optional): Stream lightweight column rows instead of loading Contract objects.
         Returns:
-            list: List of filtered Contract objects.
+            list: List of filtered Contract objects (or an iterator of rows when streaming).
         """
         token, user, authorized = MainController.verify_authentication_and_authorization("filter_contracts")
         if authorized:
             try:
+                if stream:
+                    return ContractController.iter_filtered_contracts(filters)
                 return ContractController.get_filtered_contracts(filters)
             except Exception as e:
-                sentry_sdk.capture_exception(e)
+                Telemetry.capture_exception(e)
                 return []
         else:
             raise PermissionError("You are not authorized to perform this action.")
@@ -0,0 +1,180 @@
+from collections import namedtuple
+from datetime import date
+from sqlalchemy import case, extract, func
+from models.client import Client
+from models.contract import Contract
+from models.user import User
+from utils.money import to_money
+
+# Revenue of the contracts of a commercial contact.
+CommercialRevenue = namedtuple(
+    "CommercialRevenue",
+    [
+        "commercial_contact_id",
+        "commercial_name",
+        "contracts",
+        "signed_contracts",
+        "signed_ratio",
+        "total_amount",
+        "signed_amount",
+        "amount_due",
+    ],
+)
+
+# Revenue of the contracts created in a month, with the signed amount accumulated since the first month.
+MonthlyRevenue = namedtuple(
+    "MonthlyRevenue",
+    [
+        "month",
+        "contracts",
+        "signed_contracts",
+        "signed_ratio",
+        "total_amount",
+        "signed_amount",
+        "amount_due",
+        "cumulative_signed_amount",
+    ],
+)
+
+REVENUE_GROUPINGS = ["commercial", "month"]
+
+# Age buckets of the amounts due, in days since the creation of the contract: (first day, last day or None).
+AGING_BUCKETS = [(0, 30), (31, 60), (61, 90), (91, None)]
+
+# Amounts due of a client or a commercial contact, by age of the contracts.
+AgingRow = namedtuple(
+    "AgingRow", ["id", "name", "contracts", "days_0_30", "days_31_60", "days_61_90", "days_over_90", "total_due"]
+)
+
+AGING_GROUPINGS = ["client", "commercial"]
+
+
+class ReportController:
+    """
+    Computes the management reports with aggregate queries, so that only one row per group leaves the
+    database whatever the number of contracts.
+    """
+
+    @staticmethod
+    def _revenue_columns() -> list:
+        """
+        Aggregates shared by the revenue reports: number of contracts, number of signed contracts, total
+        amount, signed amount and amount due.
+        """
+        return [
+            func.count(Contract.id),
+            func.coalesce(func.sum(case((Contract.signed.is_(True), 1), else_=0)), 0),
+            func.coalesce(func.sum(Contract.total_amount), 0),
+            func.coalesce(func.sum(case((Contract.signed.is_(True), Contract.total_amount), else_=0)), 0),
+            func.coalesce(func.sum(Contract.amount_due), 0),
+        ]
+
+    @staticmethod
+    def _ratio(part: int, whole: int) -> float:
+        return round(part / whole, 4) if whole else 0.0
+
+    @staticmethod
+    def revenue_by_commercial(session, batch_size: int = 1000):
+        """
+        Streams the revenue of each commercial contact, computed with one GROUP BY query.
+        Args:
+            session (Session): The SQLAlchemy session.
+            batch_size (int): Number of groups fetched from the database at a time.
+        Yields:
+            CommercialRevenue: One row per commercial contact, ordered by ID. Contracts without a commercial
+                contact are grouped under None.
+        """
+        query = (
+            session.query(Contract.commercial_contact_id, User.name, *ReportController._revenue_columns())
+            .outerjoin(User, User.id == Contract.commercial_contact_id)
+            .group_by(Contract.commercial_contact_id, User.name)
+            .order_by(Contract.commercial_contact_id)
+        )
+        for commercial_contact_id, name, contracts, signed, total, signed_total, due in query.yield_per(batch_size):
+            yield CommercialRevenue(
+                commercial_contact_id,
+                name,
+                contracts,
+                int(signed),
+                ReportController._ratio(int(signed), contracts),
+                to_money(total),
+                to_money(signed_total),
+                to_money(due),
+            )
+
+    @staticmethod
+    def revenue_by_month(session, batch_size: int = 1000):
+        """
+        Streams the revenue of the contracts created each month, computed with one GROUP BY query.
+
+        The cumulative signed amount is a running total over the ordered groups. It is accumulated while
+        streaming rather than with a window function, which MySQL 5.7 does not support; only one row per
+        month is transferred either way.
+        Args:
+            session (Session): The SQLAlchemy session.
+            batch_size (int): Number of groups fetched from the database at a time.
+        Yields:
+            MonthlyRevenue: One row per month with contracts, in chronological order.
+        """
+        year = extract("year", Contract.date_created)
+        month = extract("month", Contract.date_created)
+        query = (
+            session.query(year, month, *ReportController._revenue_columns())
+            .group_by(year, month)
+            .order_by(year, month)
+        )
+        cumulative = to_money(0)
+        for year_value, month_value, contracts, signed, total, signed_total, due in query.yield_per(batch_size):
+            cumulative += to_money(signed_total)
+            yield MonthlyRevenue(
+                f"{int(year_value):04d}-{int(month_value):02d}",
+                contracts,
+                int(signed),
+                ReportController._ratio(int(signed), contracts),
+                to_money(total),
+                to_money(signed_total),
+                to_money(due),
+                cumulative,
+            )
+
+    @staticmethod
+    def aging(session, by: str = "client", as_of: date = None, batch_size: int = 1000):
+        """
+        Streams the accounts receivable aging report: the amounts still due on the contracts, bucketed by
+        the number of days since the creation of the contract (0-30, 31-60, 61-90 and over 90 days), per
+        client or per commercial contact. The buckets are computed with conditional sums in one GROUP BY
+        query over the contracts with an amount due.
+        Args:
+            session (Session): The SQLAlchemy session.
+            by (str): "client" or "commercial".
+            as_of (date, optional): Date the ages are computed at. Defaults to today.
+            batch_size (int): Number of groups fetched from the database at a time.
+        Yields:
+            AgingRow: One row per client or commercial contact with an amount due, ordered by ID.
+        """
+        age = func.datediff(as_of or date.today(), Contract.date_created)
+        buckets = []
+        for first_day, last_day in AGING_BUCKETS:
+            if last_day is None:
+                in_bucket = age >= first_day
+            elif first_day == 0:
+                # Contracts dated in the future are counted as current.
+                in_bucket = age <= last_day
+            else:
+                in_bucket = age.between(first_day, last_day)
+            buckets.append(func.coalesce(func.sum(case((in_bucket, Contract.amount_due), else_=0)), 0))
+
+        if by == "commercial":
+            group_id, name = Contract.commercial_contact_id, User.name
+            query = session.query(group_id, name).outerjoin(User, User.id == group_id)
+        else:
+            group_id, name = Contract.client_id, Client.full_name
+            query = session.query(group_id, name).outerjoin(Client, Client.id == group_id)
+        query = (
+            query.add_columns(func.count(Contract.id), *buckets, func.sum(Contract.amount_due))
+            .filter(Contract.amount_due > 0)
+            .group_by(group_id, name)
+            .order_by(group_id)
+        )
+        for row_id, row_name, contracts, *amounts in query.yield_per(batch_size):
+            yield AgingRow(row_id, row_name, contracts, *(to_money(amount) for amount in amounts))
@@ -0,0 +1,280 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import with_expression
+from models.client import Client
+from models.contract import Contract
+from models.department import Department
+from models.event import Event
+from models.summary import CommercialSummary, SupportSummary
+from models.user import User
+from utils.batch_validator import IN_CHUNK_SIZE
+from utils.money import to_money
+
+COMMERCIAL_FIGURES = ["client_count", "contract_count", "signed_total", "outstanding"]
+SUPPORT_FIGURES = ["assigned_events"]
+
+
+class SummaryController:
+    """
+    Maintains the CommercialSummary and SupportSummary tables read by the dashboards.
+
+    The controllers writing clients, contracts and events add the effect of the write to the rows of the
+    collaborators it affects, before committing: the deltas are computed from the written rows only, and
+    applied with one ``UPDATE ... SET figure = figure + delta`` upsert in the same transaction, so a dashboard
+    never sees a write without its effect and a write costs the same whatever the size of the portfolios.
+    The methods applying deltas do not commit. ``rebuild`` recomputes every row with aggregate queries, to
+    repair the tables.
+
+    Deltas are dictionaries of figure deltas by collaborator ID, e.g. ``{7: {"contract_count": 1}}``, and
+    are built with the ``count_*`` methods from column values or the ``*_deltas`` methods from a query.
+    """
+
+    @staticmethod
+    def _chunks(user_ids):
+        distinct_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+        for start in range(0, len(distinct_ids), IN_CHUNK_SIZE):
+            yield distinct_ids[start : start + IN_CHUNK_SIZE]
+
+    @staticmethod
+    def _upsert(session, table, rows: list, columns: list):
+        """
+        Inserts the summary rows, or updates them when the collaborator already has one.
+        """
+        if not rows:
+            return
+        statement = insert(table)
+        updates = {column: statement.inserted[column] for column in columns}
+        session.execute(statement.on_duplicate_key_update(**updates, refreshed_at=func.now()), rows)
+
+    @staticmethod
+    def _add(session, table, columns: list, deltas: tuple):
+        """
+        Sums the deltas and adds them to the summary rows, creating the rows missing. Collaborators without
+        any change, or None, are skipped.
+        """
+        totals = defaultdict(lambda: dict.fromkeys(columns, 0))
+        for delta in deltas:
+            for user_id, figures in delta.items():
+                if user_id is not None:
+                    for column, value in figures.items():
+                        totals[user_id][column] += value
+        rows = [{"user_id": user_id, **figures} for user_id, figures in sorted(totals.items()) if any(figures.values())]
+        if not rows:
+            return
+        statement = insert(table)
+        updates = {column: table.c[column] + statement.inserted[column] for column in columns}
+        session.execute(statement.on_duplicate_key_update(**updates, refreshed_at=func.now()), rows)
+
+    @staticmethod
+    def add_commercials(session, *deltas):
+        """
+        Adds deltas to the CommercialSummary rows. The caller commits.
+        Args:
+            session (Session): The SQLAlchemy session of the write.
+            *deltas (dict): Deltas of client_count, contract_count, signed_total and outstanding by commercial ID.
+        """
+        SummaryController._add(session, CommercialSummary.__table__, COMMERCIAL_FIGURES, deltas)
+
+    @staticmethod
+    def add_supports(session, *deltas):
+        """
+        Adds deltas to the SupportSummary rows. The caller commits.
+        Args:
+            session (Session): The SQLAlchemy session of the write.
+            *deltas (dict): Deltas of assigned_events by support contact ID.
+        """
+        SummaryController._add(session, SupportSummary.__table__, SUPPORT_FIGURES, deltas)
+
+    @staticmethod
+    def count_clients(clients, sign: int = 1) -> dict:
+        """
+        Computes the deltas of clients given as dictionaries of column values, added (sign 1) or removed (-1).
+        """
+        deltas = defaultdict(lambda: {"client_count": 0})
+        for client in clients:
+            deltas[client["commercial_contact_id"]]["client_count"] += sign
+        return dict(deltas)
+
+    @staticmethod
+    def count_contracts(contracts, sign: int = 1) -> dict:
+        """
+        Computes the deltas of contracts given as dictionaries of column values, added (sign 1) or removed (-1).
+        """
+        deltas = defaultdict(lambda: {"contract_count": 0, "signed_total": to_money(0), "outstanding": to_money(0)})
+        for contract in contracts:
+            figures = deltas[contract["commercial_contact_id"]]
+            figures["contract_count"] += sign
+            if contract.get("signed"):
+                figures["signed_total"] += sign * to_money(contract["total_amount"])
+            figures["outstanding"] += sign * to_money(contract["amount_due"])
+        return dict(deltas)
+
+    @staticmethod
+    def count_events(events, sign: int = 1) -> dict:
+        """
+        Computes the deltas of events given as dictionaries of column values, added (sign 1) or removed (-1).
+        """
+        deltas = defaultdict(lambda: {"assigned_events": 0})
+        for event in events:
+            deltas[event["support_contact_id"]]["assigned_events"] += sign
+        return dict(deltas)
+
+    @staticmethod
+    def client_deltas(session, condition, sign: int = 1) -> dict:
+        """
+        Computes the deltas of the clients matching a condition, with one grouped query over those rows.
+        Args:
+            session (Session): The SQLAlchemy session.
+            condition: SQL condition selecting the written clients, e.g. ``Client.id.in_(ids)``.
+            sign (int): 1 for the clients as they are now, -1 to remove them, before a change.
+        Returns:
+            dict: Deltas by commercial ID.
+        """
+        query = select(Client.commercial_contact_id, func.count()).where(condition).group_by(
+            Client.commercial_contact_id
+        )
+        return {user_id: {"client_count": sign * count} for user_id, count in session.execute(query)}
+
+    @staticmethod
+    def contract_deltas(session, condition, sign: int = 1) -> dict:
+        """
+        Computes the deltas of the contracts matching a condition, with one grouped query over those rows.
+        See client_deltas.
+        """
+        query = (
+            select(
+                Contract.commercial_contact_id,
+                func.count(),
+                func.coalesce(func.sum(case((Contract.signed.is_(True), Contract.total_amount), else_=0)), 0),
+                func.coalesce(func.sum(Contract.amount_due), 0),
+            )
+            .where(condition)
+            .group_by(Contract.commercial_contact_id)
+        )
+        return {
+            user_id: {
+                "contract_count": sign * count,
+                "signed_total": sign * to_money(signed_total),
+                "outstanding": sign * to_money(outstanding),
+            }
+            for user_id, count, signed_total, outstanding in session.execute(query)
+        }
+
+    @staticmethod
+    def event_deltas(session, condition, sign: int = 1) -> dict:
+        """
+        Computes the deltas of the events matching a condition, with one grouped query over those rows.
+        See client_deltas.
+        """
+        query = select(Event.support_contact_id, func.count()).where(condition).group_by(Event.support_contact_id)
+        return {user_id: {"assigned_events": sign * count} for user_id, count in session.execute(query)}
+
+    @staticmethod
+    def _commercial_rows(session, user_ids: list) -> list:
+        """
+        Computes the CommercialSummary rows of the given users, with one grouped query per table.
+        """
+        rows = {user_id: {"user_id": user_id, **dict.fromkeys(COMMERCIAL_FIGURES, 0)} for user_id in user_ids}
+        for user_id, figures in SummaryController.client_deltas(
+            session, Client.commercial_contact_id.in_(user_ids)
+        ).items():
+            rows[user_id].update(figures)
+        for user_id, figures in SummaryController.contract_deltas(
+            session, Contract.commercial_contact_id.in_(user_ids)
+        ).items():
+            rows[user_id].update(figures)
+        return list(rows.values())
+
+    @staticmethod
+    def _support_rows(session, user_ids: list) -> list:
+        """
+        Computes the SupportSummary rows of the given users with one grouped query.
+        """
+        rows = {user_id: {"user_id": user_id, "assigned_events": 0} for user_id in user_ids}
+        for user_id, figures in SummaryController.event_deltas(session, Event.support_contact_id.in_(user_ids)).items():
+            rows[user_id].update(figures)
+        return list(rows.values())
+
+    @staticmethod
+    def _department_member_ids(session, name: str) -> set:
+        query = select(User.id).join(Department, User.department_id == Department.id).where(Department.name == name)
+        return set(session.scalars(query))
+
+    @staticmethod
+    def rebuild(session) -> tuple:
+        """
+        Recomputes both summary tables from scratch in one transaction: one row per member of the
+        Commercial and Support departments, and per other collaborator owning clients, contracts or events.
+        Args:
+            session (Session): The SQLAlchemy session.
+        Returns:
+            tuple: The number of CommercialSummary and SupportSummary rows.
+        """
+        try:
+            commercial_ids = SummaryController._department_member_ids(session, "Commercial")
+            commercial_ids.update(session.scalars(select(Client.commercial_contact_id).distinct()))
+            commercial_ids.update(session.scalars(select(Contract.commercial_contact_id).distinct()))
+            support_ids = SummaryController._department_member_ids(session, "Support")
+            support_ids.update(session.scalars(select(Event.support_contact_id).distinct()))
+            commercial_ids.discard(None)
+            support_ids.discard(None)
+
+            session.execute(delete(CommercialSummary))
+            session.execute(delete(SupportSummary))
+            for chunk in SummaryController._chunks(commercial_ids):
+                rows = SummaryController._commercial_rows(session, chunk)
+                SummaryController._upsert(session, CommercialSummary.__table__, rows, COMMERCIAL_FIGURES)
+            for chunk in SummaryController._chunks(support_ids):
+                rows = SummaryController._support_rows(session, chunk)
+                SummaryController._upsert(session, SupportSummary.__table__, rows, SUPPORT_FIGURES)
+            session.commit()
+            return len(commercial_ids), len(support_ids)
+        except Exception:
+            session.rollback()
+            raise
+
+    @staticmethod
+    def get_commercial_summary(session, user_id: int) -> CommercialSummary:
+        """
+        Retrieve the dashboard figures of a commercial contact with a primary key read.
+        Returns:
+            CommercialSummary: The summary, or None if the commercial has none yet.
+        """
+        return session.get(CommercialSummary, user_id)
+
+    @staticmethod
+    def _with_upcoming_events(session):
+        """
+        Queries the SupportSummary rows with their upcoming_events: a count of the events of the support
+        contact not started yet, read from the (support_contact_id, event_date_start) index when the row is
+        loaded, since a stored count would go stale as events start.
+        """
+        upcoming_events = (
+            select(func.count(Event.id))
+            .where(Event.support_contact_id == SupportSummary.user_id, Event.event_date_start > datetime.now())
+            .scalar_subquery()
+        )
+        return session.query(SupportSummary).options(with_expression(SupportSummary.upcoming_events, upcoming_events))
+
+    @staticmethod
+    def get_support_summary(session, user_id: int) -> SupportSummary:
+        """
+        Retrieve the dashboard figures of a support contact with a primary key read, and the number of upcoming
+        events counted at read time. See _with_upcoming_events.
+        Returns:
+            SupportSummary: The summary, or None if the support contact has none yet.
+        """
+        return SummaryController._with_upcoming_events(session).filter(SupportSummary.user_id == user_id).first()
+
+    @staticmethod
+    def get_all_summaries(session) -> tuple:
+        """
+        Retrieve every summary row, for the management dashboard.
+        Returns:
+            tuple: The list of CommercialSummary and the list of SupportSummary, ordered by user ID.
+        """
+        commercials = session.query(CommercialSummary).order_by(CommercialSummary.user_id).all()
+        supports = SummaryController._with_upcoming_events(session).order_by(SupportSummary.user_id).all()
+        return commercials, supports
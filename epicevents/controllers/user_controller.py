@@ -1,9 +1,21 @@
+import heapq
+from collections import namedtuple
 from argon2 import PasswordHasher, exceptions
+from sqlalchemy import delete, func, inspect, null, or_, select, update
 from sqlalchemy.orm import Session
+from controllers.summary_controller import SummaryController
+from models.client import Client
+from models.contract import Contract
+from models.event import Event
+from models.event_archive import EventArchive
 from models.user import User
-import sentry_sdk
+from utils.bulk_import import DEFAULT_CHUNK_SIZE
+from utils.telemetry import Telemetry
 from utils.session_manager import get_session
 
+# Number of clients, contracts, events and archived events moved to the target users by a reassignment.
+ReassignResult = namedtuple("ReassignResult", ["clients", "contracts", "events", "archived_events"])
+
 
 class UserController:
     """
@@ -50,7 +62,7 @@ class UserController:
             session.commit()
             return user
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             session.rollback()
             raise
 
@@ -98,18 +110,55 @@ class UserController:
             session.commit()
             return True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             session.rollback()
             return False
 
     @staticmethod
-    def delete_user(session: Session, user_id: int) -> bool:
+    def _delete_in_chunks(session: Session, model, condition, chunk_size: int, summaries: tuple = None) -> int:
+        """
+        Deletes the rows matching a condition with one DELETE ... WHERE <primary key> IN (...) statement per
+        chunk, each committed on its own, so that no row is loaded as an ORM object. The caller deletes the
+        descendants first, so that the ON DELETE CASCADE of a chunk has nothing left to remove.
+        With ``summaries``, a pair of SummaryController methods such as (event_deltas, add_supports), the rows
+        of each chunk are removed from the summaries in its transaction.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        primary_key = inspect(model).primary_key[0]
+        deleted = 0
+        while True:
+            row_ids = [row_id for (row_id,) in session.query(primary_key).filter(condition).limit(chunk_size)]
+            if not row_ids:
+                return deleted
+            if summaries:
+                row_deltas, add_deltas = summaries
+                add_deltas(session, row_deltas(session, primary_key.in_(row_ids), -1))
+            session.execute(
+                delete(model).where(primary_key.in_(row_ids)).execution_options(synchronize_session=False)
+            )
+            session.commit()
+            deleted += len(row_ids)
+
+    @staticmethod
+    def delete_user(session: Session, user_id: int, chunk_size: int = None) -> bool:
         """
-        Deletes an existing user from the database.
+        Deletes an existing user from the database, with the clients, contracts and events assigned to them.
+
+        The descendants are deleted by the ON DELETE CASCADE of the foreign keys. With ``chunk_size``, the
+        portfolio of the user is first deleted bottom-up by chunks committed one at a time: the events and
+        archived events, then the contracts, then the clients, so that each chunk deletes at most
+        ``chunk_size`` rows and deleting a large portfolio does not hold its locks in one long transaction; an
+        interrupted deletion can be run again.
+        The archived events of a support contact are kept, their support contact being cleared by the
+        ON DELETE SET NULL of the archive.
 
         Args:
             session (Session): The SQLAlchemy session.
             user_id (int): The ID of the user to delete.
+            chunk_size (int, optional): Number of clients, contracts or events deleted per transaction,
+                None to delete everything in one transaction.
 
         Returns:
             bool: True if the deletion is successful, False otherwise.
@@ -119,14 +168,225 @@ class UserController:
             if not user:
                 return False
 
+            client_ids = select(Client.id).where(Client.commercial_contact_id == user_id)
+            contract_condition = or_(Contract.commercial_contact_id == user_id, Contract.client_id.in_(client_ids))
+            contract_ids = select(Contract.id).where(contract_condition)
+            event_condition = or_(
+                Event.support_contact_id == user_id,
+                Event.client_id.in_(client_ids),
+                Event.contract_id.in_(contract_ids),
+            )
+            if chunk_size:
+                UserController._delete_in_chunks(
+                    session,
+                    Event,
+                    event_condition,
+                    chunk_size,
+                    (SummaryController.event_deltas, SummaryController.add_supports),
+                )
+                UserController._delete_in_chunks(
+                    session,
+                    EventArchive,
+                    or_(EventArchive.client_id.in_(client_ids), EventArchive.contract_id.in_(contract_ids)),
+                    chunk_size,
+                )
+                UserController._delete_in_chunks(
+                    session,
+                    Contract,
+                    contract_condition,
+                    chunk_size,
+                    (SummaryController.contract_deltas, SummaryController.add_commercials),
+                )
+                UserController._delete_in_chunks(session, Client, Client.commercial_contact_id == user_id, chunk_size)
+
+            # The rows left are deleted by the cascade: the other collaborators lose their share of them, while
+            # the summaries of the user go with the user.
+            commercial_deltas = SummaryController.contract_deltas(session, contract_condition, -1)
+            support_deltas = SummaryController.event_deltas(session, event_condition, -1)
+            commercial_deltas.pop(user_id, None)
+            support_deltas.pop(user_id, None)
+            SummaryController.add_commercials(session, commercial_deltas)
+            SummaryController.add_supports(session, support_deltas)
             session.delete(user)
             session.commit()
             return True
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             session.rollback()
             return False
 
+    @staticmethod
+    def _assign_least_loaded(row_ids: list, loads: dict) -> dict:
+        """
+        Distributes rows among the target users, each row going to the target with the lowest load.
+        With equal initial loads, the rows are dealt round-robin.
+
+        Args:
+            row_ids (list): The IDs of the rows to distribute.
+            loads (dict): Current number of rows by target user ID, updated in place.
+
+        Returns:
+            dict: List of row IDs by target user ID.
+        """
+        heap = [(load, target_id) for target_id, load in loads.items()]
+        heapq.heapify(heap)
+        assignment = {target_id: [] for target_id in loads}
+        for row_id in row_ids:
+            load, target_id = heapq.heappop(heap)
+            assignment[target_id].append(row_id)
+            heapq.heappush(heap, (load + 1, target_id))
+        loads.update({target_id: load for load, target_id in heap})
+        return assignment
+
+    @staticmethod
+    def _reassign_rows(
+        session: Session, query, model, owner_column, loads: dict, chunk_size: int, summaries: tuple = None
+    ) -> int:
+        """
+        Moves the rows selected by a query to the target users, one chunk at a time. Each chunk is updated
+        with one UPDATE ... WHERE <primary key> IN (...) statement per target user and committed on its own, so
+        that locks are only held for the duration of a chunk.
+
+        Args:
+            session (Session): The SQLAlchemy session.
+            query (Query): Query selecting the rows still owned by the departing user, as (primary key,
+                parent_owner_id) rows. A row whose parent owner is one of the targets follows its parent
+                instead of being balanced.
+            model: The mapped class of the rows.
+            owner_column: The column holding the owner of the rows.
+            loads (dict): Current number of rows by target user ID, updated in place.
+            chunk_size (int): Number of rows moved per transaction.
+            summaries (tuple, optional): Pair of SummaryController methods such as (event_deltas, add_supports),
+                moving the figures of each chunk from the departing user to the targets in its transaction.
+
+        Returns:
+            int: The number of moved rows.
+        """
+        primary_key = inspect(model).primary_key[0]
+        moved = 0
+        last_id = 0
+        while True:
+            rows = query.filter(primary_key > last_id).order_by(primary_key).limit(chunk_size).all()
+            if not rows:
+                return moved
+            last_id = rows[-1][0]
+
+            assignment = UserController._assign_least_loaded(
+                [row_id for row_id, parent_owner_id in rows if parent_owner_id not in loads], loads
+            )
+            for row_id, parent_owner_id in rows:
+                if parent_owner_id in loads:
+                    assignment[parent_owner_id].append(row_id)
+                    loads[parent_owner_id] += 1
+
+            chunk = primary_key.in_([row[0] for row in rows])
+            if summaries:
+                row_deltas, add_deltas = summaries
+                previous = row_deltas(session, chunk, -1)
+            for target_id, row_ids in assignment.items():
+                if row_ids:
+                    session.execute(
+                        update(model)
+                        .where(primary_key.in_(row_ids))
+                        .values({owner_column.key: target_id})
+                        .execution_options(synchronize_session=False)
+                    )
+            if summaries:
+                add_deltas(session, previous, row_deltas(session, chunk))
+            session.commit()
+            moved += len(rows)
+
+    @staticmethod
+    def reassign_and_delete_user(
+        session: Session, user_id: int, target_ids: list, balance: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> ReassignResult:
+        """
+        Moves the clients, contracts, events and archived events of a departing user to one or more users of
+        the same department, then deletes the user.
+
+        The rows are distributed round-robin among the targets or, with ``balance``, to the targets with the
+        fewest rows already. Contracts follow their client when it was moved to one of the targets. The rows are
+        moved with set-based UPDATE statements committed by chunks: if the operation is interrupted, the rows
+        still owned by the user are left untouched and running it again completes the reassignment.
+
+        Args:
+            session (Session): The SQLAlchemy session.
+            user_id (int): The ID of the departing user.
+            target_ids (list): The IDs of the users receiving the rows.
+            balance (bool): Whether to take the current number of rows of the targets into account.
+            chunk_size (int): Number of rows moved per transaction.
+
+        Returns:
+            ReassignResult: The number of moved clients, contracts, events and archived events.
+
+        Raises:
+            ValueError: If the user or a target does not exist, or a target is not in the same department.
+        """
+        try:
+            user = session.query(User).filter_by(id=user_id).first()
+            if not user:
+                raise ValueError("Collaborator not found.")
+            target_ids = sorted(set(target_ids))
+            if not target_ids or user_id in target_ids:
+                raise ValueError("Provide at least one collaborator other than the departing one.")
+            targets = session.query(User.id, User.department_id).filter(User.id.in_(target_ids)).all()
+            if len(targets) != len(target_ids):
+                raise ValueError("Target collaborator not found.")
+            if any(department_id != user.department_id for _, department_id in targets):
+                raise ValueError("Target collaborators must belong to the same department.")
+
+            moved = []
+            for model, owner_column, query, summaries in (
+                (
+                    Client,
+                    Client.commercial_contact_id,
+                    session.query(Client.id, null()).filter(Client.commercial_contact_id == user_id),
+                    (SummaryController.client_deltas, SummaryController.add_commercials),
+                ),
+                (
+                    Contract,
+                    Contract.commercial_contact_id,
+                    session.query(Contract.id, Client.commercial_contact_id)
+                    .outerjoin(Client, Contract.client_id == Client.id)
+                    .filter(Contract.commercial_contact_id == user_id),
+                    (SummaryController.contract_deltas, SummaryController.add_commercials),
+                ),
+                (
+                    Event,
+                    Event.support_contact_id,
+                    session.query(Event.id, null()).filter(Event.support_contact_id == user_id),
+                    (SummaryController.event_deltas, SummaryController.add_supports),
+                ),
+                (
+                    EventArchive,
+                    EventArchive.support_contact_id,
+                    session.query(EventArchive.archive_id, null()).filter(
+                        EventArchive.support_contact_id == user_id
+                    ),
+                    None,
+                ),
+            ):
+                loads = dict.fromkeys(target_ids, 0)
+                if balance:
+                    loads.update(
+                        session.query(owner_column, func.count())
+                        .filter(owner_column.in_(target_ids))
+                        .group_by(owner_column)
+                        .all()
+                    )
+                moved.append(
+                    UserController._reassign_rows(
+                        session, query, model, owner_column, loads, chunk_size, summaries
+                    )
+                )
+
+            session.delete(user)
+            session.commit()
+            return ReassignResult(*moved)
+        except Exception:
+            session.rollback()
+            raise
+
     @staticmethod
     def authenticate_user(session: Session, username: str, password: str) -> bool:
         """
@@ -150,7 +410,7 @@ class UserController:
                     return False
             return False
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             raise
 
     @staticmethod
@@ -169,7 +429,7 @@ class UserController:
                 return user.id
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
@@ -189,7 +449,7 @@ class UserController:
                 return user.id
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
@@ -206,7 +466,7 @@ class UserController:
             user = session.query(User).filter_by(id=user_id).first()
             return user is not None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return False
 
     @staticmethod
@@ -223,5 +483,5 @@ class UserController:
             user = session.query(User).filter_by(id=user_id).first()
             return user
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
@@ -1,8 +1,8 @@
-from controllers.main_controller import MainController
+from views.main_views import start_cli
 
 
 def main():
-    MainController.start_cli()
+    start_cli()
 
 
 if __name__ == "__main__":
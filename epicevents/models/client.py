@@ -1,9 +1,10 @@
 from sqlalchemy import Column, Integer, String, Date, ForeignKey
 from sqlalchemy.orm import relationship
 from config import Base
+from models.mixins import TimestampMixin
 
 
-class Client(Base):
+class Client(TimestampMixin, Base):
     """
     Represents a client in the Epic Events CRM.
 
@@ -16,6 +17,8 @@ class Client(Base):
         date_created (date): Date when the client was first contacted.
         last_contact_date (date): Date of the last contact with the client.
         commercial_contact_id (int): Foreign key referencing the User (commercial contact).
+        created_at (datetime): Date and time when the row was created.
+        updated_at (datetime): Date and time when the row was last modified.
     """
 
     __tablename__ = "Client"
@@ -30,5 +33,5 @@ class Client(Base):
     commercial_contact_id = Column(Integer, ForeignKey("User.id", ondelete="CASCADE"), nullable=True)
 
     commercial_contact = relationship("User", back_populates="clients")
-    contracts = relationship("Contract", back_populates="client", cascade="all, delete")
-    events = relationship("Event", back_populates="client", cascade="all, delete")
+    contracts = relationship("Contract", back_populates="client", cascade="all, delete", passive_deletes=True)
+    events = relationship("Event", back_populates="client", cascade="all, delete", passive_deletes=True)
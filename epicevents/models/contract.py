@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Date, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from config import Base
+from models.money import Money
+from models.mixins import TimestampMixin
 
 
-class Contract(Base):
+class Contract(TimestampMixin, Base):
     """
     Represents a contract in the Epic Events CRM.
 
@@ -11,10 +13,12 @@ class Contract(Base):
         id (int): Unique identifier for the contract.
         client_id (int): Foreign key referencing the Client.
         commercial_contact_id (int): Foreign key referencing the User (commercial contact).
-        total_amount (float): Total amount of the contract.
-        amount_due (float): Amount due for the contract.
+        total_amount (Decimal): Total amount of the contract.
+        amount_due (Decimal): Amount due for the contract.
         date_created (date): Date when the contract was created.
         signed (bool): Indicates whether the contract is signed.
+        created_at (datetime): Date and time when the row was created.
+        updated_at (datetime): Date and time when the row was last modified.
     """
 
     __tablename__ = "Contract"
@@ -22,11 +26,11 @@ class Contract(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     client_id = Column(Integer, ForeignKey("Client.id", ondelete="CASCADE"), nullable=True)
     commercial_contact_id = Column(Integer, ForeignKey("User.id", ondelete="CASCADE"), nullable=True)
-    total_amount = Column(Float, nullable=False)
-    amount_due = Column(Float, nullable=False)
+    total_amount = Column(Money, nullable=False)
+    amount_due = Column(Money, nullable=False)
     date_created = Column(Date, nullable=False)
     signed = Column(Boolean, nullable=False, default=False)
 
     client = relationship("Client", back_populates="contracts")
     commercial_contact = relationship("User", back_populates="contracts")
-    events = relationship("Event", back_populates="contract", cascade="all, delete")
+    events = relationship("Event", back_populates="contract", cascade="all, delete", passive_deletes=True)
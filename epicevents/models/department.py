@@ -17,4 +17,4 @@ class Department(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(50), nullable=False)
 
-    users = relationship("User", back_populates="department", cascade="all, delete")
+    users = relationship("User", back_populates="department", cascade="all, delete", passive_deletes=True)
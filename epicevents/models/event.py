@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Index, Integer
 from sqlalchemy.orm import relationship
 from config import Base
+from models.mixins import EventColumnsMixin, TimestampMixin
 
 
-class Event(Base):
+class Event(EventColumnsMixin, TimestampMixin, Base):
     """
     Represents an event in the Epic Events CRM.
 
@@ -18,20 +19,16 @@ class Event(Base):
         location (str): Location of the event.
         attendees (int): Number of attendees for the event.
         notes (str): Additional notes for the event.
+        created_at (datetime): Date and time when the row was created.
+        updated_at (datetime): Date and time when the row was last modified.
     """
 
     __tablename__ = "Event"
+    # Schedule of each support contact, for the overlap checks: the event starting last before a given time
+    # is found by descending this index.
+    __table_args__ = (Index("ix_event_support_schedule", "support_contact_id", "event_date_start"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    contract_id = Column(Integer, ForeignKey("Contract.id", ondelete="CASCADE"), nullable=False)
-    client_id = Column(Integer, ForeignKey("Client.id", ondelete="CASCADE"), nullable=True)
-    event_name = Column(String(100), nullable=False)
-    event_date_start = Column(DateTime, nullable=False)
-    event_date_end = Column(DateTime, nullable=False)
-    support_contact_id = Column(Integer, ForeignKey("User.id", ondelete="CASCADE"), nullable=True)
-    location = Column(String(200), nullable=True)
-    attendees = Column(Integer, nullable=True)
-    notes = Column(Text, nullable=True)
 
     client = relationship("Client", back_populates="events")
     contract = relationship("Contract", back_populates="events")
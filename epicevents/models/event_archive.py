@@ -0,0 +1,37 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, text
+from config import Base
+from models.mixins import EventColumnsMixin, TimestampMixin
+
+
+class EventArchive(EventColumnsMixin, TimestampMixin, Base):
+    """
+    Represents a past event moved out of the Event table by the archival job.
+
+    Archived events keep the ID, columns and timestamps they had in the Event table, so that they can be
+    read together with the live events. The rows have their own key: MySQL 5.7 resets the AUTO_INCREMENT
+    of the Event table to its largest ID on restart, so a new event may get the ID of an archived one.
+    They outlive their support contact, whose deletion only clears support_contact_id.
+
+    Attributes:
+        archive_id (int): Unique identifier for the archived event.
+        id (int): Identifier of the event in the Event table.
+        contract_id (int): Foreign key referencing the Contract.
+        client_id (int): Foreign key referencing the Client.
+        event_name (str): Name of the event.
+        event_date_start (datetime): Start date and time of the event.
+        event_date_end (datetime): End date and time of the event.
+        support_contact_id (int): Foreign key referencing the User (support contact).
+        location (str): Location of the event.
+        attendees (int): Number of attendees for the event.
+        notes (str): Additional notes for the event.
+        created_at (datetime): Date and time when the event was created.
+        updated_at (datetime): Date and time when the event was last modified.
+        archived_at (datetime): Date and time when the event was archived.
+    """
+
+    __tablename__ = "EventArchive"
+
+    archive_id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(Integer, nullable=False, index=True)
+    support_contact_id = Column(Integer, ForeignKey("User.id", ondelete="SET NULL"), nullable=True)
+    archived_at = Column(DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP"))
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text, func, text
+from config import Base
+
+
+class ImportProgress(Base):
+    """
+    Progress of a resumable bulk import, written in the same transaction as each imported chunk, so that
+    the progress and the imported rows are always committed together.
+
+    Attributes:
+        name (str): Name of the checkpoint, by default the absolute path of the imported file.
+        fingerprint (str): JSON description of the imported file (path, size and modification time).
+        line (int): Line number of the next row to import.
+        imported (int): Number of rows imported so far.
+        rejected (int): Number of rows rejected so far.
+        updated_at (datetime): Date and time when the progress was last saved.
+    """
+
+    __tablename__ = "ImportProgress"
+
+    name = Column(String(255), primary_key=True)
+    fingerprint = Column(Text, nullable=False)
+    line = Column(Integer, nullable=False)
+    imported = Column(Integer, nullable=False)
+    rejected = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now())
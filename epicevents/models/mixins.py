@@ -0,0 +1,45 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func, literal_column, text
+from sqlalchemy.dialects import mysql
+
+
+class TimestampMixin:
+    """
+    Adds indexed creation and modification timestamps to a model.
+
+    Both are set by the database clock, so that they are consistent across application hosts: created_at
+    by the column default, and updated_at by every INSERT and every UPDATE statement issued through
+    SQLAlchemy, including the bulk ones. They are used as watermarks by the incremental export. updated_at
+    has a microsecond precision on MySQL, so that the analytics stamp tells apart writes within one second.
+
+    Attributes:
+        created_at (datetime): Date and time when the row was created.
+        updated_at (datetime): Date and time when the row was last modified.
+    """
+
+    # CURRENT_TIMESTAMP and its synonym NOW() are the only expressions MySQL 5.7 accepts as a DATETIME default.
+    created_at = Column(DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP"), index=True)
+    updated_at = Column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        nullable=False,
+        server_default=func.now(literal_column("6")),
+        onupdate=func.now(literal_column("6")),
+        index=True,
+    )
+
+
+class EventColumnsMixin:
+    """
+    Columns shared by the live Event table and the EventArchive table, so that archived rows keep the
+    same shape and can be read with the same queries.
+    """
+
+    contract_id = Column(Integer, ForeignKey("Contract.id", ondelete="CASCADE"), nullable=False)
+    client_id = Column(Integer, ForeignKey("Client.id", ondelete="CASCADE"), nullable=True)
+    event_name = Column(String(100), nullable=False)
+    event_date_start = Column(DateTime, nullable=False)
+    # Indexed for the archival job and for the date range lookups deciding whether to read the archive.
+    event_date_end = Column(DateTime, nullable=False, index=True)
+    support_contact_id = Column(Integer, ForeignKey("User.id", ondelete="CASCADE"), nullable=True)
+    location = Column(String(200), nullable=True)
+    attendees = Column(Integer, nullable=True)
+    notes = Column(Text, nullable=True)
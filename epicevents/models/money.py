@@ -0,0 +1,27 @@
+from sqlalchemy import Numeric
+from sqlalchemy.sql import operators
+from sqlalchemy.types import TypeDecorator
+from utils.money import MONEY_PRECISION, to_money
+
+
+class Money(TypeDecorator):
+    """
+    Amount in euros, stored as DECIMAL(12, 2) so that the database adds cents exactly, and read back as a
+    Decimal with two decimal places. Bound values are rounded to the cent with utils.money.to_money.
+    """
+
+    impl = Numeric(MONEY_PRECISION, 2)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_money(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else to_money(value)
+
+    def coerce_compared_value(self, op, value):
+        # A factor or divisor is not an amount: rounding it to the cent would turn a 3.33% adjustment
+        # (x 1.0333) into x 1.03.
+        if op in (operators.mul, operators.truediv):
+            return Numeric()
+        return self
@@ -0,0 +1,49 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, func, text
+from sqlalchemy.orm import query_expression
+from config import Base
+from models.money import Money
+
+
+class CommercialSummary(Base):
+    """
+    Dashboard figures of a commercial contact, kept up to date by the controllers writing clients and
+    contracts, which add the deltas of each write in its transaction.
+
+    Attributes:
+        user_id (int): Foreign key referencing the User (commercial contact).
+        client_count (int): Number of clients of the commercial.
+        contract_count (int): Number of contracts of the commercial.
+        signed_total (Decimal): Total amount of the signed contracts.
+        outstanding (Decimal): Amount still due on the contracts.
+        refreshed_at (datetime): Date and time of the last refresh of the row.
+    """
+
+    __tablename__ = "CommercialSummary"
+
+    user_id = Column(Integer, ForeignKey("User.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    client_count = Column(Integer, nullable=False, default=0)
+    contract_count = Column(Integer, nullable=False, default=0)
+    signed_total = Column(Money, nullable=False, default=0)
+    outstanding = Column(Money, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now())
+
+
+class SupportSummary(Base):
+    """
+    Dashboard figures of a support contact, kept up to date by the controllers writing events, which add
+    the deltas of each write in its transaction.
+
+    Attributes:
+        user_id (int): Foreign key referencing the User (support contact).
+        assigned_events (int): Number of events assigned to the support contact.
+        upcoming_events (int): Number of those events not started yet, counted when the row is loaded by
+            SummaryController rather than stored.
+        refreshed_at (datetime): Date and time of the last refresh of the row.
+    """
+
+    __tablename__ = "SupportSummary"
+
+    user_id = Column(Integer, ForeignKey("User.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    assigned_events = Column(Integer, nullable=False, default=0)
+    upcoming_events = query_expression()
+    refreshed_at = Column(DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now())
@@ -26,6 +26,9 @@ class User(Base):
     department_id = Column(Integer, ForeignKey("Department.id", ondelete="CASCADE"), nullable=True)
 
     department = relationship("Department", back_populates="users")
-    clients = relationship("Client", back_populates="commercial_contact", cascade="all, delete")
-    contracts = relationship("Contract", back_populates="commercial_contact", cascade="all, delete")
-    events = relationship("Event", back_populates="support_contact", cascade="all, delete")
+    # passive_deletes leaves the children to the ON DELETE CASCADE of the database instead of loading them.
+    clients = relationship("Client", back_populates="commercial_contact", cascade="all, delete", passive_deletes=True)
+    contracts = relationship(
+        "Contract", back_populates="commercial_contact", cascade="all, delete", passive_deletes=True
+    )
+    events = relationship("Event", back_populates="support_contact", cascade="all, delete", passive_deletes=True)
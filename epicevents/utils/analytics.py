@@ -0,0 +1,329 @@
+import json
+import os
+from collections import namedtuple
+from datetime import date, timedelta
+import numpy as np
+from utils.money import from_cents
+
+SNAPSHOT_VERSION = 1
+STAMP_NAME = "snapshot.json"
+
+# Projected columns and their dtypes. Amounts are integer cents so that sums are exact, and a missing
+# foreign key is 0, which no row uses as an ID.
+CONTRACT_COLUMNS = {
+    "id": np.int64,
+    "client_id": np.int64,
+    "commercial_contact_id": np.int64,
+    "total_cents": np.int64,
+    "due_cents": np.int64,
+    "signed": np.bool_,
+    "date_created": "datetime64[D]",
+}
+EVENT_COLUMNS = {
+    "id": np.int64,
+    "contract_id": np.int64,
+    "support_contact_id": np.int64,
+    "start": "datetime64[s]",
+    "end": "datetime64[s]",
+    "attendees": np.int64,
+}
+
+# Day number of 1970-01-01, the epoch of datetime64.
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Float64 sums, as computed by np.bincount, are exact integers below this bound.
+EXACT_FLOAT_LIMIT = 2**53
+
+SLICE_GROUPINGS = ["month", "commercial", "signed", "attendees"]
+# Lower bounds of the attendee bands, the last band being open-ended.
+ATTENDEE_BANDS = [0, 50, 100, 250, 500, 1000]
+
+# Result of group_by: the distinct keys in ascending order, the number of rows and the sum of each value
+# column per key.
+Groups = namedtuple("Groups", ["keys", "counts", "sums"])
+
+# Contracts of a slice, keyed by month ("YYYY-MM"), commercial contact ID (None if missing) or signed status.
+ContractSlice = namedtuple("ContractSlice", ["key", "contracts", "signed_contracts", "total_amount", "amount_due"])
+
+# Events of an attendee band ("0-49", ..., "1000+").
+EventSlice = namedtuple("EventSlice", ["key", "events", "attendees"])
+
+
+def _dense_codes(keys):
+    """
+    Integer codes of keys with few distinct values between their minimum and maximum, e.g. IDs, months or
+    booleans, offset to start at 0. Returns None for other keys.
+    """
+    if not len(keys) or keys.dtype.kind not in "biuM":
+        return None
+    codes = keys.view(np.int64) if keys.dtype.kind == "M" else keys.astype(np.int64)
+    low, high = int(codes.min()), int(codes.max())
+    if high - low > max(len(keys), 1 << 16):
+        return None
+    return low, codes - low
+
+
+def group_by(keys, *values) -> Groups:
+    """
+    Groups rows by key, counting them and summing each value column per key.
+
+    Keys spanning a small integer range, such as IDs, months or booleans, are counted and summed with
+    np.bincount in one pass. Other keys are sorted once so that the rows of a key become contiguous, and
+    summed with np.add.reduceat. Integer sums are exact either way.
+    Args:
+        keys (ndarray): Key of each row.
+        *values (ndarray): Columns to sum, of the same length. Booleans are counted.
+    Returns:
+        Groups: The distinct keys, the row count and the sums of each key.
+    """
+    keys = np.asarray(keys)
+    values = [np.asarray(value) for value in values]
+    values = [value.astype(np.int64) if value.dtype == np.bool_ else value for value in values]
+    dense = _dense_codes(keys)
+    if dense is not None and all(
+        value.dtype.kind == "f" or np.abs(value).sum(dtype=np.float64) < EXACT_FLOAT_LIMIT for value in values
+    ):
+        low, codes = dense
+        counts = np.bincount(codes)
+        present = np.flatnonzero(counts)
+        sums = [np.bincount(codes, weights=value)[present].astype(value.dtype) for value in values]
+        distinct = present + low
+        distinct = distinct.view(keys.dtype) if keys.dtype.kind == "M" else distinct.astype(keys.dtype)
+        return Groups(distinct, counts[present], sums)
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    if not len(sorted_keys):
+        empty = np.zeros(0, dtype=np.int64)
+        return Groups(sorted_keys, empty, [empty for _ in values])
+    starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    counts = np.diff(np.append(starts, len(sorted_keys)))
+    sums = [np.add.reduceat(value[order], starts) for value in values]
+    return Groups(sorted_keys[starts], counts, sums)
+
+
+def months(days) -> np.ndarray:
+    """
+    Month of each datetime64[D] value. NumPy's calendar conversion is slow, so only the days between the
+    first and the last one are converted, and each value looks its month up in that table.
+    """
+    if not len(days):
+        return days.astype("datetime64[M]")
+    codes = days.view(np.int64)
+    low = int(codes.min())
+    table = np.arange(low, int(codes.max()) + 1).astype("datetime64[D]").astype("datetime64[M]")
+    return table[codes - low]
+
+
+def band_labels(bounds) -> list:
+    return [f"{low}-{high - 1}" for low, high in zip(bounds, bounds[1:])] + [f"{bounds[-1]}+"]
+
+
+def bands(values, bounds) -> np.ndarray:
+    """
+    Index of the band of each value, bounds being the sorted lower bounds of the bands. Values below the
+    first bound go to the first band.
+    """
+    return np.maximum(np.searchsorted(bounds, values, side="right") - 1, 0)
+
+
+def _to_array(values, dtype) -> np.ndarray:
+    """
+    Converts a column of Python values. NumPy converts date and datetime objects slowly, one at a time, so
+    they are converted through their day ordinals instead.
+    """
+    if dtype == "datetime64[D]":
+        days = np.fromiter((value.toordinal() for value in values), np.int64, len(values))
+        return (days - EPOCH_ORDINAL).astype(dtype)
+    if dtype == "datetime64[s]":
+        seconds = np.fromiter(
+            (
+                (value.toordinal() - EPOCH_ORDINAL) * 86400 + value.hour * 3600 + value.minute * 60 + value.second
+                for value in values
+            ),
+            np.int64,
+            len(values),
+        )
+        return seconds.astype(dtype)
+    return np.array(values, dtype=dtype)
+
+
+class Frame:
+    """
+    Columns of a table as NumPy arrays of the same length.
+    """
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def filter(self, mask, names=None) -> "Frame":
+        """
+        Selects the rows of a boolean mask, in the given columns only if names are given. The columns are
+        not copied when every row is selected.
+        """
+        names = names or list(self.columns)
+        if mask.all():
+            return Frame({name: self.columns[name] for name in names})
+        return Frame({name: self.columns[name][mask] for name in names})
+
+    @staticmethod
+    def from_chunks(chunks, dtypes: dict) -> "Frame":
+        """
+        Builds the arrays from rows fetched by chunks, converting each chunk column by column.
+        Args:
+            chunks (iterable): Lists of row tuples, in the column order of dtypes.
+            dtypes (dict): Dtype of each column, by name.
+        """
+        parts = {name: [] for name in dtypes}
+        for chunk in chunks:
+            for (name, dtype), values in zip(dtypes.items(), zip(*chunk)):
+                parts[name].append(_to_array(values, dtype))
+        return Frame(
+            {
+                name: np.concatenate(parts[name]) if parts[name] else np.zeros(0, dtype=dtype)
+                for name, dtype in dtypes.items()
+            }
+        )
+
+
+class AnalyticsSnapshot:
+    """
+    Projected columns of the contracts and events, loaded once into NumPy arrays so that each slice is a
+    few vectorized masks and a group-by instead of a query.
+
+    The snapshot can be cached in a directory as one .npy file per column, memory-mapped when loaded back
+    (the members of an .npz archive cannot be), next to a JSON stamp. The stamp holds the format version and
+    what the caller derived from the database, e.g. row counts and last modification times: a cache whose
+    stamp differs is ignored.
+    """
+
+    def __init__(self, contracts: Frame, events: Frame, stamp: dict):
+        self.contracts = contracts
+        self.events = events
+        self.stamp = stamp
+
+    def contract_mask(self, signed: bool = None, date_from=None, date_to=None) -> np.ndarray:
+        """
+        Selects the contracts by signed status and by creation date, both dates included.
+        """
+        mask = np.ones(len(self.contracts), dtype=np.bool_)
+        if signed is not None:
+            mask &= self.contracts["signed"] == signed
+        if date_from is not None:
+            mask &= self.contracts["date_created"] >= np.datetime64(date_from, "D")
+        if date_to is not None:
+            mask &= self.contracts["date_created"] <= np.datetime64(date_to, "D")
+        return mask
+
+    def event_mask(self, signed: bool = None, date_from=None, date_to=None) -> np.ndarray:
+        """
+        Selects the events by signed status of their contract and by start date, both dates included.
+        """
+        mask = np.ones(len(self.events), dtype=np.bool_)
+        if signed is not None:
+            signed_ids = self.contracts["id"][self.contracts["signed"]]
+            mask &= np.isin(self.events["contract_id"], signed_ids) == signed
+        if date_from is not None:
+            mask &= self.events["start"] >= np.datetime64(date_from, "D")
+        if date_to is not None:
+            mask &= self.events["start"] < np.datetime64(date_to + timedelta(days=1), "D")
+        return mask
+
+    def slice(self, by: str, signed: bool = None, date_from=None, date_to=None) -> list:
+        """
+        Groups the selected contracts by month of creation, commercial contact or signed status, or the
+        selected events by attendee band.
+        Args:
+            by (str): One of SLICE_GROUPINGS.
+            signed (bool, optional): Keep only signed (True) or unsigned (False) contracts, or the events of
+                such contracts.
+            date_from (date, optional): First creation date of the contracts, or start date of the events.
+            date_to (date, optional): Last creation date of the contracts, or start date of the events.
+        Returns:
+            list: ContractSlice rows, or EventSlice rows for "attendees", in ascending key order.
+        """
+        if by == "attendees":
+            events = self.events.filter(self.event_mask(signed, date_from, date_to), ["attendees"])
+            labels = band_labels(ATTENDEE_BANDS)
+            groups = group_by(bands(events["attendees"], ATTENDEE_BANDS), events["attendees"])
+            return [
+                EventSlice(labels[band], int(count), int(attendees))
+                for band, count, attendees in zip(groups.keys, groups.counts, groups.sums[0])
+            ]
+
+        key_column = {"month": "date_created", "commercial": "commercial_contact_id"}.get(by, "signed")
+        contracts = self.contracts.filter(
+            self.contract_mask(signed, date_from, date_to), [key_column, "signed", "total_cents", "due_cents"]
+        )
+        keys = months(contracts[key_column]) if by == "month" else contracts[key_column]
+        groups = group_by(keys, contracts["signed"], contracts["total_cents"], contracts["due_cents"])
+        if by == "month":
+            labels = np.datetime_as_string(groups.keys, unit="M").tolist()
+        elif by == "commercial":
+            labels = [int(key) or None for key in groups.keys]
+        else:
+            labels = [bool(key) for key in groups.keys]
+        signed_counts, totals, dues = groups.sums
+        return [
+            ContractSlice(label, int(count), int(signed_count), from_cents(total), from_cents(due))
+            for label, count, signed_count, total, due in zip(labels, groups.counts, signed_counts, totals, dues)
+        ]
+
+    def save(self, directory: str):
+        """
+        Writes the snapshot to a cache directory. The stamp is removed first and written last, so that a
+        cache left half-written by a crash is never read.
+        """
+        os.makedirs(directory, exist_ok=True)
+        stamp_path = os.path.join(directory, STAMP_NAME)
+        if os.path.exists(stamp_path):
+            os.remove(stamp_path)
+        tables = [("contracts", self.contracts, CONTRACT_COLUMNS), ("events", self.events, EVENT_COLUMNS)]
+        for table, frame, dtypes in tables:
+            for name in dtypes:
+                path = os.path.join(directory, f"{table}.{name}.npy")
+                with open(f"{path}.tmp", "wb") as file:
+                    np.save(file, frame[name], allow_pickle=False)
+                os.replace(f"{path}.tmp", path)
+        with open(f"{stamp_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump({"version": SNAPSHOT_VERSION, "stamp": self.stamp}, file, indent=2)
+        os.replace(f"{stamp_path}.tmp", stamp_path)
+
+    @staticmethod
+    def load(directory: str, stamp: dict, mmap: bool = True) -> "AnalyticsSnapshot":
+        """
+        Reads a snapshot cached by save.
+        Args:
+            directory (str): The cache directory.
+            stamp (dict): The stamp the cache must have been saved with.
+            mmap (bool): Memory-map the columns instead of reading them.
+        Returns:
+            AnalyticsSnapshot: The snapshot, or None if the cache is missing, from another format version
+                or stale.
+        """
+        try:
+            with open(os.path.join(directory, STAMP_NAME), encoding="utf-8") as file:
+                content = json.load(file)
+            if content.get("version") != SNAPSHOT_VERSION or content.get("stamp") != stamp:
+                return None
+            frames = {
+                table: Frame(
+                    {
+                        name: np.load(
+                            os.path.join(directory, f"{table}.{name}.npy"),
+                            mmap_mode="r" if mmap else None,
+                            allow_pickle=False,
+                        )
+                        for name in dtypes
+                    }
+                )
+                for table, dtypes in (("contracts", CONTRACT_COLUMNS), ("events", EVENT_COLUMNS))
+            }
+        except (FileNotFoundError, ValueError):
+            return None
+        return AnalyticsSnapshot(frames["contracts"], frames["events"], stamp)
@@ -0,0 +1,457 @@
+import csv
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_, func, insert, or_, select, text
+from config import Base
+from models.department import Department  # noqa: F401
+from models.user import User  # noqa: F401
+from models.client import Client  # noqa: F401
+from models.contract import Contract  # noqa: F401
+from models.event import Event  # noqa: F401
+from models.event_archive import EventArchive  # noqa: F401
+from models.import_progress import ImportProgress
+from models.summary import CommercialSummary, SupportSummary
+from utils.session_manager import get_engine_root
+
+BACKUP_FORMATS = ["jsonl", "csv"]
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_ROWS_PER_FILE = 100000
+DEFAULT_BATCH_SIZE = 5000
+# Tables with updated_at watermarks, exported by the incremental export.
+INCREMENTAL_TABLES = ["Client", "Contract", "Event"]
+WATERMARK_NAME = "watermark.json"
+DEFAULT_LAG_SECONDS = 60
+# Tables derived from the others, left out of the backups and rebuilt by SummaryController after a restore.
+DERIVED_TABLES = {CommercialSummary.__tablename__, SupportSummary.__tablename__}
+# Progress of the interrupted imports, which only applies to the data it was saved with: left out of the
+# backups and cleared by a restore.
+IMPORT_PROGRESS_TABLE = ImportProgress.__table__
+# NULL marker of the CSV files, as in MySQL's LOAD DATA, so that NULL and empty strings stay distinct.
+CSV_NULL = "\\N"
+
+
+def _format_value(value):
+    """
+    Serializes the column types JSON and CSV do not handle natively.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value if isinstance(value, (str, int, float)) else str(value)
+
+
+def _parse_value(python_type, value):
+    """
+    Converts a value read from a backup file back to the Python type of its column.
+    """
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is bool:
+        return value in ("1", "True", "true")
+    return python_type(value)
+
+
+class _ChunkWriter:
+    """
+    Writes the rows of a table to a gzip-compressed JSONL or CSV file.
+    """
+
+    def __init__(self, path: str, output_format: str, columns: list):
+        self.path = path
+        self.output_format = output_format
+        self.columns = columns
+        self.rows = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8", newline="")
+        if output_format == "csv":
+            self._writer = csv.writer(self._file, lineterminator="\n")
+            self._writer.writerow(columns)
+        else:
+            self._dumps = json.JSONEncoder(default=_format_value, ensure_ascii=False).encode
+
+    def write(self, row):
+        if self.output_format == "csv":
+            self._writer.writerow(CSV_NULL if value is None else _format_value(value) for value in row)
+        else:
+            self._file.write(self._dumps(dict(zip(self.columns, row))))
+            self._file.write("\n")
+        self.rows += 1
+
+    def close(self) -> dict:
+        """
+        Closes the file and returns its manifest entry.
+        """
+        self._file.close()
+        return {"name": os.path.basename(self.path), "rows": self.rows, "sha256": _sha256(self.path)}
+
+
+def _write_json(path: str, content: dict):
+    """
+    Writes a JSON file atomically, so that a crash never leaves a truncated manifest or watermark.
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _backup_tables() -> list:
+    """
+    Tables saved by a backup, in foreign key order.
+    """
+    return [
+        table
+        for table in Base.metadata.sorted_tables
+        if table.name not in DERIVED_TABLES and table is not IMPORT_PROGRESS_TABLE
+    ]
+
+
+class BackupManager:
+    """
+    Exports the whole database to compressed JSONL or CSV files and restores it.
+
+    A backup is a directory holding, for each table, one or more gzip files of at most ``rows_per_file``
+    rows, and a manifest listing the tables in foreign key order with their columns, files, row counts and
+    checksums. Rows are streamed in both directions, so memory stays bounded whatever the size of the tables.
+    The dashboard summary tables are derived from the others: they are not saved, and are rebuilt after a
+    restore. The progress of the interrupted imports is not saved either, and is cleared by a restore.
+    """
+
+    @staticmethod
+    def _iter_rows(connection, table, batch_size: int):
+        """
+        Streams the rows of a table ordered by primary key.
+
+        The MySQL Connector driver has no server-side cursors: rows are read by keyset pagination
+        (``WHERE id > last ORDER BY id LIMIT n``), which keeps each query cheap and the memory bounded.
+        """
+        (primary_key,) = table.primary_key
+        last_id = None
+        while True:
+            query = select(table).order_by(primary_key).limit(batch_size)
+            if last_id is not None:
+                query = query.where(primary_key > last_id)
+            rows = connection.execute(query).all()
+            if not rows:
+                return
+            yield from rows
+            last_id = getattr(rows[-1], primary_key.name)
+
+    @staticmethod
+    def export(
+        directory: str,
+        output_format: str = "jsonl",
+        rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> dict:
+        """
+        Exports every table to the backup directory.
+
+        All the tables are read in a single transaction, so that the backup is a consistent snapshot even
+        if the database is being written to.
+
+        Args:
+            directory (str): The backup directory, created if needed.
+            output_format (str): "jsonl" or "csv".
+            rows_per_file (int): Maximum number of rows per file.
+            batch_size (int): Number of rows fetched from the database at a time.
+
+        Returns:
+            dict: The manifest of the backup.
+        """
+        if output_format not in BACKUP_FORMATS:
+            raise ValueError(f"Unsupported backup format: {output_format}")
+        os.makedirs(directory, exist_ok=True)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "format": output_format,
+            "tables": [],
+        }
+
+        with get_engine_root().connect() as connection, connection.begin():
+            for table in _backup_tables():
+                rows = BackupManager._iter_rows(connection, table, batch_size)
+                manifest["tables"].append(
+                    BackupManager._write_table(directory, table, rows, output_format, rows_per_file)
+                )
+
+        _write_json(os.path.join(directory, MANIFEST_NAME), manifest)
+        return manifest
+
+    @staticmethod
+    def _write_table(directory: str, table, rows, output_format: str, rows_per_file: int) -> dict:
+        """
+        Writes the rows of a table to as many files as needed and returns the manifest entry of the table.
+        """
+        columns = [column.name for column in table.columns]
+        entry = {"name": table.name, "columns": columns, "rows": 0, "files": []}
+        writer = None
+        for row in rows:
+            if writer is None or writer.rows == rows_per_file:
+                if writer is not None:
+                    entry["files"].append(writer.close())
+                file_name = f"{table.name}-{len(entry['files']) + 1:05d}.{output_format}.gz"
+                writer = _ChunkWriter(os.path.join(directory, file_name), output_format, columns)
+            writer.write(row)
+            entry["rows"] += 1
+        if writer is not None:
+            entry["files"].append(writer.close())
+        return entry
+
+    @staticmethod
+    def _iter_changes(connection, table, since: datetime, until: datetime, batch_size: int):
+        """
+        Streams the rows of a table modified after ``since`` (if any) and up to ``until``, by keyset
+        pagination on (updated_at, id) so that the updated_at index is used.
+        """
+        updated_at, (primary_key,) = table.c.updated_at, table.primary_key
+        window = updated_at <= until if since is None else and_(updated_at > since, updated_at <= until)
+        last_updated_at = last_id = None
+        while True:
+            query = select(table).where(window).order_by(updated_at, primary_key).limit(batch_size)
+            if last_id is not None:
+                query = query.where(
+                    or_(updated_at > last_updated_at, and_(updated_at == last_updated_at, primary_key > last_id))
+                )
+            rows = connection.execute(query).all()
+            if not rows:
+                return
+            yield from rows
+            last_updated_at, last_id = rows[-1].updated_at, getattr(rows[-1], primary_key.name)
+
+    @staticmethod
+    def export_changes(
+        directory: str,
+        output_format: str = "jsonl",
+        lag_seconds: int = DEFAULT_LAG_SECONDS,
+        rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> dict:
+        """
+        Exports the clients, contracts and events created or modified since the previous run.
+
+        The watermark of the previous run is stored in ``directory``; each run writes the rows with an
+        updated_at after it into a new ``changes-<until>`` subdirectory with its own manifest, then moves the
+        watermark. The window stops ``lag_seconds`` before the database clock, so that rows written by
+        transactions still running are not skipped once they commit. Deleted rows are not exported.
+
+        Args:
+            directory (str): Directory holding the watermark and the change sets, created if needed.
+            output_format (str): "jsonl" or "csv".
+            lag_seconds (int): Delay before a modification is exported.
+            rows_per_file (int): Maximum number of rows per file.
+            batch_size (int): Number of rows fetched from the database at a time.
+
+        Returns:
+            dict: The manifest of the change set, None if the window is empty because the previous run
+                was less than ``lag_seconds`` ago.
+        """
+        if output_format not in BACKUP_FORMATS:
+            raise ValueError(f"Unsupported backup format: {output_format}")
+        os.makedirs(directory, exist_ok=True)
+        watermark_path = os.path.join(directory, WATERMARK_NAME)
+        since = None
+        if os.path.exists(watermark_path):
+            with open(watermark_path, encoding="utf-8") as file:
+                since = datetime.fromisoformat(json.load(file)["until"])
+
+        with get_engine_root().connect() as connection, connection.begin():
+            until = connection.execute(select(func.now())).scalar() - timedelta(seconds=lag_seconds)
+            if since is not None and until <= since:
+                return None
+            change_directory = os.path.join(directory, f"changes-{until:%Y%m%dT%H%M%S}")
+            os.makedirs(change_directory, exist_ok=True)
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "format": output_format,
+                "since": since.isoformat() if since else None,
+                "until": until.isoformat(),
+                "tables": [],
+            }
+            for name in INCREMENTAL_TABLES:
+                table = Base.metadata.tables[name]
+                rows = BackupManager._iter_changes(connection, table, since, until, batch_size)
+                manifest["tables"].append(
+                    BackupManager._write_table(change_directory, table, rows, output_format, rows_per_file)
+                )
+
+        # The watermark only moves once the change set is complete.
+        _write_json(os.path.join(change_directory, MANIFEST_NAME), manifest)
+        _write_json(watermark_path, {"until": until.isoformat()})
+        return manifest
+
+    @staticmethod
+    def load_manifest(directory: str) -> dict:
+        """
+        Reads the manifest of a backup and checks the files it lists against their checksums.
+
+        Raises:
+            ValueError: If the manifest is unsupported, or a table is unknown or a file is missing or corrupted.
+        """
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("format") not in BACKUP_FORMATS:
+            raise ValueError("Unsupported backup manifest.")
+        for entry in manifest["tables"]:
+            table = Base.metadata.tables.get(entry["name"])
+            if table is None:
+                raise ValueError(f"Unknown table in the backup: {entry['name']}.")
+            unknown_columns = set(entry["columns"]) - set(table.columns.keys())
+            if unknown_columns:
+                raise ValueError(f"Unknown columns in the backup of {entry['name']}: {', '.join(unknown_columns)}.")
+            for file_entry in entry["files"]:
+                path = os.path.join(directory, file_entry["name"])
+                if not os.path.exists(path) or _sha256(path) != file_entry["sha256"]:
+                    raise ValueError(f"The backup file {file_entry['name']} is missing or corrupted.")
+        return manifest
+
+    @staticmethod
+    def _read_rows(path: str, output_format: str, columns: list, converters: list):
+        """
+        Streams the rows of a backup file as dictionaries of column values.
+        """
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as file:
+            if output_format == "csv":
+                reader = csv.reader(file)
+                next(reader)
+                for values in reader:
+                    yield {
+                        column: None if value == CSV_NULL else _parse_value(python_type, value)
+                        for column, python_type, value in zip(columns, converters, values)
+                    }
+            else:
+                for line in file:
+                    values = json.loads(line)
+                    yield {
+                        column: _parse_value(python_type, values[column])
+                        for column, python_type in zip(columns, converters)
+                    }
+
+    @staticmethod
+    def _load_table(directory: str, output_format: str, entry: dict, batch_size: int) -> int:
+        """
+        Loads the files of a table on its own connection, with foreign key checks disabled, committing
+        every ``batch_size`` rows.
+        """
+        table = Base.metadata.tables[entry["name"]]
+        columns = entry["columns"]
+        converters = [table.c[column].type.python_type for column in columns]
+        count = 0
+        with get_engine_root().connect() as connection:
+            connection.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            try:
+                batch = []
+                for file_entry in entry["files"]:
+                    path = os.path.join(directory, file_entry["name"])
+                    for row in BackupManager._read_rows(path, output_format, columns, converters):
+                        batch.append(row)
+                        if len(batch) == batch_size:
+                            connection.execute(insert(table), batch)
+                            connection.commit()
+                            count += len(batch)
+                            batch = []
+                if batch:
+                    connection.execute(insert(table), batch)
+                    connection.commit()
+                    count += len(batch)
+            finally:
+                # The connection goes back to the pool: restore the checks for its next user.
+                connection.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+        return count
+
+    @staticmethod
+    def _clear_tables(tables: list):
+        """
+        Empties the tables, ignoring the foreign keys between them.
+        """
+        with get_engine_root().connect() as connection:
+            connection.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            try:
+                for table in reversed(tables):
+                    connection.execute(text(f"TRUNCATE TABLE `{table.name}`"))
+            finally:
+                connection.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+    @staticmethod
+    def find_orphans(tables: list) -> dict:
+        """
+        Counts, for each foreign key of the tables, the rows referencing a missing parent.
+
+        Returns:
+            dict: Number of orphan rows by "table.column", for the foreign keys having some.
+        """
+        orphans = {}
+        with get_engine_root().connect() as connection:
+            for table in tables:
+                for foreign_key in table.foreign_keys:
+                    child, parent = foreign_key.parent, foreign_key.column
+                    query = (
+                        select(func.count())
+                        .select_from(table.outerjoin(parent.table, child == parent))
+                        .where(child.isnot(None), parent.is_(None))
+                    )
+                    count = connection.execute(query).scalar()
+                    if count:
+                        orphans[f"{table.name}.{child.name}"] = count
+        return orphans
+
+    @staticmethod
+    def restore(directory: str, workers: int = 4, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+        """
+        Replaces the content of the tables of the backup with the rows of the backup.
+
+        Foreign key checks are disabled while loading, so the tables do not depend on each other and are
+        loaded in parallel, one connection per table, started in foreign key order. The references are
+        checked once everything is loaded; if the load or the check fails, the tables are emptied.
+
+        Args:
+            directory (str): The backup directory.
+            workers (int): Number of tables loaded at the same time.
+            batch_size (int): Number of rows inserted per statement and transaction.
+
+        Returns:
+            dict: Number of restored rows by table.
+
+        Raises:
+            ValueError: If the backup is invalid or the restored rows reference missing rows.
+        """
+        manifest = BackupManager.load_manifest(directory)
+        if "until" in manifest:
+            raise ValueError(f"{directory} is a change set of the incremental export, not a full backup.")
+        # Backups made before the summary tables were derived may still list them.
+        entries = [entry for entry in manifest["tables"] if entry["name"] not in DERIVED_TABLES]
+        tables = [Base.metadata.tables[entry["name"]] for entry in entries]
+
+        BackupManager._clear_tables(tables + [IMPORT_PROGRESS_TABLE])
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                futures = [
+                    executor.submit(BackupManager._load_table, directory, manifest["format"], entry, batch_size)
+                    for entry in entries
+                ]
+                counts = {entry["name"]: future.result() for entry, future in zip(entries, futures)}
+            orphans = BackupManager.find_orphans(tables)
+            if orphans:
+                details = ", ".join(f"{name} ({count})" for name, count in orphans.items())
+                raise ValueError(f"The backup references missing rows: {details}.")
+        except Exception:
+            BackupManager._clear_tables(tables)
+            raise
+        return counts
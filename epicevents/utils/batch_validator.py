@@ -0,0 +1,427 @@
+from collections import namedtuple
+from datetime import datetime
+import re
+import numpy as np
+from utils.data_validator import DATETIME_FORMAT, DEPARTMENT_IDS, EMAIL_PATTERN, MAX_EVENT_DURATION, PHONE_PATTERN
+from utils.money import MAX_MONEY, to_cents
+
+# Invalid value found by the batch validator; ``row`` is the index of the value in its column.
+ValidationError = namedtuple("ValidationError", ["row", "field", "value", "message"])
+
+# Maximum number of IDs sent in a single IN clause, to keep statements within the server packet size.
+IN_CHUNK_SIZE = 10000
+
+# Integers parsed by NumPy, within the int64 range; longer ones are parsed by int().
+MAX_INT_DIGITS = 18
+MAX_INT = np.iinfo(np.int64).max
+# Digits of the integer part of the amounts converted to cents by NumPy; longer ones go through to_cents.
+MAX_AMOUNT_DIGITS = 15
+MAX_CENTS = int(MAX_MONEY * 100)
+
+# Datetimes written in full, which fromisoformat parses as strptime does with DATETIME_FORMAT.
+FULL_DATETIME_PATTERN = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}\Z")
+
+
+class BatchValidator:
+    """
+    Validates whole columns of values at once, for bulk inputs.
+
+    The rules and messages are those of DataValidator, but nothing is printed: each check returns the list
+    of ValidationError records of the invalid values. Each rule gives a boolean mask of the invalid rows of
+    a column, and only the invalid rows become ValidationError records. Numbers are parsed with vectorized
+    string operations on a NumPy string array; emails, phones and dates are checked value by value with
+    the patterns and the datetime format of DataValidator, so that both always accept the same values. The
+    IDs referencing other tables are resolved with one IN query per table instead of one query per value.
+    """
+
+    @staticmethod
+    def _as_strings(values) -> tuple:
+        """
+        Converts a column of strings to a NumPy string array, missing values (None) becoming empty strings.
+
+        Returns:
+            tuple: The string array and the mask of the missing values.
+        """
+        values = values if isinstance(values, list) else list(values)
+        if None in values:
+            column = np.array(values, dtype=object)
+            missing = np.equal(column, None)
+            return np.where(missing, "", column).astype(str), missing
+        return np.array(values, dtype=str), np.zeros(len(values), dtype=np.bool_)
+
+    @staticmethod
+    def _matches(values, pattern) -> np.ndarray:
+        """
+        Tells which values are non-empty strings matching a compiled pattern of DataValidator.
+        """
+        return np.fromiter(
+            (bool(value) and pattern.match(value) is not None for value in values), dtype=np.bool_, count=len(values)
+        )
+
+    @staticmethod
+    def _errors(values, field_name: str, checks: list) -> list:
+        """
+        Builds the errors of a column from ``(invalid mask, message)`` pairs, in order of priority: a row gets
+        the message of the first mask it is in.
+        """
+        reported = np.zeros(len(values), dtype=np.bool_)
+        errors = []
+        for invalid, message in checks:
+            rows = np.flatnonzero(invalid & ~reported)
+            reported |= invalid
+            errors.extend(ValidationError(row, field_name, values[row], message) for row in rows.tolist())
+        errors.sort(key=lambda error: error.row)
+        return errors
+
+    @staticmethod
+    def _decimal_values(digits, max_digits: int, fraction: bool = False) -> np.ndarray:
+        """
+        Returns the int64 values of strings of at most ``max_digits`` decimal digits, an empty string being 0.
+
+        If ``fraction``, the strings are the decimals of fractions, of which the first ``max_digits`` are
+        read, padded with zeros on the right.
+        """
+        if not len(digits):
+            return np.zeros(0, dtype=np.int64)
+        if fraction:
+            return np.strings.ljust(digits.astype(f"<U{max_digits}"), max_digits, "0").astype(np.int64)
+        return np.strings.rjust(digits, 1, "0").astype(np.int64)
+
+    @staticmethod
+    def _parse_int_array(strings, missing) -> tuple:
+        """
+        Parses a column of integers, given by _as_strings, as int() would, the values beyond the int64 range
+        being clipped to it.
+
+        Returns:
+            tuple: The int64 array of the values (0 for the invalid ones) and the mask of the valid ones.
+        """
+        numbers = np.zeros(len(strings), dtype=np.int64)
+        valid = np.strings.isdecimal(strings) & (np.strings.str_len(strings) <= MAX_INT_DIGITS)
+        numbers[valid] = BatchValidator._decimal_values(strings[valid], MAX_INT_DIGITS)
+
+        # Signs and surrounding whitespace.
+        rows = np.flatnonzero(~valid & ~missing)
+        stripped = np.strings.strip(strings[rows])
+        negative = np.strings.startswith(stripped, "-")
+        signs = negative | np.strings.startswith(stripped, "+")
+        digits = np.where(signs, np.strings.slice(stripped, 1, None), stripped)
+        lengths = np.strings.str_len(digits)
+        signed = np.strings.isdecimal(digits) & (lengths <= MAX_INT_DIGITS)
+        values = BatchValidator._decimal_values(digits[signed], MAX_INT_DIGITS)
+        numbers[rows[signed]] = np.where(negative[signed], -values, values)
+        valid[rows[signed]] = True
+
+        # Digit separators and very long numbers, which int() also accepts, are parsed one by one.
+        slow = ~signed & ((lengths > MAX_INT_DIGITS) | (np.strings.find(digits, "_") >= 0))
+        for row in rows[slow].tolist():
+            try:
+                numbers[row] = max(-MAX_INT, min(MAX_INT, int(strings[row])))
+                valid[row] = True
+            except ValueError:
+                pass
+        return numbers, valid
+
+    @staticmethod
+    def _parse_cents_array(values) -> tuple:
+        """
+        Converts a column of amounts to cents, rounded half up as to_money does.
+
+        Plain decimal numbers are converted with integer arithmetic on their digits; the other notations
+        Decimal accepts (exponents, digit separators, very long numbers) go through to_cents one by one.
+
+        Returns:
+            tuple: The int64 array of the amounts in cents (0 for the invalid ones) and the mask of the valid
+                ones.
+        """
+        strings, missing = BatchValidator._as_strings(values)
+        if not len(strings):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.bool_)
+        stripped = np.strings.strip(strings)
+        negative = np.strings.startswith(stripped, "-")
+        signs = negative | np.strings.startswith(stripped, "+")
+        body = np.where(signs, np.strings.slice(stripped, 1, None), stripped)
+        whole, _, fraction = np.strings.partition(body, ".")
+        whole_length, fraction_length = np.strings.str_len(whole), np.strings.str_len(fraction)
+        fast = (
+            (np.strings.isdecimal(whole) | (whole_length == 0))
+            & (np.strings.isdecimal(fraction) | (fraction_length == 0))
+            & (whole_length + fraction_length > 0)
+            & (whole_length <= MAX_AMOUNT_DIGITS)
+        )
+
+        cents = np.zeros(len(strings), dtype=np.int64)
+        units = BatchValidator._decimal_values(whole[fast], MAX_AMOUNT_DIGITS)
+        # The first two decimals are the cents, the third one rounds them half up.
+        thousandths = BatchValidator._decimal_values(fraction[fast], 3, fraction=True)
+        cents[fast] = units * 100 + thousandths // 10 + (thousandths % 10 >= 5)
+        cents[negative] *= -1
+        valid = fast.copy()
+        for row in np.flatnonzero(~fast & ~missing).tolist():
+            try:
+                cents[row] = max(-MAX_CENTS * 10, min(MAX_CENTS * 10, to_cents(strings[row])))
+                valid[row] = True
+            except ValueError:
+                pass
+        return cents, valid
+
+    @staticmethod
+    def _is_full_datetime(value) -> bool:
+        """
+        Tells if a value is written in full as "YYYY-MM-DD HH:MM:SS", with ASCII digits.
+        """
+        return isinstance(value, str) and FULL_DATETIME_PATTERN.match(value) is not None
+
+    @staticmethod
+    def _parse_datetime(value) -> datetime:
+        """
+        Parses a value as DataValidator.check_datetime does, with strptime and DATETIME_FORMAT, or returns None.
+        The values written in full, almost all of them, are parsed by fromisoformat, several times faster,
+        which gives the same datetime for them.
+        """
+        if BatchValidator._is_full_datetime(value):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                return None
+        try:
+            return datetime.strptime(value, DATETIME_FORMAT)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _parse_datetime_array(values) -> np.ndarray:
+        """
+        Parses the values with _parse_datetime into a datetime64 array, with NaT for the invalid ones.
+        NumPy converts ISO strings much faster than datetime objects: the values written in full are passed
+        as they are, the others (e.g. "2030-1-5 9:30:00") as the ISO form of their datetime.
+        """
+        values = values if isinstance(values, list) else list(values)
+        texts = [
+            "NaT" if parsed is None else value if BatchValidator._is_full_datetime(value) else parsed.isoformat()
+            for value, parsed in zip(values, map(BatchValidator._parse_datetime, values))
+        ]
+        return np.array(texts, dtype="datetime64[s]")
+
+    @staticmethod
+    def check_strings(values: list, field_name: str) -> list:
+        """
+        Checks that the strings are not empty.
+        """
+        strings, missing = BatchValidator._as_strings(values)
+        empty = (strings == "") | np.strings.isspace(strings)
+        return BatchValidator._errors(values, field_name, [(missing | empty, f"{field_name} cannot be empty.")])
+
+    @staticmethod
+    def check_emails(values: list, field_name: str = "Email") -> list:
+        """
+        Checks the email format.
+        """
+        valid = BatchValidator._matches(values, EMAIL_PATTERN)
+        return BatchValidator._errors(values, field_name, [(~valid, "Invalid email format.")])
+
+    @staticmethod
+    def check_phones(values: list, field_name: str = "Phone") -> list:
+        """
+        Checks the phone number format.
+        """
+        valid = BatchValidator._matches(values, PHONE_PATTERN)
+        return BatchValidator._errors(values, field_name, [(~valid, "Invalid phone number format.")])
+
+    @staticmethod
+    def parse_ints(values) -> list:
+        """
+        Converts the values to integers, with None for the values that are not integers.
+        """
+        strings, missing = BatchValidator._as_strings(values)
+        numbers, valid = BatchValidator._parse_int_array(strings, missing)
+        parsed = np.full(len(numbers), None, dtype=object)
+        parsed[valid] = numbers[valid].astype(object)
+        # The values clipped to the int64 range are parsed again, whole.
+        for row in np.flatnonzero(valid & (np.abs(numbers) == MAX_INT)).tolist():
+            parsed[row] = int(strings[row])
+        return parsed.tolist()
+
+    @staticmethod
+    def check_ids(values: list, field_name: str) -> list:
+        """
+        Checks that the IDs are positive integers.
+        """
+        numbers, valid = BatchValidator._parse_int_array(*BatchValidator._as_strings(values))
+        return BatchValidator._errors(
+            values,
+            field_name,
+            [
+                (~valid, f"{field_name} must be a valid integer."),
+                (numbers <= 0, f"{field_name} must be a positive integer."),
+            ],
+        )
+
+    @staticmethod
+    def check_attendees(values: list, field_name: str = "Attendees") -> list:
+        """
+        Checks that the attendees counts are at least 1.
+        """
+        numbers, valid = BatchValidator._parse_int_array(*BatchValidator._as_strings(values))
+        return BatchValidator._errors(
+            values,
+            field_name,
+            [
+                (~valid, f"{field_name} must be a valid integer."),
+                (numbers <= 0, f"{field_name} must be at least 1."),
+            ],
+        )
+
+    @staticmethod
+    def check_department_ids(values: list, field_name: str = "Department ID") -> list:
+        """
+        Checks that the department IDs are either 1, 2, or 3.
+        """
+        numbers, valid = BatchValidator._parse_int_array(*BatchValidator._as_strings(values))
+        return BatchValidator._errors(
+            values,
+            field_name,
+            [
+                (~valid, f"{field_name} must be a valid integer."),
+                (~np.isin(numbers, DEPARTMENT_IDS), f"{field_name} must be 1, 2, or 3."),
+            ],
+        )
+
+    @staticmethod
+    def check_floats(values: list, field_name: str, positive: bool = True, allow_zero: bool = False) -> list:
+        """
+        Checks that the values are amounts of money, not negative, optionally not zero and within the
+        precision of the money columns.
+        """
+        if positive:
+            negative_message = f"{field_name} must be a positive number."
+        else:
+            negative_message = f"{field_name} cannot be negative."
+        cents, valid = BatchValidator._parse_cents_array(values)
+        checks = [(~valid, f"{field_name} must be a valid number."), (cents < 0, negative_message)]
+        if not allow_zero:
+            checks.append((cents == 0, f"{field_name} cannot be zero."))
+        checks.append((cents >= MAX_CENTS, f"{field_name} must be less than {MAX_MONEY:,}."))
+        return BatchValidator._errors(values, field_name, checks)
+
+    @staticmethod
+    def check_booleans(values: list, field_name: str) -> list:
+        """
+        Checks that the values are either 'true' or 'false'.
+        """
+        strings, missing = BatchValidator._as_strings(values)
+        valid = ~missing & np.isin(np.strings.lower(strings), ["true", "false"])
+        return BatchValidator._errors(values, field_name, [(~valid, f"{field_name} must be 'True' or 'False'.")])
+
+    @staticmethod
+    def parse_datetimes(values: list) -> list:
+        """
+        Parses "YYYY-MM-DD HH:MM:SS" values as DataValidator does, with None for the invalid values.
+        """
+        return list(map(BatchValidator._parse_datetime, values))
+
+    @staticmethod
+    def check_datetimes(values: list, field_name: str, not_before: datetime = None) -> list:
+        """
+        Checks the date and time format (YYYY-MM-DD HH:MM:SS), and optionally that the dates are not before
+        ``not_before``.
+        """
+        parsed = BatchValidator._parse_datetime_array(values)
+        checks = [(np.isnat(parsed), f"Invalid datetime format for {field_name}. Use YYYY-MM-DD HH:MM:SS.")]
+        if not_before is not None:
+            checks.append((parsed < np.datetime64(not_before), f"{field_name} cannot be in the past."))
+        return BatchValidator._errors(values, field_name, checks)
+
+    @staticmethod
+    def check_datetime_ranges(
+        starts: list, ends: list, start_field: str = "Event Date Start", end_field: str = "Event Date End"
+    ) -> list:
+        """
+        Checks that each end date is not before its start date nor more than MAX_EVENT_DURATION after it.
+        Unparseable dates are left to check_datetimes.
+        """
+        start_stamps = BatchValidator._parse_datetime_array(starts)
+        end_stamps = BatchValidator._parse_datetime_array(ends)
+        return BatchValidator._errors(
+            ends,
+            end_field,
+            [
+                (end_stamps < start_stamps, f"{end_field} cannot be before {start_field}."),
+                (
+                    end_stamps - start_stamps > np.timedelta64(MAX_EVENT_DURATION),
+                    f"{end_field} cannot be more than {MAX_EVENT_DURATION.days} days after {start_field}.",
+                ),
+            ],
+        )
+
+    @staticmethod
+    def lookup(session, key_column, keys, *columns) -> dict:
+        """
+        Fetches the given columns of the rows whose ``key_column`` is in ``keys``, with one IN query
+        (split every IN_CHUNK_SIZE keys).
+
+        Args:
+            session (Session): The SQLAlchemy session.
+            key_column (Column): The column matched against the keys, e.g. Client.id.
+            keys (iterable): The keys to look up; duplicates and None are ignored.
+            *columns (Column): The columns to fetch for each key.
+
+        Returns:
+            dict: Row of the requested columns by key, for the keys that exist.
+        """
+        distinct_keys = list({key for key in keys if key is not None})
+        found = {}
+        for start in range(0, len(distinct_keys), IN_CHUNK_SIZE):
+            chunk = distinct_keys[start : start + IN_CHUNK_SIZE]
+            for row in session.query(key_column, *columns).filter(key_column.in_(chunk)):
+                found[row[0]] = row
+        return found
+
+    @staticmethod
+    def check_existing_ids(values: list, field_name: str, id_column, session) -> list:
+        """
+        Checks that the IDs are positive integers referencing existing rows, with one IN query.
+
+        Args:
+            values (list): The IDs to check.
+            field_name (str): The name of the field, used in the messages.
+            id_column (Column): The referenced primary key, e.g. User.id.
+            session (Session): The SQLAlchemy session.
+
+        Returns:
+            list: The ValidationError records of the invalid IDs.
+        """
+        errors = BatchValidator.check_ids(values, field_name)
+        numbers, valid = BatchValidator._parse_int_array(*BatchValidator._as_strings(values))
+        positive = valid & (numbers > 0)
+        existing = BatchValidator.lookup(session, id_column, numbers[positive].tolist())
+        missing = positive & ~np.isin(numbers, np.fromiter(existing, dtype=np.int64, count=len(existing)))
+        errors += BatchValidator._errors(values, field_name, [(missing, f"{field_name} does not exist.")])
+        errors.sort(key=lambda error: error.row)
+        return errors
+
+    @staticmethod
+    def validate(columns: dict, rules: list) -> list:
+        """
+        Runs several checks over the columns of a batch.
+
+        Args:
+            columns (dict): List of values by column name, all of the same length.
+            rules (list): ``(column name, check, kwargs)`` tuples, where check is one of the column checks
+                of this class taking the values as first argument.
+
+        Returns:
+            list: The ValidationError records of all the rules, ordered by row.
+        """
+        errors = []
+        for name, check, kwargs in rules:
+            errors.extend(check(columns[name], **kwargs))
+        errors.sort(key=lambda error: error.row)
+        return errors
+
+    @staticmethod
+    def to_columns(rows: list, names: list) -> dict:
+        """
+        Transposes a list of row dictionaries into the columns expected by the checks.
+        """
+        return {name: [row.get(name) for row in rows] for name in names}
@@ -0,0 +1,122 @@
+import csv
+import os
+from collections import namedtuple
+
+# Outcome of a bulk import: number of rows inserted and number of rows written to the reject file.
+ImportResult = namedtuple("ImportResult", ["imported", "rejected"])
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def read_csv_chunks(path: str, required_columns: list, chunk_size: int = DEFAULT_CHUNK_SIZE, start_line: int = 2):
+    """
+    Streams a CSV file with a header row as chunks of row dictionaries.
+
+    Args:
+        path (str): Path of the CSV file.
+        required_columns (list): Columns that must be present in the header.
+        chunk_size (int): Maximum number of rows per chunk.
+        start_line (int): Line number of the first row to read, to resume an interrupted import.
+
+    Yields:
+        tuple: (line, rows) where line is the line number of the first row of the chunk in the file
+            (the header being line 1) and rows the list of row dictionaries.
+
+    Raises:
+        ValueError: If the file is empty or required columns are missing from the header.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.DictReader(file)
+        if reader.fieldnames is None:
+            raise ValueError(f"{path} is empty.")
+        missing = [column for column in required_columns if column not in reader.fieldnames]
+        if missing:
+            raise ValueError(f"Missing columns in {path}: {', '.join(missing)}.")
+
+        line = 2
+        rows = []
+        for row in reader:
+            if line < start_line:
+                line += 1
+                continue
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield line, rows
+                line += len(rows)
+                rows = []
+        if rows:
+            yield line, rows
+
+
+def read_csv_column(path: str, column: str, start_line: int = 2) -> set:
+    """
+    Collects the distinct values of a column in a first pass over a CSV file, so that the rows they
+    reference can be fetched with a single query before the import.
+    """
+    values = set()
+    for _, rows in read_csv_chunks(path, [column], start_line=start_line):
+        values.update(row[column] for row in rows)
+    return values
+
+
+def group_errors(errors: list) -> dict:
+    """
+    Groups the ValidationError records of a chunk by row, joining the messages of each row.
+
+    Returns:
+        dict: Error message by row index in the chunk.
+    """
+    messages = {}
+    for error in errors:
+        messages[error.row] = f"{messages[error.row]} {error.message}" if error.row in messages else error.message
+    return messages
+
+
+class RejectWriter:
+    """
+    Writes the rejected rows of a bulk import to a CSV file, with their line in the source file and the
+    reason of the rejection. The file is only created when a row is rejected.
+    """
+
+    def __init__(self, path: str, columns: list, append: bool = False):
+        self.path = path
+        self.columns = ["line", *columns, "error"]
+        self.count = 0
+        self.append = append
+        self._file = None
+        self._writer = None
+
+    def write(self, line: int, row: dict, message: str):
+        """
+        Records a rejected row.
+
+        Args:
+            line (int): Line of the row in the source file.
+            row (dict): The rejected row.
+            message (str): The reason of the rejection.
+        """
+        self.count += 1
+        if self.path is None:
+            return
+        if self._writer is None:
+            # A resumed import adds its rejects to the ones of the interrupted run.
+            write_header = not (self.append and os.path.exists(self.path) and os.path.getsize(self.path))
+            self._file = open(self.path, "a" if self.append else "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            if write_header:
+                self._writer.writeheader()
+        self._writer.writerow({**row, "line": line, "error": message})
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
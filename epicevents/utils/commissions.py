@@ -0,0 +1,175 @@
+import json
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+import numpy as np
+from utils.analytics import group_by
+from utils.money import MAX_MONEY, from_cents, to_cents
+
+# Rates are held in basis points (hundredths of a percent), so that commissions are computed in integers.
+BASIS_POINTS = 10000
+
+# Marginal tiers of a rule: the signed amount in cents from which each rate, in basis points, applies to the
+# part of the amount above it, the first tier starting at 0. A flat percentage is a single tier.
+CommissionRule = namedtuple("CommissionRule", ["thresholds", "rates"])
+
+# Rule of each commercial contact ID, and the rule of the commercials without one (None to pay them nothing).
+CommissionRules = namedtuple("CommissionRules", ["default", "commercials"])
+
+# Commission of a commercial contact over a period.
+CommissionRow = namedtuple(
+    "CommissionRow",
+    [
+        "commercial_contact_id",
+        "commercial_name",
+        "contracts",
+        "signed_amount",
+        "commission",
+        "effective_rate",
+        "rule",
+    ],
+)
+
+
+def _parse_rate(value, where: str) -> int:
+    error = ValueError(f"{where}: the rate must be a percentage between 0 and 100 with at most 2 decimals.")
+    if isinstance(value, bool):
+        raise error
+    try:
+        rate = Decimal(str(value)) * 100
+    except InvalidOperation:
+        raise error from None
+    if not rate.is_finite() or not 0 <= rate <= BASIS_POINTS or rate != rate.to_integral_value():
+        raise error
+    return int(rate)
+
+
+def parse_rule(value, where: str = "rule") -> CommissionRule:
+    """
+    Reads a rule: a percentage of the signed amount, e.g. 5, or a list of tiers such as
+    [{"from": 0, "rate": 3}, {"from": 50000, "rate": 5}], each rate applying to the part of the signed
+    amount above its "from" amount, up to the next tier.
+
+    Raises:
+        ValueError: If the rule is malformed.
+    """
+    if not isinstance(value, list):
+        return CommissionRule((0,), (_parse_rate(value, where),))
+    thresholds, rates = [], []
+    for tier in value:
+        if not isinstance(tier, dict) or set(tier) != {"from", "rate"}:
+            raise ValueError(f'{where}: each tier must have a "from" amount and a "rate".')
+        try:
+            threshold = to_cents(tier["from"])
+        except ValueError:
+            raise ValueError(f'{where}: invalid "from" amount {tier["from"]!r}.') from None
+        if threshold >= to_cents(MAX_MONEY):
+            raise ValueError(f'{where}: the "from" amounts must be less than {MAX_MONEY:,}.')
+        thresholds.append(threshold)
+        rates.append(_parse_rate(tier["rate"], where))
+    if not thresholds or thresholds[0] != 0 or any(low >= high for low, high in zip(thresholds, thresholds[1:])):
+        raise ValueError(f'{where}: the tiers must start from 0, in increasing "from" order.')
+    return CommissionRule(tuple(thresholds), tuple(rates))
+
+
+def parse_rules(content) -> CommissionRules:
+    """
+    Reads the commission rules: {"default": rule, "commercials": {"<commercial contact ID>": rule}}, both
+    keys being optional.
+
+    Raises:
+        ValueError: If the rules are malformed.
+    """
+    if (
+        not isinstance(content, dict)
+        or not set(content) <= {"default", "commercials"}
+        or not isinstance(content.get("commercials", {}), dict)
+    ):
+        raise ValueError('The rules must be an object with "default" and "commercials" keys.')
+    default = content.get("default")
+    commercials = {}
+    for key, value in content.get("commercials", {}).items():
+        if not str(key).isdigit():
+            raise ValueError(f"Invalid commercial contact ID: {key!r}.")
+        commercials[int(key)] = parse_rule(value, f"commercial {key}")
+    return CommissionRules(None if default is None else parse_rule(default, "default"), commercials)
+
+
+def load_rules(path: str) -> CommissionRules:
+    """
+    Reads the commission rules from a JSON file.
+
+    Raises:
+        ValueError: If the file is not valid JSON or the rules are malformed.
+    """
+    with open(path, encoding="utf-8") as file:
+        try:
+            content = json.load(file)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {path}: {e}") from None
+    return parse_rules(content)
+
+
+def describe_rule(rule: CommissionRule) -> str:
+    if rule is None:
+        return "no rule"
+    rates = [f"{Decimal(rate).scaleb(-2).normalize():f}%" for rate in rule.rates]
+    if len(rates) == 1:
+        return rates[0]
+    return ", ".join(f"{rate} from {from_cents(low):,}" for rate, low in zip(rates, rule.thresholds))
+
+
+def tiered_commission(amounts, rule: CommissionRule) -> np.ndarray:
+    """
+    Computes the commission of each signed amount, in cents. Each rate applies to the part of the amount
+    between its threshold and the next one; the parts are summed in cent-basis points and rounded half up
+    to the cent once.
+    """
+    amounts = np.asarray(amounts, dtype=np.int64)
+    units = np.zeros(len(amounts), dtype=np.int64)
+    for low, high, rate in zip(rule.thresholds, rule.thresholds[1:] + (None,), rule.rates):
+        part = np.clip(amounts - low, 0, None if high is None else high - low)
+        units += part * rate
+    return (units + BASIS_POINTS // 2) // BASIS_POINTS
+
+
+def compute_commissions(commercial_ids, amounts, rules: CommissionRules, names: dict = None) -> list:
+    """
+    Computes the commissions of the commercial contacts over signed contracts.
+
+    The contracts are grouped by commercial contact with one vectorized group-by, then the commercials
+    sharing a rule have their commissions computed together on the array of their signed amounts.
+    Args:
+        commercial_ids (ndarray): Commercial contact ID of each signed contract, 0 if it has none.
+        amounts (ndarray): Total amount in cents of each signed contract.
+        rules (CommissionRules): The commission rules.
+        names (dict, optional): Names of the commercial contacts, by ID.
+    Returns:
+        list: One CommissionRow per commercial contact with signed contracts, ordered by ID. Contracts
+            without a commercial contact are left out.
+    """
+    commercial_ids = np.asarray(commercial_ids)
+    assigned = commercial_ids != 0
+    groups = group_by(commercial_ids[assigned], np.asarray(amounts)[assigned])
+    totals = groups.sums[0]
+    commercial_rules = [rules.commercials.get(int(key), rules.default) for key in groups.keys]
+
+    commissions = np.zeros(len(totals), dtype=np.int64)
+    for rule in set(commercial_rules) - {None}:
+        shared = np.array([commercial_rule == rule for commercial_rule in commercial_rules], dtype=np.bool_)
+        commissions[shared] = tiered_commission(totals[shared], rule)
+
+    names = names or {}
+    return [
+        CommissionRow(
+            int(key),
+            names.get(int(key)),
+            int(count),
+            from_cents(total),
+            from_cents(commission),
+            round(int(commission) / int(total), 4) if total else 0.0,
+            describe_rule(rule),
+        )
+        for key, count, total, commission, rule in zip(
+            groups.keys, groups.counts, totals, commissions, commercial_rules
+        )
+    ]
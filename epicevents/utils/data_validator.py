@@ -1,162 +1,235 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 from rich.console import Console
-from controllers.user_controller import UserController
+from utils.money import MAX_MONEY, to_money
 
 console = Console()
 
+EMAIL_PATTERN = re.compile(r"^\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+PHONE_PATTERN = re.compile(r"^\+?[0-9\s]*$")
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEPARTMENT_IDS = (1, 2, 3)
+# Longest event accepted; it bounds the range of the schedule index read by the conflict check.
+MAX_EVENT_DURATION = timedelta(days=31)
+
 
 class DataValidator:
     """
     Validates the input data before processing it in the database.
+
+    Each ``check_*`` method returns the error message of an invalid value (or None if it is valid)
+    without printing anything, so that the interactive prompts, the command line options and the
+    bulk imports share the same rules. The ``validate_*`` methods print the error and return a bool.
     """
 
     @staticmethod
-    def validate_string(value: str, field_name: str) -> bool:
+    def _report(error: str) -> bool:
         """
-        Validates that a string is not empty and has at least 1 character.
+        Prints the error message, if any, and returns whether the value is valid.
         """
-        if not value or not value.strip():
-            console.print(f"[bold red]{field_name} cannot be empty.[/bold red]")
+        if error:
+            console.print(f"[bold red]{error}[/bold red]")
             return False
         return True
 
     @staticmethod
-    def validate_email(email: str) -> bool:
+    def check_string(value: str, field_name: str) -> str:
         """
-        Validates the email format.
+        Checks that a string is not empty and has at least 1 character.
         """
-        email_regex = r"^\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-        if not email or not re.match(email_regex, email):
-            console.print("[bold red]Invalid email format.[/bold red]")
-            return False
-        return True
+        if not value or not value.strip():
+            return f"{field_name} cannot be empty."
+        return None
 
     @staticmethod
-    def validate_phone(phone: str) -> bool:
+    def check_email(email: str) -> str:
         """
-        Validates the phone number format.
+        Checks the email format.
         """
-        phone_regex = r"^\+?[0-9\s]*$"
-        if not phone or not re.match(phone_regex, phone):
-            console.print("[bold red]Invalid phone number format.[/bold red]")
-            return False
-        return True
+        if not email or not EMAIL_PATTERN.match(email):
+            return "Invalid email format."
+        return None
 
     @staticmethod
-    def validate_id(value: str, field_name: str) -> bool:
+    def check_phone(phone: str) -> str:
         """
-        Validates that the ID is a positive integer.
+        Checks the phone number format.
+        """
+        if not phone or not PHONE_PATTERN.match(phone):
+            return "Invalid phone number format."
+        return None
+
+    @staticmethod
+    def check_id(value: str, field_name: str) -> str:
+        """
+        Checks that the ID is a positive integer.
         """
         try:
             if int(value) > 0:
-                return True
-            else:
-                console.print(f"[bold red]{field_name} must be a positive integer.[/bold red]")
-                return False
+                return None
+            return f"{field_name} must be a positive integer."
         except ValueError:
-            console.print(f"[bold red]{field_name} must be a valid integer.[/bold red]")
-            return False
+            return f"{field_name} must be a valid integer."
 
     @staticmethod
-    def validate_attendees(value: str, field_name: str) -> bool:
+    def check_attendees(value: str, field_name: str) -> str:
         """
-        Validates that the attendees count is at least 1 and not negative.
+        Checks that the attendees count is at least 1 and not negative.
         """
         try:
-            attendees = int(value)
-            if attendees > 0:
-                return True
-            else:
-                console.print(f"[bold red]{field_name} must be at least 1.[/bold red]")
-                return False
+            if int(value) > 0:
+                return None
+            return f"{field_name} must be at least 1."
         except ValueError:
-            console.print(f"[bold red]{field_name} must be a valid integer.[/bold red]")
-            return False
+            return f"{field_name} must be a valid integer."
 
     @staticmethod
-    def validate_existing_user_id(value: str, field_name: str) -> bool:
+    def check_existing_user_id(value: str, field_name: str) -> str:
         """
-        Validates that the user ID exists in the database.
+        Checks that the user ID exists in the database.
         """
+        from controllers.user_controller import UserController
+
         try:
             user_id = int(value)
             if user_id > 0 and UserController.user_exists(user_id):
-                return True
-            else:
-                console.print(f"[bold red]{field_name} does not exist.[/bold red]")
-                return False
+                return None
+            return f"{field_name} does not exist."
         except ValueError:
-            console.print(f"[bold red]{field_name} must be a valid integer.[/bold red]")
-            return False
+            return f"{field_name} must be a valid integer."
 
     @staticmethod
-    def validate_department_id(value: str, field_name: str) -> bool:
+    def check_department_id(value: str, field_name: str) -> str:
         """
-        Validates that the department ID is either 1, 2, or 3.
+        Checks that the department ID is either 1, 2, or 3.
         """
         try:
-            department_id = int(value)
-            if department_id in [1, 2, 3]:
-                return True
-            else:
-                console.print(f"[bold red]{field_name} must be 1, 2, or 3.[/bold red]")
-                return False
+            if int(value) in DEPARTMENT_IDS:
+                return None
+            return f"{field_name} must be 1, 2, or 3."
         except ValueError:
-            console.print(f"[bold red]{field_name} must be a valid integer.[/bold red]")
-            return False
+            return f"{field_name} must be a valid integer."
 
     @staticmethod
-    def validate_float(value: str, field_name: str, positive: bool = True, allow_zero: bool = False) -> bool:
+    def check_float(value: str, field_name: str, positive: bool = True, allow_zero: bool = False) -> str:
         """
-        Validates that a value is a float, optionally positive and optionally allows zero.
+        Checks that a value is an amount of money, optionally positive and optionally allows zero. The amount
+        is rounded to the cent first, as it will be stored.
         """
         try:
-            float_value = float(value)
-            if positive and float_value < 0:
-                console.print(f"[bold red]{field_name} must be a positive number.[/bold red]")
-                return False
-            elif not positive and float_value < 0:
-                console.print(f"[bold red]{field_name} cannot be negative.[/bold red]")
-                return False
-            if not allow_zero and float_value == 0:
-                console.print(f"[bold red]{field_name} cannot be zero.[/bold red]")
-                return False
-            return True
+            amount = to_money(value)
         except ValueError:
-            console.print(f"[bold red]{field_name} must be a valid number.[/bold red]")
-            return False
+            return f"{field_name} must be a valid number."
+        if positive and amount < 0:
+            return f"{field_name} must be a positive number."
+        elif not positive and amount < 0:
+            return f"{field_name} cannot be negative."
+        if not allow_zero and amount == 0:
+            return f"{field_name} cannot be zero."
+        if amount >= MAX_MONEY:
+            return f"{field_name} must be less than {MAX_MONEY:,}."
+        return None
 
     @staticmethod
-    def validate_datetime(datetime_text: str, field_name: str, start_datetime: str = None) -> bool:
+    def check_datetime(datetime_text: str, field_name: str, start_datetime: str = None) -> str:
         """
-        Validates the date and time format (YYYY-MM-DD HH:MM:SS) and checks if the date is valid.
-        Ensures the start date is not in the past and the end date is not before the start date.
+        Checks the date and time format (YYYY-MM-DD HH:MM:SS) and checks if the date is valid.
+        Ensures the start date is not in the past and the end date is not before the start date nor more
+        than MAX_EVENT_DURATION after it.
         """
         try:
-            dt = datetime.strptime(datetime_text, "%Y-%m-%d %H:%M:%S")
+            dt = datetime.strptime(datetime_text, DATETIME_FORMAT)
             if field_name == "Event Date Start" and dt < datetime.now():
-                console.print("[bold red]Event Date Start cannot be in the past.[/bold red]")
-                return False
+                return "Event Date Start cannot be in the past."
             if field_name == "Event Date End" and start_datetime:
-                start_dt = datetime.strptime(start_datetime, "%Y-%m-%d %H:%M:%S")
+                start_dt = datetime.strptime(start_datetime, DATETIME_FORMAT)
                 if dt < start_dt:
-                    console.print("[bold red]Event Date End cannot be before Event Date Start.[/bold red]")
-                    return False
-            return True
+                    return "Event Date End cannot be before Event Date Start."
+                if dt - start_dt > MAX_EVENT_DURATION:
+                    return f"Event Date End cannot be more than {MAX_EVENT_DURATION.days} days after Event Date Start."
+            return None
         except ValueError:
-            console.print(f"[bold red]Invalid datetime format for {field_name}. Use YYYY-MM-DD HH:MM:SS.[/bold red]")
-            return False
+            return f"Invalid datetime format for {field_name}. Use YYYY-MM-DD HH:MM:SS."
+
+    @staticmethod
+    def check_boolean(value: str, field_name: str) -> str:
+        """
+        Checks that the value is either 'true' or 'false'.
+        """
+        if value.lower() in ["true", "false"]:
+            return None
+        return f"{field_name} must be 'True' or 'False'."
+
+    @staticmethod
+    def validate_string(value: str, field_name: str) -> bool:
+        """
+        Validates that a string is not empty and has at least 1 character.
+        """
+        return DataValidator._report(DataValidator.check_string(value, field_name))
+
+    @staticmethod
+    def validate_email(email: str) -> bool:
+        """
+        Validates the email format.
+        """
+        return DataValidator._report(DataValidator.check_email(email))
+
+    @staticmethod
+    def validate_phone(phone: str) -> bool:
+        """
+        Validates the phone number format.
+        """
+        return DataValidator._report(DataValidator.check_phone(phone))
+
+    @staticmethod
+    def validate_id(value: str, field_name: str) -> bool:
+        """
+        Validates that the ID is a positive integer.
+        """
+        return DataValidator._report(DataValidator.check_id(value, field_name))
+
+    @staticmethod
+    def validate_attendees(value: str, field_name: str) -> bool:
+        """
+        Validates that the attendees count is at least 1 and not negative.
+        """
+        return DataValidator._report(DataValidator.check_attendees(value, field_name))
+
+    @staticmethod
+    def validate_existing_user_id(value: str, field_name: str) -> bool:
+        """
+        Validates that the user ID exists in the database.
+        """
+        return DataValidator._report(DataValidator.check_existing_user_id(value, field_name))
+
+    @staticmethod
+    def validate_department_id(value: str, field_name: str) -> bool:
+        """
+        Validates that the department ID is either 1, 2, or 3.
+        """
+        return DataValidator._report(DataValidator.check_department_id(value, field_name))
+
+    @staticmethod
+    def validate_float(value: str, field_name: str, positive: bool = True, allow_zero: bool = False) -> bool:
+        """
+        Validates that a value is an amount of money, optionally positive and optionally allows zero.
+        """
+        return DataValidator._report(DataValidator.check_float(value, field_name, positive, allow_zero))
+
+    @staticmethod
+    def validate_datetime(datetime_text: str, field_name: str, start_datetime: str = None) -> bool:
+        """
+        Validates the date and time format (YYYY-MM-DD HH:MM:SS) and checks if the date is valid.
+        Ensures the start date is not in the past and the end date is not before the start date.
+        """
+        return DataValidator._report(DataValidator.check_datetime(datetime_text, field_name, start_datetime))
 
     @staticmethod
     def validate_boolean(value: str, field_name: str) -> bool:
         """
         Validates that the value is either 'true' or 'false'.
         """
-        if value.lower() in ["true", "false"]:
-            return True
-        console.print(f"[bold red]{field_name} must be 'True' or 'False'.[/bold red]")
-        return False
+        return DataValidator._report(DataValidator.check_boolean(value, field_name))
 
     @staticmethod
     def prompt_and_validate(
@@ -1,12 +1,20 @@
 from config import Config, Base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, text
-import sentry_sdk
+from sqlalchemy import DateTime, Float, create_engine, inspect, text
+from sqlalchemy.schema import AddConstraint, CreateColumn
+from utils.telemetry import Telemetry
 from models.user import User
 from models.department import Department
 from models.client import Client
 from models.contract import Contract
+from models.money import Money
 from models.event import Event
+from models.event_archive import EventArchive
+from models.import_progress import ImportProgress
+from models.summary import CommercialSummary, SupportSummary
+
+# Columns removed from the models, dropped from the existing tables by migrate_tables.
+DROPPED_COLUMNS = {"SupportSummary": ["upcoming_events"]}
 
 
 class DatabaseInitializer:
@@ -21,7 +29,7 @@ class DatabaseInitializer:
             self.admin_db_uri = f"mysql+mysqlconnector://{Config.ADMIN_DB_USER}:{Config.ADMIN_DB_PASSWORD}@{Config.DB_HOST}:{Config.DB_PORT}/"
             self.engine = create_engine(self.admin_db_uri)
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Failed to initialize DatabaseInitializer: {e}")
 
     def create_database(self):
@@ -35,7 +43,7 @@ class DatabaseInitializer:
                 connection.execute(text(f"CREATE DATABASE IF NOT EXISTS {db_name} CHARACTER SET UTF8"))
                 print(f"Database {db_name} created successfully.")
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Error creating database: {e}")
 
     def create_user(self):
@@ -56,7 +64,7 @@ class DatabaseInitializer:
                 connection.execute(text("FLUSH PRIVILEGES"))
                 print("User created successfully.")
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Error creating user: {e}")
 
     def create_tables(self):
@@ -70,9 +78,81 @@ class DatabaseInitializer:
             Base.metadata.create_all(engine_with_db)
             print("Tables created successfully.")
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Error creating tables: {e}")
 
+    def migrate_tables(self):
+        """
+        Adds to existing tables the columns and indexes introduced since they were created,
+        as create_all only creates missing tables, and converts the amounts stored as FLOAT to DECIMAL.
+        MySQL rounds the existing values to the cent during the conversion. The DATETIME columns whose
+        fractional seconds precision changed are converted too.
+        A new primary key column replaces the previous primary key, which is kept as a plain column, and
+        foreign keys whose ON DELETE rule changed are re-created, and the DROPPED_COLUMNS are dropped.
+        """
+        try:
+            db_name = Config.TEST_DB_NAME if Config.get_use_test_database() else Config.DB_NAME
+            engine_with_db = create_engine(f"{self.admin_db_uri}{db_name}")
+            inspector = inspect(engine_with_db)
+            with engine_with_db.begin() as connection:
+                for table in Base.metadata.sorted_tables:
+                    existing_columns = {column["name"]: column for column in inspector.get_columns(table.name)}
+                    for column in table.columns:
+                        column_ddl = CreateColumn(column).compile(dialect=engine_with_db.dialect)
+                        if column.name not in existing_columns and column.primary_key:
+                            print(f"Adding primary key {table.name}.{column.name}...")
+                            connection.execute(
+                                text(
+                                    f"ALTER TABLE `{table.name}` DROP PRIMARY KEY, "
+                                    f"ADD COLUMN {column_ddl} PRIMARY KEY FIRST"
+                                )
+                            )
+                        elif column.name not in existing_columns:
+                            print(f"Adding column {table.name}.{column.name}...")
+                            connection.execute(text(f"ALTER TABLE `{table.name}` ADD COLUMN {column_ddl}"))
+                        elif isinstance(column.type, Money) and isinstance(
+                            existing_columns[column.name]["type"], Float
+                        ):
+                            print(f"Converting column {table.name}.{column.name} to DECIMAL...")
+                            connection.execute(text(f"ALTER TABLE `{table.name}` MODIFY COLUMN {column_ddl}"))
+                        elif isinstance(column.type, DateTime) and (
+                            column.type.compile(dialect=engine_with_db.dialect)
+                            != existing_columns[column.name]["type"].compile(dialect=engine_with_db.dialect)
+                        ):
+                            print(f"Changing the precision of column {table.name}.{column.name}...")
+                            connection.execute(text(f"ALTER TABLE `{table.name}` MODIFY COLUMN {column_ddl}"))
+                    for column_name in DROPPED_COLUMNS.get(table.name, []):
+                        if column_name in existing_columns:
+                            print(f"Dropping column {table.name}.{column_name}...")
+                            connection.execute(text(f"ALTER TABLE `{table.name}` DROP COLUMN `{column_name}`"))
+
+                    existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+                    for index in table.indexes:
+                        if index.name not in existing_indexes:
+                            print(f"Creating index {index.name}...")
+                            index.create(connection)
+
+                    existing_foreign_keys = {
+                        tuple(foreign_key["constrained_columns"]): foreign_key
+                        for foreign_key in inspector.get_foreign_keys(table.name)
+                    }
+                    for constraint in table.foreign_key_constraints:
+                        existing = existing_foreign_keys.get(tuple(constraint.column_keys))
+                        if (
+                            existing
+                            and constraint.ondelete
+                            and existing["options"].get("ondelete", "").upper() != constraint.ondelete.upper()
+                        ):
+                            print(f"Setting ON DELETE {constraint.ondelete} on {table.name}.{existing['name']}...")
+                            connection.execute(
+                                text(f"ALTER TABLE `{table.name}` DROP FOREIGN KEY `{existing['name']}`")
+                            )
+                            connection.execute(AddConstraint(constraint))
+            print("Tables migrated successfully.")
+        except Exception as e:
+            Telemetry.capture_exception(e)
+            print(f"Error migrating tables: {e}")
+
     def create_departments(self):
         """
         Creates unique departments with specific IDs using the admin user.
@@ -94,7 +174,7 @@ class DatabaseInitializer:
             print("Departments created successfully.")
 
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Error creating departments: {e}")
 
     def initialize(self):
@@ -105,7 +185,8 @@ class DatabaseInitializer:
             self.create_database()  # Create the database using the admin user
             self.create_user()  # Create user and grant necessary privileges
             self.create_tables()  # Create tables using the admin user
+            self.migrate_tables()  # Add the columns and indexes missing from existing tables
             self.create_departments()  # Create unique departments using the admin user
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             print(f"Failed to initialize the database: {e}")
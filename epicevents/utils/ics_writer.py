@@ -0,0 +1,144 @@
+import os
+
+PRODID = "-//Epic Events//CRM//EN"
+# Extension properties of the calendars written by the application: the events they hold (e.g. "support-3")
+# and the database time up to which they are complete, read back by the incremental export.
+FEED_PROPERTY = "X-EPICEVENTS-FEED"
+UNTIL_PROPERTY = "X-EPICEVENTS-UNTIL"
+ICS_DATETIME_FORMAT = "%Y%m%dT%H%M%S"
+
+# Content lines are folded at 75 octets, continuation lines starting with a space (RFC 5545, 3.1).
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value) -> str:
+    """
+    Escape a TEXT property value.
+    """
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """
+    Fold a content line into CRLF-terminated lines of at most 75 octets, without splitting a UTF-8 character.
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    start, limit = 0, MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        # Continuation lines lose one octet to the leading space.
+        start, limit = end, MAX_LINE_OCTETS - 1
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def event_uid(event_id: int) -> str:
+    return f"event-{event_id}@epicevents"
+
+
+def format_event(event_id: int, summary: str, start, end, stamp, location: str = None, description: str = None) -> str:
+    """
+    Build the VEVENT block of an event.
+
+    Args:
+        event_id (int): The ID of the event, from which its UID is derived.
+        summary (str): Title of the event.
+        start (datetime): Start of the event, written as a local time.
+        end (datetime): End of the event, written as a local time.
+        stamp (datetime): Time of the export, in UTC.
+        location (str, optional): Location of the event.
+        description (str, optional): Description of the event.
+
+    Returns:
+        str: The CRLF-terminated lines of the block.
+    """
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event_uid(event_id)}",
+        f"DTSTAMP:{stamp:{ICS_DATETIME_FORMAT}}Z",
+        f"DTSTART:{start:{ICS_DATETIME_FORMAT}}",
+        f"DTEND:{end:{ICS_DATETIME_FORMAT}}",
+        f"SUMMARY:{escape_text(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{escape_text(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
+
+
+def write_calendar(stream, blocks, name: str, properties: dict) -> int:
+    """
+    Stream a VCALENDAR to a text stream, one VEVENT block at a time.
+
+    Args:
+        stream (file): Writable text stream, opened with newline="" so that the CRLF line ends are kept.
+        blocks (iterable): VEVENT blocks built by format_event.
+        name (str): Display name of the calendar.
+        properties (dict): Extension properties written in the header.
+
+    Returns:
+        int: The number of events written.
+    """
+    header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", f"X-WR-CALNAME:{name}"]
+    header.extend(f"{key}:{value}" for key, value in properties.items())
+    stream.write("".join(fold(line) for line in header))
+    count = 0
+    for block in blocks:
+        stream.write(block)
+        count += 1
+    stream.write("END:VCALENDAR\r\n")
+    stream.flush()
+    return count
+
+
+def write_calendar_file(path: str, blocks, name: str, properties: dict) -> int:
+    """
+    Write a calendar file atomically, so that a calendar app never reads a truncated file.
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8", newline="") as file:
+        count = write_calendar(file, blocks, name, properties)
+    os.replace(temporary_path, path)
+    return count
+
+
+def read_calendar(path: str) -> tuple:
+    """
+    Read back a calendar written by write_calendar, for an incremental export.
+
+    Returns:
+        tuple: The extension properties of the calendar, and its VEVENT blocks by UID in file order.
+    """
+    properties = {}
+    blocks = {}
+    block, uid = None, None
+    with open(path, encoding="utf-8", newline="") as file:
+        for line in file:
+            if block is not None:
+                block.append(line)
+                if line.startswith("UID:"):
+                    uid = line[4:].rstrip("\r\n")
+                elif line.startswith("END:VEVENT"):
+                    blocks[uid] = "".join(block)
+                    block = None
+            elif line.startswith("BEGIN:VEVENT"):
+                block, uid = [line], None
+            else:
+                key, _, value = line.rstrip("\r\n").partition(":")
+                if key in (FEED_PROPERTY, UNTIL_PROPERTY):
+                    properties[key] = value
+    return properties, blocks
@@ -0,0 +1,65 @@
+import json
+import os
+from models.import_progress import ImportProgress
+
+
+class ImportCheckpoint:
+    """
+    Records the progress of a bulk import in the ImportProgress table, so that an import interrupted by a
+    crash resumes after the last committed row instead of starting over.
+
+    The progress is saved in the transaction of each chunk, so that it is committed together with the
+    rows of the chunk: a crash never replays a committed chunk. The checkpoint remembers the size and
+    modification time of the source file, and is refused if the file changed since.
+    """
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+
+    def _fingerprint(self) -> str:
+        stat = os.stat(self.source)
+        return json.dumps({"source": os.path.abspath(self.source), "size": stat.st_size, "mtime": stat.st_mtime})
+
+    def load(self, session) -> dict:
+        """
+        Returns the saved progress, or None if there is no checkpoint.
+
+        Returns:
+            dict: ``line`` (next line to import), ``imported`` and ``rejected`` counts.
+
+        Raises:
+            ValueError: If the checkpoint was saved for another file or the file changed since.
+        """
+        if self.name is None:
+            return None
+        progress = session.get(ImportProgress, self.name)
+        if progress is None:
+            return None
+        if progress.fingerprint != self._fingerprint():
+            raise ValueError(
+                f"The checkpoint {self.name} does not match {self.source}. Use another checkpoint to restart "
+                "the import."
+            )
+        return {"line": progress.line, "imported": progress.imported, "rejected": progress.rejected}
+
+    def save(self, session, line: int, imported: int, rejected: int):
+        """
+        Adds the progress to the current transaction, replacing the previous one; the caller commits it
+        with the rows it accounts for.
+        """
+        if self.name is None:
+            return
+        session.merge(
+            ImportProgress(
+                name=self.name, fingerprint=self._fingerprint(), line=line, imported=imported, rejected=rejected
+            )
+        )
+
+    def clear(self, session):
+        """
+        Removes the checkpoint once the import is complete.
+        """
+        if self.name is not None:
+            session.query(ImportProgress).filter_by(name=self.name).delete()
+            session.commit()
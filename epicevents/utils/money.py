@@ -0,0 +1,45 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+CENT = Decimal("0.01")
+# Digits of the DECIMAL money columns, two of them after the decimal point.
+MONEY_PRECISION = 12
+MAX_MONEY = Decimal(10) ** (MONEY_PRECISION - 2)
+
+
+def to_money(value) -> Decimal:
+    """
+    Convert an amount to a Decimal rounded half up to the cent.
+
+    Floats are converted through their shortest representation, so that 0.1 gives 0.10 and not the binary
+    approximation of 0.1.
+
+    Args:
+        value (str, int, float or Decimal): The amount.
+
+    Returns:
+        Decimal: The amount with two decimal places.
+
+    Raises:
+        ValueError: If the value is not a finite number.
+    """
+    try:
+        amount = Decimal(repr(value) if isinstance(value, float) else value)
+        if amount.is_finite():
+            return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, TypeError) as e:
+        raise ValueError(f"Invalid amount: {value!r}") from e
+    raise ValueError(f"Invalid amount: {value!r}")
+
+
+def to_cents(value) -> int:
+    """
+    Convert an amount to an integer number of cents, for exact integer arithmetic.
+    """
+    return int(to_money(value) * 100)
+
+
+def from_cents(cents) -> Decimal:
+    """
+    Convert an integer number of cents back to an amount.
+    """
+    return Decimal(int(cents)).scaleb(-2)
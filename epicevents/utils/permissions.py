@@ -1,5 +1,5 @@
 from models.user import User
-import sentry_sdk
+from utils.telemetry import Telemetry
 
 
 class PermissionManager:
@@ -39,6 +39,30 @@ class PermissionManager:
     def can_manage_users(user: User) -> bool:
         return user.department.name == "Gestion"
 
+    @staticmethod
+    def can_manage_backups(user: User) -> bool:
+        return user.department.name == "Gestion"
+
+    @staticmethod
+    def can_archive_events(user: User) -> bool:
+        return user.department.name == "Gestion"
+
+    @staticmethod
+    def can_view_reports(user: User) -> bool:
+        return user.department.name == "Gestion"
+
+    @staticmethod
+    def can_rebuild_summaries(user: User) -> bool:
+        return user.department.name == "Gestion"
+
+    @staticmethod
+    def can_view_dashboard(user: User) -> bool:
+        return user.department.name in ["Commercial", "Support", "Gestion"]
+
+    @staticmethod
+    def can_export_calendar(user: User) -> bool:
+        return user.department.name in ["Commercial", "Support", "Gestion"]
+
     @staticmethod
     def get_user_role(user: User) -> str:
         """
@@ -47,7 +71,7 @@ class PermissionManager:
         try:
             return user.department.name
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             return None
 
     @staticmethod
@@ -0,0 +1,120 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# Event to schedule: its ID and its time range, the end being excluded.
+Slot = namedtuple("Slot", ["id", "start", "end"])
+
+# Result of the scheduler: event IDs by support contact ID, and the IDs of the events no one is free for.
+Schedule = namedtuple("Schedule", ["assignments", "unassigned"])
+
+
+def hours(start, end) -> float:
+    return (end - start).total_seconds() / 3600
+
+
+class IntervalIndex:
+    """
+    Busy time ranges of one collaborator, kept merged and sorted so that an overlap check is a binary search.
+
+    The ranges are half-open: an event ending at 18:00 does not overlap one starting at 18:00.
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            if self.ends and start < self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlaps(self, start, end) -> bool:
+        """
+        Tells whether [start, end) overlaps a busy range. The ranges being disjoint and sorted, only the last
+        range starting before ``end`` can overlap.
+        """
+        index = bisect_left(self.starts, end)
+        return index > 0 and self.ends[index - 1] > start
+
+    def add(self, start, end):
+        """
+        Marks [start, end) as busy, merging it with the ranges it overlaps.
+        """
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+
+
+def schedule(events, busy: dict) -> Schedule:
+    """
+    Assigns events to support contacts with a greedy heap scheduler.
+
+    The events are taken in chronological order. Each one goes to the support contact with the fewest
+    scheduled hours among those free for its whole time range: the contacts are popped from a min-heap keyed
+    by hours until one has no overlapping event, and the busy ones are pushed back. An event overlapping the
+    schedule of every contact is left unassigned.
+    Args:
+        events (iterable): Slot of each event to assign.
+        busy (dict): (start, end) ranges of the events already assigned, by support contact ID. Every support
+            contact must have an entry, possibly empty.
+    Returns:
+        Schedule: The assigned event IDs by support contact ID, in chronological order, and the unassigned IDs.
+    """
+    indexes = {}
+    heap = []
+    for support_id, intervals in busy.items():
+        intervals = list(intervals)
+        indexes[support_id] = IntervalIndex(intervals)
+        heap.append((sum(hours(start, end) for start, end in intervals), support_id))
+    heapq.heapify(heap)
+
+    assignments = {support_id: [] for support_id in busy}
+    unassigned = []
+    for event in sorted(events, key=lambda slot: (slot.start, slot.id)):
+        skipped = []
+        chosen = None
+        while heap:
+            load, support_id = heapq.heappop(heap)
+            if not indexes[support_id].overlaps(event.start, event.end):
+                chosen = load, support_id
+                break
+            skipped.append((load, support_id))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+
+        if chosen is None:
+            unassigned.append(event.id)
+            continue
+        load, support_id = chosen
+        indexes[support_id].add(event.start, event.end)
+        assignments[support_id].append(event.id)
+        heapq.heappush(heap, (load + hours(event.start, event.end), support_id))
+    return Schedule(assignments, unassigned)
+
+
+def find_overlaps(slots):
+    """
+    Sweeps the events of one collaborator, sorted by start, and yields each event overlapping an earlier one.
+
+    The sweep keeps the earlier event ending last: an event starting before that end overlaps it. Each event
+    is compared once, so a whole schedule is checked in one pass.
+    Args:
+        slots (iterable): Slot of each event, sorted by start.
+    Yields:
+        tuple: The earlier Slot ending last and the later Slot overlapping it.
+    """
+    latest = None
+    for slot in slots:
+        if latest is not None and slot.start < latest.end:
+            yield latest, slot
+        if latest is None or slot.end > latest.end:
+            latest = slot
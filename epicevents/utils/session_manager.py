@@ -1,28 +1,35 @@
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
 from config import Config
+from utils.telemetry import Telemetry
 
 
-def create_engines():
-    """
-    Creates and returns SQLAlchemy engines for user, admin, and test databases.
+# Configured "Session" classes, created on first use so that importing this module does not load the
+# database driver nor build engines that the current command may never need.
+_session_factories = {}
 
-    Returns:
-        tuple: (engine_user, engine_admin, engine_test)
-    """
-    engine_user = create_engine(Config.get_db_uri(Config.DB_USER, Config.DB_PASSWORD))
-    engine_admin = create_engine(Config.get_db_uri(Config.ADMIN_DB_USER, Config.ADMIN_DB_PASSWORD))
-    engine_test = create_engine(Config.get_db_uri(Config.ADMIN_DB_USER, Config.ADMIN_DB_PASSWORD, test=True))
-    return engine_user, engine_admin, engine_test
 
+def get_session_factory(name: str) -> sessionmaker:
+    """
+    Returns the configured "Session" class for the "user", "admin" or "test" engine, creating it on first use.
 
-# Create global engines
-engine_user, engine_admin, engine_test = create_engines()
+    Args:
+        name (str): Name of the engine.
 
-# Create configured "Session" classes
-SessionUser = sessionmaker(bind=engine_user)
-SessionAdmin = sessionmaker(bind=engine_admin)
-SessionTest = sessionmaker(bind=engine_test)
+    Returns:
+        sessionmaker: The configured "Session" class.
+    """
+    if name not in _session_factories:
+        if name == "user":
+            engine = create_engine(Config.get_db_uri(Config.DB_USER, Config.DB_PASSWORD))
+        elif name == "admin":
+            engine = create_engine(Config.get_db_uri(Config.ADMIN_DB_USER, Config.ADMIN_DB_PASSWORD))
+        elif name == "test":
+            engine = create_engine(Config.get_db_uri(Config.ADMIN_DB_USER, Config.ADMIN_DB_PASSWORD, test=True))
+        else:
+            raise ValueError(f"Unknown engine: {name}")
+        _session_factories[name] = sessionmaker(bind=Telemetry.instrument_engine(engine))
+    return _session_factories[name]
 
 
 def get_session():
@@ -33,8 +40,8 @@ def get_session():
         Session: SQLAlchemy session object.
     """
     if Config.get_use_test_database():
-        return SessionTest()
-    return SessionUser()
+        return get_session_factory("test")()
+    return get_session_factory("user")()
 
 
 def get_session_root():
@@ -45,5 +52,43 @@ def get_session_root():
         Session: SQLAlchemy session object.
     """
     if Config.get_use_test_database():
-        return SessionTest()
-    return SessionAdmin()
+        return get_session_factory("test")()
+    return get_session_factory("admin")()
+
+
+def get_engine_root():
+    """
+    Returns the engine of the admin user, for the operations working on connections rather than sessions.
+
+    Returns:
+        Engine: SQLAlchemy engine.
+    """
+    if Config.get_use_test_database():
+        return get_session_factory("test").kw["bind"]
+    return get_session_factory("admin").kw["bind"]
+
+
+def iter_by_key(query, key, batch_size: int = 1000):
+    """
+    Streams the rows of a query ordered by a unique column.
+
+    The MySQL Connector driver has no server-side cursors, so ``yield_per`` would still buffer the whole
+    result: rows are read by keyset pagination (``WHERE key > last ORDER BY key LIMIT n``) instead, as in
+    BackupManager, which keeps each query cheap and the memory bounded.
+
+    Args:
+        query (Query): Query selecting ``key`` among its columns, without ORDER BY nor LIMIT.
+        key (Column): Unique column to page on, e.g. Event.id.
+        batch_size (int): Number of rows fetched from the database at a time.
+
+    Yields:
+        Row: The rows of the query, ordered by ``key``.
+    """
+    last_key = None
+    while True:
+        page = query if last_key is None else query.filter(key > last_key)
+        rows = page.order_by(key).limit(batch_size).all()
+        if not rows:
+            return
+        yield from rows
+        last_key = getattr(rows[-1], key.name)
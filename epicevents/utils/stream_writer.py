@@ -0,0 +1,69 @@
+import csv
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+# Output formats accepted by the list and filter commands. "table" is the interactive rich rendering,
+# the others are machine-readable and streamed row by row.
+OUTPUT_FORMATS = ["table", "json", "jsonl", "csv", "tsv"]
+
+
+def _json_default(value):
+    """
+    Serialize the column types JSON does not handle natively.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # Amounts have at most 12 significant digits, which a float renders exactly.
+        return float(value)
+    return str(value)
+
+
+def write_rows(rows, output_format: str, stream=None) -> int:
+    """
+    Stream rows to the output in a machine-readable format without building an intermediate list.
+
+    Args:
+        rows (iterable): Iterable of dictionaries mapping column names to values.
+        output_format (str): One of "json", "jsonl", "csv" or "tsv".
+        stream (file): Writable text stream, defaults to stdout.
+
+    Returns:
+        int: The number of rows written.
+    """
+    stream = stream or sys.stdout
+    count = 0
+
+    if output_format == "jsonl":
+        dumps = json.JSONEncoder(default=_json_default, ensure_ascii=False).encode
+        for row in rows:
+            stream.write(dumps(row))
+            stream.write("\n")
+            count += 1
+
+    elif output_format == "json":
+        # Write the array incrementally so the document is never held in memory.
+        dumps = json.JSONEncoder(default=_json_default, ensure_ascii=False).encode
+        stream.write("[")
+        for row in rows:
+            stream.write(",\n" if count else "\n")
+            stream.write(dumps(row))
+            count += 1
+        stream.write("\n]\n" if count else "]\n")
+
+    elif output_format in ("csv", "tsv"):
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.writer(stream, delimiter="\t" if output_format == "tsv" else ",", lineterminator="\n")
+                writer.writerow(row.keys())
+            writer.writerow(row.values())
+            count += 1
+
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    stream.flush()
+    return count
@@ -1,28 +1,180 @@
+from itertools import islice
 from rich.table import Table
 from rich.console import Console
 from rich.panel import Panel
 
+# A single console is shared by every table so rich only probes the terminal once.
+console = Console()
 
-def print_table(data, title="Table"):
+DEFAULT_PAGE_SIZE = 20
+
+
+def build_table(rows, title="Table", caption=None) -> Panel:
+    """
+    Build a rich panel containing the given rows as a table with colors and separative lines.
+
+    Args:
+        rows (list): List of dictionaries where keys are column names and values are row values.
+        title (str): Title of the table.
+        caption (str): Optional caption displayed under the table.
+
+    Returns:
+        Panel: The renderable panel wrapping the table.
+    """
+    table = Table(title=title, style="bold magenta", show_lines=True, caption=caption)
+    columns = list(rows[0].keys())
+
+    for column in columns:
+        table.add_column(column, style="cyan")
+
+    for row in rows:
+        table.add_row(*[f"[green]{str(row[col])}[/green]" for col in columns])
+
+    return Panel(table, title=title, border_style="bright_yellow")
+
+
+def print_table(data, title="Table", caption=None):
     """
     Print a list of dictionaries as a table with colors and separative lines.
 
     Args:
         data (list): List of dictionaries where keys are column names and values are row values.
         title (str): Title of the table.
+        caption (str): Optional caption displayed under the table.
     """
     if not data:
         print("No data available.")
         return
 
-    table = Table(title=title, style="bold magenta", show_lines=True)
-    columns = data[0].keys()
+    console.print(build_table(data, title, caption))
 
-    for column in columns:
-        table.add_column(column, style="cyan")
 
-    for row in data:
-        table.add_row(*[f"[green]{str(row[col])}[/green]" for col in columns])
+class TablePager:
+    """
+    Render rows one page at a time so only the visible page is ever formatted.
+
+    The row source is either:
+        - a callable ``fetch(offset, limit)`` returning a list of row dictionaries, which lets
+          paginated controllers run one LIMIT/OFFSET query per page, or
+        - any iterable of row dictionaries, which is consumed lazily and only as far as the
+          user navigates.
+    """
+
+    def __init__(self, source, title="Table", page_size: int = DEFAULT_PAGE_SIZE, total: int = None):
+        """
+        Args:
+            source (callable | iterable): Page fetcher or lazy iterable of row dictionaries.
+            title (str): Title of the table.
+            page_size (int): Number of rows displayed per page.
+            total (int): Total number of rows if known, used to display the page count.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        self.title = title
+        self.page_size = page_size
+        self.total = total
+        self.page = 0
+        if callable(source):
+            self._fetch = source
+            self._iterator = None
+        else:
+            self._fetch = None
+            self._iterator = iter(source)
+        self._cache = []
+        self._exhausted = False
+
+    @property
+    def page_count(self) -> int:
+        """
+        Number of pages if the total is known, otherwise None.
+        """
+        if self.total is None:
+            return None
+        return max(1, -(-self.total // self.page_size))
+
+    def _fill_cache(self, upto: int):
+        """
+        Pull rows from the lazy iterable until the cache holds at least ``upto`` rows.
+        """
+        missing = upto - len(self._cache)
+        if missing > 0 and not self._exhausted:
+            chunk = list(islice(self._iterator, missing))
+            self._cache.extend(chunk)
+            if len(chunk) < missing:
+                self._exhausted = True
+
+    def get_page(self, page: int) -> tuple:
+        """
+        Retrieve the rows of a page.
+
+        Args:
+            page (int): Zero-based page number.
+
+        Returns:
+            tuple: (rows, has_next) where rows is the list of row dictionaries of the page.
+        """
+        offset = page * self.page_size
+        if self._fetch is not None:
+            # Ask for one extra row to know whether a next page exists without a COUNT query.
+            rows = list(self._fetch(offset, self.page_size + 1))
+            return rows[: self.page_size], len(rows) > self.page_size
+
+        self._fill_cache(offset + self.page_size + 1)
+        rows = self._cache[offset : offset + self.page_size]
+        return rows, len(self._cache) > offset + self.page_size
+
+    def render(self, rows: list):
+        """
+        Print the given page rows.
+        """
+        page_count = self.page_count
+        caption = f"Page {self.page + 1}" + (f"/{page_count}" if page_count else "")
+        console.print(build_table(rows, self.title, caption))
+
+    def run(self) -> bool:
+        """
+        Display the first page and let the user navigate with next/previous/jump commands.
+
+        Returns:
+            bool: False if the source has no rows at all, otherwise True.
+        """
+        self.page = 0
+        rows, has_next = self.get_page(self.page)
+        if not rows:
+            return False
+
+        self.render(rows)
+        if not has_next:
+            return True
+
+        while True:
+            words = input("[n]ext, [p]revious, [j]ump <page>, [q]uit: ").lower().split()
+            command, arguments = (words[0], words[1:]) if words else ("", [])
+            target = self.page
+            if command in ("n", "next") and not arguments:
+                target = self.page + 1 if has_next else self.page
+            elif command in ("p", "previous", "prev") and not arguments:
+                target = max(0, self.page - 1)
+            elif command in ("j", "jump") and len(arguments) <= 1:
+                try:
+                    target = int(arguments[0] if arguments else input("Page: ").strip()) - 1
+                except ValueError:
+                    console.print("[bold red]Page must be a valid integer.[/bold red]")
+                    continue
+                if target < 0:
+                    console.print("[bold red]Page must be a positive integer.[/bold red]")
+                    continue
+            elif command in ("q", "quit", "") and not arguments:
+                return True
+            else:
+                console.print("[bold red]Invalid choice. Please try again.[/bold red]")
+                continue
 
-    console = Console()
-    console.print(Panel(table, title=title, border_style="bright_yellow"))
+            if target == self.page:
+                continue
+            target_rows, target_has_next = self.get_page(target)
+            if not target_rows:
+                console.print("[bold red]Page out of range.[/bold red]")
+                continue
+            self.page, rows, has_next = target, target_rows, target_has_next
+            self.render(rows)
@@ -0,0 +1,268 @@
+import functools
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from config import Config
+
+# Span currently open in this context, None outside of a sampled operation.
+_current_span = ContextVar("epicevents_current_span", default=None)
+
+
+class NullSink:
+    """
+    Discards everything, for offline environments or when telemetry is disabled.
+    """
+
+    records_sql = False
+
+    def start(self):
+        pass
+
+    def capture_exception(self, error: BaseException):
+        pass
+
+    def start_span(self, op: str, description: str, parent):
+        return None
+
+    def finish_span(self, span, duration: float, error: BaseException = None):
+        pass
+
+
+class FileSink:
+    """
+    Appends exceptions and spans as JSON lines to a local file, for offline environments.
+    """
+
+    records_sql = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def start(self):
+        pass
+
+    def _write(self, record: dict):
+        record["timestamp"] = datetime.now().isoformat()
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, default=str) + "\n")
+
+    def capture_exception(self, error: BaseException):
+        self._write({"type": "exception", "exception": type(error).__name__, "message": str(error)})
+
+    def start_span(self, op: str, description: str, parent):
+        return {"op": op, "description": description, "parent": parent["description"] if parent else None}
+
+    def finish_span(self, span, duration: float, error: BaseException = None):
+        self._write(
+            {
+                "type": "span",
+                **span,
+                "duration_ms": round(duration * 1000, 3),
+                "status": "internal_error" if error else "ok",
+            }
+        )
+
+
+class SentrySink:
+    """
+    Reports to Sentry. The SDK is imported and initialized by start, which the CLI calls before running
+    a command so that Sentry also reports the crashes nothing captures, or on first use otherwise.
+    SQL spans are recorded by Sentry's own SQLAlchemy integration.
+    """
+
+    records_sql = False
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._sdk = None
+
+    def start(self):
+        if self._sdk is None:
+            import sentry_sdk
+
+            # Sampling is decided by Telemetry; a rate is still required for Sentry to enable tracing.
+            sentry_sdk.init(dsn=self.dsn, traces_sample_rate=Config.TRACES_SAMPLE_RATE)
+            self._sdk = sentry_sdk
+
+    @property
+    def sdk(self):
+        self.start()
+        return self._sdk
+
+    def capture_exception(self, error: BaseException):
+        self.sdk.capture_exception(error)
+
+    def start_span(self, op: str, description: str, parent):
+        if parent is None:
+            span = self.sdk.start_transaction(op=op, name=description, sampled=True)
+        else:
+            span = parent.start_child(op=op, description=description)
+        span.__enter__()
+        return span
+
+    def finish_span(self, span, duration: float, error: BaseException = None):
+        if error is not None:
+            span.set_status("internal_error")
+        span.__exit__(None, None, None)
+
+
+class Telemetry:
+    """
+    Error reporting and performance tracing configured from Config.
+
+    - TELEMETRY_SINK selects where reports go: "sentry", "file" or "none".
+    - TRACES_SAMPLE_RATE is the share of operations traced, with the SQL they run.
+    - Expected exceptions (expired tokens, invalid input...) are only reported if CAPTURE_EXPECTED_ERRORS
+      is set, and identical ones at most once every EXPECTED_ERROR_INTERVAL seconds.
+    """
+
+    _sink = None
+    _last_expected = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_sink():
+        """
+        Returns the configured sink, creating it on first use.
+        """
+        if Telemetry._sink is None:
+            if Config.TELEMETRY_SINK == "sentry" and Config.SENTRY_DSN:
+                Telemetry._sink = SentrySink(Config.SENTRY_DSN)
+            elif Config.TELEMETRY_SINK == "file":
+                Telemetry._sink = FileSink(Config.TELEMETRY_FILE)
+            else:
+                Telemetry._sink = NullSink()
+        return Telemetry._sink
+
+    @staticmethod
+    def start():
+        """
+        Creates and starts the configured sink, before running an operation rather than at the first report.
+        """
+        try:
+            Telemetry.get_sink().start()
+        except Exception:
+            # A reporting service that cannot be reached must not prevent the command from running.
+            pass
+
+    @staticmethod
+    def set_sink(sink):
+        """
+        Replaces the sink, or resets it to the configured one when None is given.
+        """
+        Telemetry._sink = sink
+        Telemetry._last_expected = {}
+
+    @staticmethod
+    def capture_exception(error: BaseException, expected: bool = False):
+        """
+        Reports an exception according to the error capture policy.
+
+        Args:
+            error (BaseException): The exception to report.
+            expected (bool): True for exceptions that are part of the normal flow (expired token, invalid input),
+                which are deduplicated and rate-limited.
+        """
+        # The same exception object is often caught and reported again by each layer it goes through.
+        if getattr(error, "_telemetry_captured", False):
+            return
+        try:
+            error._telemetry_captured = True
+        except AttributeError:
+            pass
+
+        if expected:
+            if not Config.CAPTURE_EXPECTED_ERRORS:
+                return
+            key = (type(error).__name__, str(error))
+            now = time.monotonic()
+            with Telemetry._lock:
+                last = Telemetry._last_expected.get(key)
+                if last is not None and now - last < Config.EXPECTED_ERROR_INTERVAL:
+                    return
+                Telemetry._last_expected[key] = now
+
+        try:
+            Telemetry.get_sink().capture_exception(error)
+        except Exception:
+            # Reporting must never break the operation being reported.
+            pass
+
+    @staticmethod
+    @contextmanager
+    def span(op: str, description: str):
+        """
+        Times a block as a span. A root span is sampled with TRACES_SAMPLE_RATE; child spans are only
+        recorded inside a sampled root, so unsampled operations cost a single random draw.
+        """
+        parent = _current_span.get()
+        if parent is None and random.random() >= Config.TRACES_SAMPLE_RATE:
+            yield
+            return
+
+        sink = Telemetry.get_sink()
+        span = sink.start_span(op, description, parent[1] if parent else None)
+        token = _current_span.set((sink, span))
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            if span is not None:
+                sink.finish_span(span, time.perf_counter() - started, error)
+
+    @staticmethod
+    def traced(func):
+        """
+        Decorator wrapping a controller operation in a span named after it.
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Telemetry.span("controller", func.__qualname__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @staticmethod
+    def instrument_engine(engine):
+        """
+        Records the SQL statements run inside sampled operations as child spans, for the sinks that
+        do not instrument SQLAlchemy themselves.
+        """
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            current = _current_span.get()
+            if current is None or not current[0].records_sql:
+                return
+            sink, parent = current
+            span = sink.start_span("db", statement[:500], parent)
+            conn.info.setdefault("telemetry_spans", []).append((sink, span, time.perf_counter()))
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            spans = conn.info.get("telemetry_spans")
+            if spans:
+                sink, span, started = spans.pop()
+                sink.finish_span(span, time.perf_counter() - started)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            connection = exception_context.connection
+            spans = connection.info.get("telemetry_spans") if connection is not None else None
+            if spans:
+                sink, span, started = spans.pop()
+                sink.finish_span(span, time.perf_counter() - started, exception_context.original_exception)
+
+        return engine
@@ -2,10 +2,11 @@ import jwt
 import datetime
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError, InvalidSignatureError
 from models.user import User
-import sentry_sdk
+from utils.telemetry import Telemetry
 from utils.session_manager import get_session_root
 import keyring
 import json
+import sys
 from cryptography.fernet import Fernet
 
 SERVICE_NAME = "EpicEvents"
@@ -39,7 +40,7 @@ class TokenManager:
             token = jwt.encode(payload, secret_key, algorithm="HS256")
             return token
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             raise
 
     @staticmethod
@@ -64,7 +65,7 @@ class TokenManager:
             token = jwt.encode(payload, secret_key, algorithm="HS256")
             return token
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             raise
 
     @staticmethod
@@ -84,16 +85,16 @@ class TokenManager:
             payload = jwt.decode(token, secret_key, algorithms=["HS256"])
             return payload
         except ExpiredSignatureError as e:
-            sentry_sdk.capture_exception(e)
-            print("Token has expired")
+            Telemetry.capture_exception(e, expected=True)
+            print("Token has expired", file=sys.stderr)
             raise
         except InvalidTokenError as e:
-            sentry_sdk.capture_exception(e)
-            print("Token is invalid")
+            Telemetry.capture_exception(e, expected=True)
+            print("Token is invalid", file=sys.stderr)
             raise
         except InvalidSignatureError as e:
-            sentry_sdk.capture_exception(e)
-            print("Token signature is invalid")
+            Telemetry.capture_exception(e, expected=True)
+            print("Token signature is invalid", file=sys.stderr)
             raise
 
     @staticmethod
@@ -115,7 +116,7 @@ class TokenManager:
         except ExpiredSignatureError:
             return True
         except InvalidTokenError as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e, expected=True)
             return True
 
     @staticmethod
@@ -141,7 +142,7 @@ class TokenManager:
             if user:
                 # Check if the refresh token is expired
                 if TokenManager.is_token_expired(refresh_token, key):
-                    print("Refresh token has expired")
+                    print("Refresh token has expired", file=sys.stderr)
                     raise InvalidTokenError("Refresh token has expired.")
 
                 # Generate a new token
@@ -150,8 +151,8 @@ class TokenManager:
             else:
                 raise InvalidTokenError("User not found.")
         except Exception as e:
-            sentry_sdk.capture_exception(e)
-            print(f"Failed to refresh token for user_id {user_id} with error: {e}")
+            Telemetry.capture_exception(e)
+            print(f"Failed to refresh token for user_id {user_id} with error: {e}", file=sys.stderr)
             raise
 
     @staticmethod
@@ -179,7 +180,7 @@ class TokenManager:
 
             print(f"Saved tokens for {username}")
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             raise
 
     @staticmethod
@@ -205,12 +206,13 @@ class TokenManager:
                 tokens = json.loads(decrypted_tokens)
                 tokens["key"] = key
 
-                print(f"Loaded tokens for {username}")
+                # Written to stderr so that streamed command output on stdout stays machine-readable.
+                print(f"Loaded tokens for {username}", file=sys.stderr)
                 return tokens
 
             return None
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             raise
 
     @staticmethod
@@ -227,7 +229,7 @@ class TokenManager:
             keyring.delete_password(SERVICE_NAME, "current_user")
             print(f"Deleted tokens for {username}")
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            Telemetry.capture_exception(e)
             raise
 
     @staticmethod
@@ -0,0 +1,66 @@
+import click
+from views.command_helpers import print_result
+from views.telemetry_command import TelemetryGroup
+
+# Kept in sync with utils.backup_manager, which is only imported when a command runs.
+BACKUP_FORMATS = ["jsonl", "csv"]
+
+
+@click.group(cls=TelemetryGroup)
+def backup():
+    """Export and restore the database."""
+    pass
+
+
+@backup.command(name="export")
+@click.argument("directory", type=click.Path(file_okay=False))
+@click.option("--format", "output_format", type=click.Choice(BACKUP_FORMATS), default="jsonl", show_default=True)
+@click.option(
+    "--rows-per-file",
+    type=click.IntRange(min=1),
+    default=100000,
+    show_default=True,
+    help="Maximum number of rows per compressed file.",
+)
+def export_database(directory, output_format, rows_per_file):
+    """
+    Export every table to gzip-compressed files and a manifest in DIRECTORY.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.export_database(directory, output_format, rows_per_file))
+
+
+@backup.command(name="changes")
+@click.argument("directory", type=click.Path(file_okay=False))
+@click.option("--format", "output_format", type=click.Choice(BACKUP_FORMATS), default="jsonl", show_default=True)
+@click.option(
+    "--lag-seconds",
+    type=click.IntRange(min=1),
+    default=60,
+    show_default=True,
+    help="Delay before a modification is exported, so that transactions still running are not skipped.",
+)
+def export_changes(directory, output_format, lag_seconds):
+    """
+    Export the clients, contracts and events created or modified since the previous run into a new
+    change set in DIRECTORY, which keeps the watermark between runs.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.export_changes(directory, output_format, lag_seconds))
+
+
+@backup.command(name="restore")
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--workers", type=click.IntRange(min=1), default=4, show_default=True, help="Number of tables loaded at a time."
+)
+@click.confirmation_option(prompt="This replaces the content of the database with the backup. Continue?")
+def restore_database(directory, workers):
+    """
+    Replace the content of the database with the backup in DIRECTORY.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.restore_database(directory, workers))
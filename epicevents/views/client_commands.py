@@ -0,0 +1,157 @@
+import click
+from utils.data_validator import DataValidator
+from views.command_helpers import (
+    chunk_size_option,
+    console,
+    format_option,
+    output_rows,
+    print_result,
+    rejects_option,
+    validated,
+)
+from views.telemetry_command import TelemetryGroup
+
+
+@click.group(cls=TelemetryGroup)
+def client():
+    """Manage clients."""
+    pass
+
+
+@client.command(name="list")
+@format_option
+def list_clients(output_format):
+    """
+    List all clients.
+    """
+    from controllers.main_controller import MainController
+    from views.client_views import client_to_row
+
+    output_rows(
+        MainController.get_clients(stream=True),
+        output_format,
+        client_to_row,
+        "Clients",
+        "No clients found or you are not authorized to view them.",
+    )
+
+
+@client.command(name="create")
+@click.option("--full-name", required=True, callback=validated(DataValidator.check_string, "Full Name"))
+@click.option("--email", required=True, callback=validated(DataValidator.check_email))
+@click.option("--phone", required=True, callback=validated(DataValidator.check_phone))
+@click.option("--company-name", required=True, callback=validated(DataValidator.check_string, "Company Name"))
+def create_client(full_name, email, phone, company_name):
+    """
+    Create a client assigned to the logged-in commercial.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.create_client(full_name, email, phone, company_name))
+
+
+@client.command(name="update")
+@click.argument("client_id", type=int, callback=validated(DataValidator.check_id, "Client ID"))
+@click.option("--full-name", callback=validated(DataValidator.check_string, "Full Name"))
+@click.option("--email", callback=validated(DataValidator.check_email))
+@click.option("--phone", callback=validated(DataValidator.check_phone))
+@click.option("--company-name", callback=validated(DataValidator.check_string, "Company Name"))
+def update_client(client_id, full_name, email, phone, company_name):
+    """
+    Update a client of the logged-in commercial. Omitted options are left unchanged.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.update_client(client_id, full_name, email, phone, company_name))
+
+
+@client.command(name="show")
+@click.argument("client")
+def show_client(client):
+    """
+    Show a client, given by ID or full name, with its commercial contact, contracts and events.
+    """
+    from controllers.main_controller import MainController
+    from utils.table_printer import print_table
+
+    if client.isdigit():
+        detail = MainController.get_client_detail(client_id=int(client))
+    else:
+        detail = MainController.get_client_detail(full_name=client)
+    if detail is None:
+        console.print(f"[bold red]Client '{client}' not found or you are not authorized to view it.[/bold red]")
+        raise click.exceptions.Exit(1)
+
+    commercial = detail.commercial_contact
+    print_table(
+        [
+            {
+                "Client ID": detail.id,
+                "Full Name": detail.full_name,
+                "Email": detail.email,
+                "Phone": detail.phone,
+                "Company Name": detail.company_name,
+                "Date Created": detail.date_created,
+                "Last Contact Date": detail.last_contact_date,
+                "Commercial Contact": f"{commercial.name} ({commercial.id})" if commercial else "None",
+            }
+        ],
+        title="Client",
+    )
+
+    contracts = sorted(detail.contracts, key=lambda contract: contract.id)
+    if contracts:
+        rows = [
+            {
+                "Contract ID": contract.id,
+                "Total Amount": f"{contract.total_amount:,.2f}",
+                "Amount Due": f"{contract.amount_due:,.2f}",
+                "Date Created": contract.date_created,
+                "Signed": contract.signed,
+            }
+            for contract in contracts
+        ]
+        signed = sum(1 for contract in contracts if contract.signed)
+        caption = (
+            f"{len(contracts)} contracts, {signed} signed. "
+            f"Total {sum(contract.total_amount for contract in contracts):,.2f}, "
+            f"due {sum(contract.amount_due for contract in contracts):,.2f}."
+        )
+        print_table(rows, title="Contracts", caption=caption)
+    else:
+        print("No contracts.")
+
+    events = sorted(detail.events, key=lambda event: (event.event_date_start, event.id))
+    if events:
+        rows = [
+            {
+                "Event ID": event.id,
+                "Contract ID": event.contract_id,
+                "Event Name": event.event_name,
+                "Start Date": event.event_date_start,
+                "End Date": event.event_date_end,
+                "Support Contact": (
+                    f"{event.support_contact.name} ({event.support_contact.id})" if event.support_contact else "None"
+                ),
+                "Location": event.location,
+                "Attendees": event.attendees,
+            }
+            for event in events
+        ]
+        print_table(rows, title="Events")
+    else:
+        print("No events.")
+
+
+@client.command(name="import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@chunk_size_option
+@rejects_option
+def import_clients(path, chunk_size, reject_path):
+    """
+    Import clients from a CSV file with the columns full_name, email, phone and company_name.
+    The clients are assigned to the logged-in commercial.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.import_clients(path, chunk_size, reject_path))
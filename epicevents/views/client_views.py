@@ -1,7 +1,7 @@
 from rich.console import Console
 from controllers.main_controller import MainController
 from controllers.client_controller import ClientController
-from utils.table_printer import print_table
+from utils.table_printer import TablePager
 from utils.data_validator import DataValidator
 
 console = Console()
@@ -75,26 +75,29 @@ def update_client():
     )
 
 
+def client_to_row(client) -> dict:
+    """
+    Convert a Client object into a table row.
+    """
+    return {
+        "Client ID": client.id,
+        "Full Name": client.full_name,
+        "Email": client.email,
+        "Phone": client.phone,
+        "Company Name": client.company_name,
+        "Date Created": client.date_created,
+        "Last Contact Date": client.last_contact_date,
+        "Commercial Contact ID": client.commercial_contact_id,
+    }
+
+
 def get_clients():
     """
-    Retrieve and display all clients if the user is authenticated and authorized.
+    Retrieve and display all clients page by page if the user is authenticated and authorized.
     """
-    clients = MainController.get_clients()
-    if clients:
-        client_data = [
-            {
-                "Client ID": client.id,
-                "Full Name": client.full_name,
-                "Email": client.email,
-                "Phone": client.phone,
-                "Company Name": client.company_name,
-                "Date Created": client.date_created,
-                "Last Contact Date": client.last_contact_date,
-                "Commercial Contact ID": client.commercial_contact_id,
-            }
-            for client in clients
-        ]
-
-        print_table(client_data, title="Clients")
-    else:
+    pager = TablePager(
+        lambda offset, limit: [client_to_row(client) for client in MainController.get_clients(offset, limit)],
+        title="Clients",
+    )
+    if not pager.run():
         console.print("[bold red]No clients found or you are not authorized to view them.[/bold red]")
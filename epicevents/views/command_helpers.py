@@ -0,0 +1,93 @@
+import click
+from rich.console import Console
+from utils.bulk_import import DEFAULT_CHUNK_SIZE
+from utils.stream_writer import OUTPUT_FORMATS, write_rows
+from utils.table_printer import TablePager
+
+# Command feedback goes to stderr so that machine-readable output on stdout can be piped.
+console = Console(stderr=True)
+
+format_option = click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default="table",
+    show_default=True,
+    help="Output format. Every format except 'table' is streamed to stdout without rich formatting.",
+)
+
+chunk_size_option = click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="Number of rows validated and inserted at a time.",
+)
+
+rejects_option = click.option(
+    "--rejects",
+    "reject_path",
+    type=click.Path(dir_okay=False),
+    help="CSV file receiving the rejected rows with the reason of the rejection.",
+)
+
+checkpoint_option = click.option(
+    "--checkpoint",
+    "checkpoint_name",
+    help="Name under which the progress of the import is saved in the database, to resume it after an "
+    "interruption. [default: absolute path of PATH]",
+)
+
+
+def output_rows(rows, output_format: str, to_row, title: str, empty_message: str):
+    """
+    Display rows coming from a controller query in the requested format.
+
+    Args:
+        rows (iterable): Rows streamed from the controller.
+        output_format (str): One of OUTPUT_FORMATS.
+        to_row (callable): Converts a row into the dictionary displayed by the rich table.
+        title (str): Title of the rich table.
+        empty_message (str): Message displayed when there is no row to display.
+    """
+    if output_format == "table":
+        if not TablePager((to_row(row) for row in rows), title=title).run():
+            console.print(f"[bold red]{empty_message}[/bold red]")
+        return
+
+    count = write_rows((row._asdict() for row in rows), output_format)
+    if not count:
+        console.print(f"[bold red]{empty_message}[/bold red]")
+
+
+def validated(check, field_name: str = None, **kwargs):
+    """
+    Build a click callback applying a DataValidator check, so options follow the same rules as the prompts.
+
+    Args:
+        check (callable): DataValidator ``check_*`` method returning an error message or None.
+        field_name (str): Field name used in the error message, for the checks that take one.
+        **kwargs: Extra arguments passed to the check.
+    """
+
+    def callback(ctx, param, value):
+        if value is None:
+            return value
+        args = (str(value), field_name) if field_name else (str(value),)
+        error = check(*args, **kwargs)
+        if error:
+            raise click.BadParameter(error)
+        return value
+
+    return callback
+
+
+def print_result(message: str):
+    """
+    Print the result message of a controller operation and exit with a non-zero status if it failed.
+    """
+    if "successfully" in message:
+        console.print(f"[bold green]{message}[/bold green]")
+    else:
+        console.print(f"[bold red]{message}[/bold red]")
+        raise click.exceptions.Exit(1)
@@ -0,0 +1,181 @@
+import os
+import click
+from utils.data_validator import DataValidator
+from utils.money import to_money
+from views.command_helpers import (
+    checkpoint_option,
+    chunk_size_option,
+    console,
+    format_option,
+    output_rows,
+    print_result,
+    rejects_option,
+    validated,
+)
+from views.telemetry_command import TelemetryGroup
+
+
+@click.group(cls=TelemetryGroup)
+def contract():
+    """Manage contracts."""
+    pass
+
+
+@contract.command(name="list")
+@format_option
+def list_contracts(output_format):
+    """
+    List all contracts.
+    """
+    from controllers.main_controller import MainController
+    from views.contract_views import contract_to_row
+
+    output_rows(
+        MainController.get_contracts(stream=True),
+        output_format,
+        contract_to_row,
+        "Contracts",
+        "No contracts found or you are not authorized to view them.",
+    )
+
+
+@contract.command(name="filter")
+@click.option("--unsigned", is_flag=True, help="Only contracts that are not signed yet.")
+@click.option("--unpaid", is_flag=True, help="Only contracts with an amount due.")
+@format_option
+def filter_contracts(unsigned, unpaid, output_format):
+    """
+    Filter contracts.
+    """
+    from controllers.main_controller import MainController
+    from views.contract_views import contract_to_row
+
+    filters = {}
+    if unsigned:
+        filters["signed"] = False
+    if unpaid:
+        filters["unpaid"] = True
+
+    try:
+        contracts = MainController.filter_contracts(filters, stream=True)
+    except PermissionError as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        return
+
+    output_rows(
+        contracts, output_format, contract_to_row, "Filtered Contracts", "No contracts found matching the criteria."
+    )
+
+
+@contract.command(name="create")
+@click.option("--client", "client_name", help="Full name of the client.")
+@click.option("--client-id", type=int, callback=validated(DataValidator.check_id, "Client ID"), help="ID of the client.")
+@click.option("--total-amount", required=True, callback=validated(DataValidator.check_float, "Total Amount"))
+@click.option(
+    "--amount-due",
+    required=True,
+    callback=validated(DataValidator.check_float, "Amount Due", positive=False, allow_zero=True),
+)
+@click.option("--signed/--unsigned", default=False, show_default=True)
+def create_contract(client_name, client_id, total_amount, amount_due, signed):
+    """
+    Create a contract for a client, given by name or by ID.
+    """
+    from controllers.main_controller import MainController
+    from controllers.client_controller import ClientController
+
+    if client_id is None:
+        if not client_name:
+            raise click.UsageError("Either --client or --client-id is required.")
+        client_id = ClientController.get_client_id_by_name(client_name)
+        if not client_id:
+            console.print("[bold red]Client not found.[/bold red]")
+            raise click.exceptions.Exit(1)
+
+    print_result(
+        MainController.create_contract(int(client_id), to_money(total_amount), to_money(amount_due), signed)
+    )
+
+
+@contract.command(name="update")
+@click.argument("contract_id", type=int, callback=validated(DataValidator.check_id, "Contract ID"))
+@click.option("--client-id", type=int, callback=validated(DataValidator.check_id, "Client ID"))
+@click.option("--total-amount", callback=validated(DataValidator.check_float, "Total Amount"))
+@click.option("--amount-due", callback=validated(DataValidator.check_float, "Amount Due", positive=False))
+@click.option("--signed/--unsigned", default=None, help="Change the signature status.")
+def update_contract(contract_id, client_id, total_amount, amount_due, signed):
+    """
+    Update a contract. Omitted options are left unchanged.
+    """
+    from controllers.main_controller import MainController
+
+    update_data = {}
+    if client_id:
+        update_data["client_id"] = client_id
+    if total_amount:
+        update_data["total_amount"] = to_money(total_amount)
+    if amount_due:
+        update_data["amount_due"] = to_money(amount_due)
+    if signed is not None:
+        update_data["signed"] = signed
+
+    print_result(MainController.update_contract(contract_id, **update_data))
+
+
+contract_ids_argument = click.argument("contract_ids", nargs=-1, required=True, type=click.IntRange(min=1))
+
+
+@contract.command(name="sign")
+@contract_ids_argument
+def sign_contracts(contract_ids):
+    """
+    Mark contracts as signed. Commercials can only sign their own contracts.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.sign_contracts(list(contract_ids)))
+
+
+@contract.command(name="settle")
+@contract_ids_argument
+def settle_contracts(contract_ids):
+    """
+    Set the amount due of contracts to 0 once they are paid.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.settle_contracts(list(contract_ids)))
+
+
+@contract.command(name="adjust")
+@contract_ids_argument
+@click.option(
+    "--percent",
+    type=click.FloatRange(min=-100, min_open=True),
+    required=True,
+    help="Adjustment of the total amount and amount due, e.g. 5 or -10.",
+)
+def adjust_contracts(contract_ids, percent):
+    """
+    Apply a percentage adjustment to the amounts of contracts.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.adjust_contracts(list(contract_ids), percent))
+
+
+@contract.command(name="import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@chunk_size_option
+@rejects_option
+@checkpoint_option
+def import_contracts(path, chunk_size, reject_path, checkpoint_name):
+    """
+    Import contracts from a CSV file with the columns client_id, total_amount, amount_due and signed.
+    Each contract is assigned to the commercial contact of its client. Running the command again after an
+    interruption resumes the import after the last committed chunk.
+    """
+    from controllers.main_controller import MainController
+
+    checkpoint_name = checkpoint_name or os.path.abspath(path)
+    print_result(MainController.import_contracts(path, chunk_size, reject_path, checkpoint_name))
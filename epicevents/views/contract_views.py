@@ -1,8 +1,9 @@
 from rich.console import Console
 from controllers.main_controller import MainController
 from controllers.client_controller import ClientController
-from utils.table_printer import print_table
+from utils.table_printer import TablePager
 from utils.data_validator import DataValidator
+from utils.money import to_money
 
 console = Console()
 
@@ -32,7 +33,9 @@ def create_contract():
             == "true"
         )
 
-        result_message = MainController.create_contract(int(client_id), float(total_amount), float(amount_due), signed)
+        result_message = MainController.create_contract(
+            int(client_id), to_money(total_amount), to_money(amount_due), signed
+        )
         console.print(
             f"[bold green]{result_message}[/bold green]"
             if "successfully" in result_message
@@ -72,9 +75,9 @@ def update_contract():
         if client_id:
             update_data["client_id"] = int(client_id)
         if total_amount:
-            update_data["total_amount"] = float(total_amount)
+            update_data["total_amount"] = to_money(total_amount)
         if amount_due:
-            update_data["amount_due"] = float(amount_due)
+            update_data["amount_due"] = to_money(amount_due)
         if signed is not None:
             update_data["signed"] = signed
 
@@ -90,27 +93,30 @@ def update_contract():
         console.print(f"[bold red]Error: {e}[/bold red]")
 
 
+def contract_to_row(contract) -> dict:
+    """
+    Convert a Contract object into a table row.
+    """
+    return {
+        "Contract ID": contract.id,
+        "Client ID": contract.client_id,
+        "Commercial Contact ID": contract.commercial_contact_id,
+        "Total Amount": contract.total_amount,
+        "Amount Due": contract.amount_due,
+        "Date Created": contract.date_created,
+        "Signed": contract.signed,
+    }
+
+
 def get_contracts():
     """
-    Retrieve and display all contracts if the user is authenticated and authorized.
+    Retrieve and display all contracts page by page if the user is authenticated and authorized.
     """
-    contracts = MainController.get_contracts()
-    if contracts:
-        contract_data = [
-            {
-                "Contract ID": contract.id,
-                "Client ID": contract.client_id,
-                "Commercial Contact ID": contract.commercial_contact_id,
-                "Total Amount": contract.total_amount,
-                "Amount Due": contract.amount_due,
-                "Date Created": contract.date_created,
-                "Signed": contract.signed,
-            }
-            for contract in contracts
-        ]
-
-        print_table(contract_data, title="Contracts")
-    else:
+    pager = TablePager(
+        lambda offset, limit: [contract_to_row(contract) for contract in MainController.get_contracts(offset, limit)],
+        title="Contracts",
+    )
+    if not pager.run():
         console.print("[bold red]No contracts found or you are not authorized to view them.[/bold red]")
 
 
@@ -131,18 +137,16 @@ def filter_contracts():
         return
 
     contracts = MainController.filter_contracts(filters)
-    if contracts:
-        contract_data = [
-            {
-                "Contract ID": contract.id,
-                "Client ID": contract.client_id,
-                "Total Amount": contract.total_amount,
-                "Amount Due": contract.amount_due,
-                "Signed": contract.signed,
-            }
-            for contract in contracts
-        ]
-
-        print_table(contract_data, title="Filtered Contracts")
-    else:
+    contract_data = (
+        {
+            "Contract ID": contract.id,
+            "Client ID": contract.client_id,
+            "Total Amount": contract.total_amount,
+            "Amount Due": contract.amount_due,
+            "Signed": contract.signed,
+        }
+        for contract in contracts
+    )
+
+    if not TablePager(contract_data, title="Filtered Contracts").run():
         console.print("[bold red]No contracts found matching the criteria.[/bold red]")
@@ -0,0 +1,275 @@
+import sys
+import click
+from utils.data_validator import DataValidator
+from views.command_helpers import (
+    chunk_size_option,
+    console,
+    format_option,
+    output_rows,
+    print_result,
+    rejects_option,
+    validated,
+)
+from views.telemetry_command import TelemetryGroup
+
+
+def conflict_to_row(conflict) -> dict:
+    """
+    Convert an EventConflict into a table row.
+    """
+    return {
+        "Support Contact ID": conflict.support_contact_id,
+        "Event ID": conflict.event_id,
+        "Conflicting Event ID": conflict.conflicting_event_id,
+        "Overlap Start": conflict.overlap_start,
+        "Overlap End": conflict.overlap_end,
+    }
+
+
+@click.group(cls=TelemetryGroup)
+def event():
+    """Manage events."""
+    pass
+
+
+@event.command(name="list")
+@format_option
+def list_events(output_format):
+    """
+    List all events.
+    """
+    from controllers.main_controller import MainController
+    from views.event_views import event_to_row
+
+    output_rows(
+        MainController.get_events(stream=True),
+        output_format,
+        event_to_row,
+        "Events",
+        "No events found or you are not authorized to view them.",
+    )
+
+
+@event.command(name="filter")
+@click.option("--no-support", is_flag=True, help="Only events without a support contact.")
+@click.option("--client", "client_name", help="Only events of the client with this full name.")
+@click.option("--date-start", type=click.DateTime(formats=["%Y-%m-%d"]), help="Events starting on or after this date.")
+@click.option("--date-end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Events ending on or before this date.")
+@click.option("--location", help="Only events at this location.")
+@click.option("--min-attendees", type=click.IntRange(min=0), help="Minimum number of attendees.")
+@click.option("--max-attendees", type=click.IntRange(min=0), help="Maximum number of attendees.")
+@format_option
+def filter_events(no_support, client_name, date_start, date_end, location, min_attendees, max_attendees, output_format):
+    """
+    Filter events. Support users only see the events assigned to them.
+    """
+    from controllers.main_controller import MainController
+    from controllers.client_controller import ClientController
+    from views.event_views import event_to_row
+
+    filters = {}
+    if no_support:
+        filters["no_support"] = True
+    if client_name:
+        client_id = ClientController.get_client_id_by_name(client_name)
+        if not client_id:
+            console.print(f"[bold red]Client '{client_name}' not found.[/bold red]")
+            return
+        filters["client_id"] = client_id
+    if date_start:
+        filters["date_start"] = date_start.date()
+    if date_end:
+        filters["date_end"] = date_end.date()
+    if location:
+        filters["location"] = location
+    if min_attendees is not None:
+        filters["min_attendees"] = min_attendees
+    if max_attendees is not None:
+        filters["max_attendees"] = max_attendees
+
+    output_rows(
+        MainController.filter_events(filters, stream=True),
+        output_format,
+        event_to_row,
+        "Filtered Events",
+        "No events found matching the criteria or you are not authorized to view them.",
+    )
+
+
+@event.command(name="create")
+@click.option("--contract-id", required=True, type=int, callback=validated(DataValidator.check_id, "Contract ID"))
+@click.option("--name", "event_name", required=True, callback=validated(DataValidator.check_string, "Event Name"))
+@click.option(
+    "--start",
+    "event_date_start",
+    required=True,
+    callback=validated(DataValidator.check_datetime, "Event Date Start"),
+    help="YYYY-MM-DD HH:MM:SS",
+)
+@click.option("--end", "event_date_end", required=True, help="YYYY-MM-DD HH:MM:SS")
+@click.option("--location", required=True, callback=validated(DataValidator.check_string, "Location"))
+@click.option("--attendees", required=True, type=int, callback=validated(DataValidator.check_attendees, "Attendees"))
+@click.option("--notes", default="")
+def create_event(contract_id, event_name, event_date_start, event_date_end, location, attendees, notes):
+    """
+    Create an event for a signed contract of the logged-in commercial.
+    """
+    from controllers.main_controller import MainController
+
+    error = DataValidator.check_datetime(event_date_end, "Event Date End", start_datetime=event_date_start)
+    if error:
+        raise click.BadParameter(error, param_hint="'--end'")
+
+    print_result(
+        MainController.create_event(
+            contract_id, event_name, event_date_start, event_date_end, location, attendees, notes.strip()
+        )
+    )
+
+
+@event.command(name="update")
+@click.argument("event_id", type=int, callback=validated(DataValidator.check_id, "Event ID"))
+@click.option("--support-contact", "support_contact_name", help="Name of the support contact (Gestion only).")
+@click.option("--contract-id", type=int, callback=validated(DataValidator.check_id, "Contract ID"))
+@click.option("--client-id", type=int, callback=validated(DataValidator.check_id, "Client ID"))
+@click.option("--name", "event_name", callback=validated(DataValidator.check_string, "Event Name"))
+@click.option("--start", "event_date_start", help="YYYY-MM-DD HH:MM:SS")
+@click.option("--end", "event_date_end", help="YYYY-MM-DD HH:MM:SS")
+@click.option("--location", callback=validated(DataValidator.check_string, "Location"))
+@click.option("--attendees", type=int, callback=validated(DataValidator.check_attendees, "Attendees"))
+@click.option("--notes")
+def update_event(
+    event_id,
+    support_contact_name,
+    contract_id,
+    client_id,
+    event_name,
+    event_date_start,
+    event_date_end,
+    location,
+    attendees,
+    notes,
+):
+    """
+    Update an event. Gestion assigns the support contact, Support updates the events assigned to them.
+    """
+    from controllers.main_controller import MainController
+    from views.event_views import resolve_support_contact
+
+    if event_date_start:
+        error = DataValidator.check_datetime(event_date_start, "Event Date Start")
+        if error:
+            raise click.BadParameter(error, param_hint="'--start'")
+    if event_date_end:
+        error = DataValidator.check_datetime(event_date_end, "Event Date End", start_datetime=event_date_start)
+        if error:
+            raise click.BadParameter(error, param_hint="'--end'")
+
+    support_contact_id = None
+    if support_contact_name:
+        support_contact_id, error = resolve_support_contact(support_contact_name)
+        if error:
+            console.print(f"[bold red]{error}[/bold red]")
+            raise click.exceptions.Exit(1)
+
+    print_result(
+        MainController.update_event(
+            event_id,
+            contract_id,
+            client_id,
+            event_name,
+            event_date_start,
+            event_date_end,
+            support_contact_id,
+            location,
+            attendees,
+            notes,
+        )
+    )
+
+
+@event.command(name="archive")
+@click.option(
+    "--older-than-days",
+    type=click.IntRange(min=0),
+    help="Archive the events that ended more than this many days ago. [default: EVENT_ARCHIVE_AFTER_DAYS or 365]",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of events moved per transaction.",
+)
+def archive_events(older_than_days, chunk_size):
+    """
+    Move past events to the archive table. Filters with a date range still find them.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.archive_events(older_than_days, chunk_size))
+
+
+@event.command(name="auto-assign")
+def auto_assign_events():
+    """
+    Assign the upcoming events without a support contact. The hours of upcoming events are balanced between
+    the support contacts, and none of them gets two overlapping events.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.auto_assign_events())
+
+
+@event.command(name="conflicts")
+@format_option
+def event_conflicts(output_format):
+    """
+    List the events overlapping another event of the same support contact.
+    """
+    from controllers.main_controller import MainController
+
+    output_rows(
+        MainController.find_event_conflicts(),
+        output_format,
+        conflict_to_row,
+        "Support Scheduling Conflicts",
+        "No conflicts found or you are not authorized to view them.",
+    )
+
+
+@event.command(name="calendar")
+@click.option("--support-contact-id", type=click.IntRange(min=1), help="Export the events of this support contact.")
+@click.option("--client-id", type=click.IntRange(min=1), help="Export the events of this client.")
+@click.option("--output", "path", type=click.Path(dir_okay=False), help="Calendar file to write. [default: stdout]")
+@click.option(
+    "--incremental", is_flag=True, help="Only regenerate the events modified since the previous export to --output."
+)
+def export_calendar(support_contact_id, client_id, path, incremental):
+    """
+    Export events as an iCalendar (.ics) feed, by default those assigned to the logged-in support contact.
+    """
+    from controllers.main_controller import MainController
+
+    if support_contact_id and client_id:
+        raise click.UsageError("Use either --support-contact-id or --client-id.")
+    if incremental and not path:
+        raise click.UsageError("--incremental needs the calendar file given by --output.")
+    print_result(
+        MainController.export_calendar(support_contact_id, client_id, path, None if path else sys.stdout, incremental)
+    )
+
+
+@event.command(name="import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@chunk_size_option
+@rejects_option
+def import_events(path, chunk_size, reject_path):
+    """
+    Import events from a CSV file with the columns contract_id, event_name, event_date_start, event_date_end,
+    location, attendees and, optionally, notes. The contracts must be signed contracts of the logged-in
+    commercial.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.import_events(path, chunk_size, reject_path))
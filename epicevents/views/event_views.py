@@ -4,40 +4,60 @@ from controllers.client_controller import ClientController
 from controllers.user_controller import UserController
 from controllers.contract_controller import ContractController
 from controllers.event_controller import EventController
-from utils.table_printer import print_table
+from utils.table_printer import TablePager
 from utils.data_validator import DataValidator
 
 
 console = Console()
 
 
+def event_to_row(event) -> dict:
+    """
+    Convert an Event object into a table row.
+    """
+    return {
+        "Event ID": event.id,
+        "Contract ID": event.contract_id,
+        "Client ID": event.client_id,
+        "Event Name": event.event_name,
+        "Start Date": event.event_date_start,
+        "End Date": event.event_date_end,
+        "Support Contact ID": event.support_contact_id if event.support_contact_id else "None",
+        "Location": event.location,
+        "Attendees": event.attendees,
+        "Notes": event.notes,
+    }
+
+
 def get_events():
     """
-    Retrieve and display all events if the user is authenticated and authorized.
+    Retrieve and display all events page by page if the user is authenticated and authorized.
     """
-    events = MainController.get_events()
-    if events:
-        event_data = [
-            {
-                "Event ID": event.id,
-                "Contract ID": event.contract_id,
-                "Client ID": event.client_id,
-                "Event Name": event.event_name,
-                "Start Date": event.event_date_start,
-                "End Date": event.event_date_end,
-                "Support Contact ID": event.support_contact_id if event.support_contact_id else "None",
-                "Location": event.location,
-                "Attendees": event.attendees,
-                "Notes": event.notes,
-            }
-            for event in events
-        ]
-
-        print_table(event_data, title="Events")
-    else:
+    pager = TablePager(
+        lambda offset, limit: [event_to_row(event) for event in MainController.get_events(offset, limit)],
+        title="Events",
+    )
+    if not pager.run():
         console.print("[bold red]No events found or you are not authorized to view them.[/bold red]")
 
 
+def resolve_support_contact(support_contact_name: str) -> tuple:
+    """
+    Resolve a support contact name into a user ID, checking that the user belongs to the Support department.
+    Returns:
+        tuple: (support_contact_id, None) if the support contact is valid, otherwise (None, error message).
+    """
+    support_contact_id = UserController.get_user_id_by_name(support_contact_name)
+    support_user = UserController.get_user_by_id(support_contact_id) if support_contact_id is not None else None
+    if support_user is None:
+        return None, f"Support Contact '{support_contact_name}' not found."
+
+    if MainController.get_user_role(support_user.username) != "Support":
+        return None, f"User '{support_contact_name}' is not in the Support department."
+
+    return support_contact_id, None
+
+
 def create_event_commercial():
     """
     Prompt the user for details to create a new event for commercial users.
@@ -163,19 +183,9 @@ def update_event():
         support_contact_name = DataValidator.prompt_and_validate(
             "Support Contact Name: ", DataValidator.validate_string, "Support Contact Name"
         )
-        support_contact_id = UserController.get_user_id_by_name(support_contact_name)
-        if support_contact_id is None:
-            console.print(f"[bold red]Support Contact '{support_contact_name}' not found.[/bold red]")
-            return
-
-        support_user = UserController.get_user_by_id(support_contact_id)
-        if support_user is None:
-            console.print(f"[bold red]Support Contact '{support_contact_name}' not found.[/bold red]")
-            return
-
-        support_user_role = MainController.get_user_role(support_user.username)
-        if support_user_role != "Support":
-            console.print(f"[bold red]User '{support_contact_name}' is not in the Support department.[/bold red]")
+        support_contact_id, error = resolve_support_contact(support_contact_name)
+        if error:
+            console.print(f"[bold red]{error}[/bold red]")
             return
 
         update_data["support_contact_id"] = int(support_contact_id)
@@ -274,25 +284,9 @@ def filter_events():
             continue
 
         events = MainController.filter_events(filters)
-        if events:
-            event_data = [
-                {
-                    "Event ID": event.id,
-                    "Contract ID": event.contract_id,
-                    "Client ID": event.client_id,
-                    "Event Name": event.event_name,
-                    "Start Date": event.event_date_start,
-                    "End Date": event.event_date_end,
-                    "Support Contact ID": event.support_contact_id if event.support_contact_id else "None",
-                    "Location": event.location,
-                    "Attendees": event.attendees,
-                    "Notes": event.notes,
-                }
-                for event in events
-            ]
-
-            print_table(event_data, title="Filtered Events")
-        else:
+        event_data = (event_to_row(event) for event in events)
+
+        if not TablePager(event_data, title="Filtered Events").run():
             console.print(
                 "[bold red]No events found matching the criteria or you are not authorized to view them.[/bold red]"
             )
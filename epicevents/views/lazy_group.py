@@ -0,0 +1,51 @@
+import importlib
+import click
+from views.telemetry_command import TelemetryGroup
+
+
+class LazyGroup(TelemetryGroup):
+    """
+    Click group importing its subcommands only when they are invoked.
+
+    Subcommands are declared as ``{name: ("module.path:attribute", "Short help.")}`` so that
+    ``--help`` can list them without importing the views, controllers and models behind them. Its commands
+    start error reporting before running, see TelemetryGroup.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx) -> list:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        """
+        Import the subcommand and cache it as a regular command of the group.
+        """
+        import_path, _ = self.lazy_subcommands.pop(cmd_name)
+        module_name, attribute = import_path.split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        self.add_command(command, cmd_name)
+        return command
+
+    def format_commands(self, ctx, formatter):
+        """
+        List the subcommands using the declared short help of the lazy ones instead of importing them.
+        """
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_subcommands:
+                rows.append((name, self.lazy_subcommands[name][1]))
+            else:
+                command = super().get_command(ctx, name)
+                if command is not None and not command.hidden:
+                    rows.append((name, command.get_short_help_str(formatter.width - 6 - len(name))))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
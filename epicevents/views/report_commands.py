@@ -0,0 +1,254 @@
+import click
+from utils.table_printer import print_table
+from views.command_helpers import console, format_option, output_rows, print_result
+from views.telemetry_command import TelemetryGroup
+
+# Kept in sync with controllers.report_controller, which is only imported when a command runs.
+REVENUE_GROUPINGS = ["commercial", "month"]
+AGING_GROUPINGS = ["client", "commercial"]
+# Kept in sync with utils.analytics, which imports NumPy.
+SLICE_GROUPINGS = ["month", "commercial", "signed", "attendees"]
+
+
+def revenue_to_row(row) -> dict:
+    """
+    Convert a CommercialRevenue or MonthlyRevenue row into a table row.
+    """
+    if hasattr(row, "month"):
+        columns = {"Month": row.month}
+    else:
+        columns = {"Commercial ID": row.commercial_contact_id or "None", "Commercial": row.commercial_name or ""}
+    columns.update(
+        {
+            "Contracts": row.contracts,
+            "Signed": row.signed_contracts,
+            "Signed Ratio": f"{row.signed_ratio:.1%}",
+            "Total Amount": f"{row.total_amount:,.2f}",
+            "Signed Amount": f"{row.signed_amount:,.2f}",
+            "Outstanding": f"{row.amount_due:,.2f}",
+        }
+    )
+    if hasattr(row, "cumulative_signed_amount"):
+        columns["Cumulative Signed"] = f"{row.cumulative_signed_amount:,.2f}"
+    return columns
+
+
+def aging_to_row(row) -> dict:
+    """
+    Convert an AgingRow into a table row.
+    """
+    return {
+        "ID": row.id or "None",
+        "Name": row.name or "",
+        "Contracts": row.contracts,
+        "0-30 Days": f"{row.days_0_30:,.2f}",
+        "31-60 Days": f"{row.days_31_60:,.2f}",
+        "61-90 Days": f"{row.days_61_90:,.2f}",
+        "Over 90 Days": f"{row.days_over_90:,.2f}",
+        "Total Due": f"{row.total_due:,.2f}",
+    }
+
+
+def slice_to_row(row) -> dict:
+    """
+    Convert a ContractSlice or EventSlice into a table row.
+    """
+    if hasattr(row, "events"):
+        return {"Attendees": row.key, "Events": row.events, "Total Attendees": row.attendees}
+    if isinstance(row.key, bool):
+        key = {"Signed": "Yes" if row.key else "No"}
+    elif isinstance(row.key, str):
+        key = {"Month": row.key}
+    else:
+        key = {"Commercial ID": row.key or "None"}
+    return {
+        **key,
+        "Contracts": row.contracts,
+        "Signed": row.signed_contracts,
+        "Total Amount": f"{row.total_amount:,.2f}",
+        "Outstanding": f"{row.amount_due:,.2f}",
+    }
+
+
+def commission_to_row(row) -> dict:
+    """
+    Convert a CommissionRow into a table row.
+    """
+    return {
+        "Commercial ID": row.commercial_contact_id,
+        "Commercial": row.commercial_name or "",
+        "Signed Contracts": row.contracts,
+        "Signed Amount": f"{row.signed_amount:,.2f}",
+        "Commission": f"{row.commission:,.2f}",
+        "Effective Rate": f"{row.effective_rate:.2%}",
+        "Rule": row.rule,
+    }
+
+
+def load_rules_option(ctx, param, value):
+    """
+    Click callback reading the commission rules file, so that a malformed file is reported as a usage error.
+    """
+    from utils.commissions import load_rules
+
+    try:
+        return load_rules(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+@click.group(cls=TelemetryGroup)
+def report():
+    """Display management reports."""
+    pass
+
+
+@report.command(name="revenue")
+@click.option(
+    "--by", type=click.Choice(REVENUE_GROUPINGS), default="commercial", show_default=True, help="Grouping of the rows."
+)
+@format_option
+def revenue(by, output_format):
+    """
+    Display contract totals, outstanding amounts and signed ratios per commercial or per month.
+    """
+    from controllers.main_controller import MainController
+
+    output_rows(
+        MainController.revenue_report(by),
+        output_format,
+        revenue_to_row,
+        f"Revenue per {by}",
+        "No contracts found or you are not authorized to view the reports.",
+    )
+
+
+@report.command(name="aging")
+@click.option(
+    "--by", type=click.Choice(AGING_GROUPINGS), default="client", show_default=True, help="Grouping of the rows."
+)
+@click.option(
+    "--as-of", type=click.DateTime(formats=["%Y-%m-%d"]), help="Date the ages are computed at (default: today)."
+)
+@format_option
+def aging(by, as_of, output_format):
+    """
+    Display the amounts due per client or per commercial, by age of the contracts: 0-30, 31-60, 61-90 and
+    over 90 days.
+    """
+    from controllers.main_controller import MainController
+
+    output_rows(
+        MainController.aging_report(by, as_of.date() if as_of else None),
+        output_format,
+        aging_to_row,
+        f"Accounts receivable aging per {by}",
+        "No amounts due found or you are not authorized to view the reports.",
+    )
+
+
+@report.command(name="analytics")
+@click.option(
+    "--by", type=click.Choice(SLICE_GROUPINGS), default="month", show_default=True, help="Grouping of the rows."
+)
+@click.option("--signed/--unsigned", default=None, help="Keep only signed or unsigned contracts.")
+@click.option("--from", "date_from", type=click.DateTime(formats=["%Y-%m-%d"]), help="First date included.")
+@click.option("--to", "date_to", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last date included.")
+@click.option(
+    "--cache", "cache_dir", type=click.Path(file_okay=False), help="Directory caching the snapshot between runs."
+)
+@format_option
+def analytics(by, signed, date_from, date_to, cache_dir, output_format):
+    """
+    Slice the contracts by month of creation, commercial or signed status, or the events by attendee band.
+    """
+    from controllers.main_controller import MainController
+
+    output_rows(
+        MainController.analytics_report(
+            by, signed, date_from.date() if date_from else None, date_to.date() if date_to else None, cache_dir
+        ),
+        output_format,
+        slice_to_row,
+        f"Analytics per {by}",
+        "No data found or you are not authorized to view the reports.",
+    )
+
+
+@report.command(name="commissions")
+@click.option(
+    "--rules",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    callback=load_rules_option,
+    help="JSON file of the commission rules.",
+)
+@click.option("--from", "date_from", type=click.DateTime(formats=["%Y-%m-%d"]), help="First date included.")
+@click.option("--to", "date_to", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last date included.")
+@click.option(
+    "--cache", "cache_dir", type=click.Path(file_okay=False), help="Directory caching the snapshot between runs."
+)
+@format_option
+def commissions(rules, date_from, date_to, cache_dir, output_format):
+    """
+    Compute the commission of each commercial on the signed contracts created in the period.
+    """
+    from controllers.main_controller import MainController
+
+    output_rows(
+        MainController.commission_report(
+            rules, date_from.date() if date_from else None, date_to.date() if date_to else None, cache_dir
+        ),
+        output_format,
+        commission_to_row,
+        "Commissions",
+        "No signed contracts found or you are not authorized to view the reports.",
+    )
+
+
+@report.command(name="dashboard")
+@click.option("--user-id", type=click.IntRange(min=1), help="Collaborator whose figures to show (management only).")
+def dashboard(user_id):
+    """
+    Display the dashboard figures of the logged-in collaborator, or of every collaborator for management.
+    """
+    from controllers.main_controller import MainController
+
+    commercials, supports = MainController.get_dashboard(user_id)
+    if not commercials and not supports:
+        console.print("[bold red]No figures found or you are not authorized to view them.[/bold red]")
+        return
+    if commercials:
+        rows = [
+            {
+                "Commercial ID": summary.user_id,
+                "Clients": summary.client_count,
+                "Contracts": summary.contract_count,
+                "Signed Total": f"{summary.signed_total:,.2f}",
+                "Outstanding": f"{summary.outstanding:,.2f}",
+                "Refreshed At": summary.refreshed_at,
+            }
+            for summary in commercials
+        ]
+        print_table(rows, title="Commercial Dashboard")
+    if supports:
+        rows = [
+            {
+                "Support ID": summary.user_id,
+                "Assigned Events": summary.assigned_events,
+                "Upcoming Events": summary.upcoming_events,
+                "Refreshed At": summary.refreshed_at,
+            }
+            for summary in supports
+        ]
+        print_table(rows, title="Support Dashboard")
+
+
+@report.command(name="rebuild")
+def rebuild_summaries():
+    """
+    Recompute the dashboard figures from the clients, contracts and events.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.rebuild_summaries())
@@ -0,0 +1,27 @@
+import click
+
+
+class TelemetryCommand(click.Command):
+    """
+    Click command starting error reporting once its arguments are parsed, right before its callback runs.
+
+    Group callbacks run before the arguments of their subcommand are parsed, so starting there would also
+    load the telemetry stack for ``client --help``. Help pages and shell completion stop during parsing and
+    never reach ``invoke``.
+    """
+
+    def invoke(self, ctx):
+        if not ctx.resilient_parsing:
+            from utils.telemetry import Telemetry
+
+            Telemetry.start()
+        return super().invoke(ctx)
+
+
+class TelemetryGroup(click.Group):
+    """
+    Click group whose commands and subgroups start error reporting before running.
+    """
+
+    command_class = TelemetryCommand
+    group_class = type
@@ -0,0 +1,105 @@
+import click
+from utils.bulk_import import DEFAULT_CHUNK_SIZE
+from utils.data_validator import DataValidator
+from views.command_helpers import print_result, validated
+from views.telemetry_command import TelemetryGroup
+
+
+@click.group(cls=TelemetryGroup)
+def collaborator():
+    """Manage collaborators."""
+    pass
+
+
+@collaborator.command(name="create")
+@click.option("--username", required=True, callback=validated(DataValidator.check_string, "Username"))
+@click.option(
+    "--password",
+    required=True,
+    envvar="EPICEVENTS_COLLABORATOR_PASSWORD",
+    callback=validated(DataValidator.check_string, "Password"),
+    help="Password of the collaborator, also read from EPICEVENTS_COLLABORATOR_PASSWORD.",
+)
+@click.option("--email", required=True, callback=validated(DataValidator.check_email))
+@click.option("--name", required=True, callback=validated(DataValidator.check_string, "Name"))
+@click.option(
+    "--department-id",
+    required=True,
+    type=int,
+    callback=validated(DataValidator.check_department_id, "Department ID"),
+    help="1: Commercial, 2: Support, 3: Gestion",
+)
+def create_collaborator(username, password, email, name, department_id):
+    """
+    Create a collaborator.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.create_collaborator(username, password, email, name, department_id))
+
+
+@collaborator.command(name="update")
+@click.argument("user_id", type=int, callback=validated(DataValidator.check_existing_user_id, "User ID"))
+@click.option("--username", callback=validated(DataValidator.check_string, "Username"))
+@click.option("--password", callback=validated(DataValidator.check_string, "Password"))
+@click.option("--email", callback=validated(DataValidator.check_email))
+@click.option("--name", callback=validated(DataValidator.check_string, "Name"))
+@click.option(
+    "--department-id",
+    type=int,
+    callback=validated(DataValidator.check_department_id, "Department ID"),
+    help="1: Commercial, 2: Support, 3: Gestion",
+)
+def update_collaborator(user_id, username, password, email, name, department_id):
+    """
+    Update a collaborator. Omitted options are left unchanged.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.update_collaborator(user_id, username, password, email, name, department_id))
+
+
+@collaborator.command(name="delete")
+@click.argument("user_id", type=int, callback=validated(DataValidator.check_existing_user_id, "User ID"))
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    help="Delete the clients, contracts and events of the collaborator by transactions of this many rows.",
+)
+@click.confirmation_option(prompt="Delete this collaborator and everything assigned to them?")
+def delete_collaborator(user_id, chunk_size):
+    """
+    Delete a collaborator. Pass --yes to skip the confirmation.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.delete_collaborator(user_id, chunk_size))
+
+
+@collaborator.command(name="reassign")
+@click.argument("user_id", type=int, callback=validated(DataValidator.check_existing_user_id, "User ID"))
+@click.option(
+    "--to",
+    "target_ids",
+    type=int,
+    multiple=True,
+    required=True,
+    help="ID of a collaborator of the same department receiving part of the portfolio. Repeat for several.",
+)
+@click.option("--balance", is_flag=True, help="Give more rows to the collaborators having the fewest.")
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="Number of rows moved per transaction.",
+)
+@click.confirmation_option(prompt="Reassign the portfolio of this collaborator and delete them?")
+def reassign_collaborator(user_id, target_ids, balance, chunk_size):
+    """
+    Move the clients, contracts and events of a collaborator to other collaborators, then delete them.
+    Pass --yes to skip the confirmation.
+    """
+    from controllers.main_controller import MainController
+
+    print_result(MainController.reassign_collaborator(user_id, list(target_ids), balance, chunk_size))
@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+import numpy as np
+from utils.analytics import CONTRACT_COLUMNS, EVENT_COLUMNS, AnalyticsSnapshot, Frame, bands, group_by
+
+
+class TestAnalytics(unittest.TestCase):
+    """
+    TestAnalytics checks the vectorized group-by and slices of the analytics snapshot, and its cache.
+    """
+
+    def setUp(self):
+        contracts = [
+            (1, 1, 3, 100050, 50000, True, date(2026, 1, 5)),
+            (2, 2, 0, 2000, 0, False, date(2026, 2, 1)),
+            (3, 1, 3, 99, 99, True, date(2026, 1, 31)),
+        ]
+        events = [
+            (1, 1, 0, datetime(2026, 3, 1, 10), datetime(2026, 3, 1, 12), 75),
+            (2, 2, 4, datetime(2026, 4, 1), datetime(2026, 4, 2), 1200),
+            (3, 3, 4, datetime(2026, 4, 2), datetime(2026, 4, 3), 60),
+        ]
+        # Two chunks, as streamed from the database
+        self.snapshot = AnalyticsSnapshot(
+            Frame.from_chunks([contracts[:2], contracts[2:]], CONTRACT_COLUMNS),
+            Frame.from_chunks([events], EVENT_COLUMNS),
+            {"contracts": [3, "2026-04-01T00:00:00"], "events": [3, None]},
+        )
+
+    def test_group_by(self):
+        """Test that rows are counted and summed per key, in integers, with booleans counted."""
+        groups = group_by(np.array([3, 1, 3, 2]), np.array([10, 20, 30, 40]), np.array([True, False, True, True]))
+        self.assertEqual(groups.keys.tolist(), [1, 2, 3])
+        self.assertEqual(groups.counts.tolist(), [1, 1, 2])
+        self.assertEqual([column.tolist() for column in groups.sums], [[20, 40, 40], [0, 1, 2]])
+        self.assertEqual(groups.sums[0].dtype, np.int64)
+        self.assertEqual(len(group_by(np.array([], dtype=np.int64), np.array([])).keys), 0)
+
+        # Keys too sparse to be counted with bincount are sorted
+        groups = group_by(np.array([10**12, 1, 10**12]), np.array([2**62, 5, 1]))
+        self.assertEqual((groups.keys.tolist(), groups.counts.tolist()), ([1, 10**12], [1, 2]))
+        self.assertEqual(groups.sums[0].tolist(), [5, 2**62 + 1])
+
+        groups = group_by(np.array(["2026-03", "2026-01", "2026-03"], dtype="datetime64[M]"), np.array([1, 2, 3]))
+        self.assertEqual(np.datetime_as_string(groups.keys).tolist(), ["2026-01", "2026-03"])
+        self.assertEqual(groups.sums[0].tolist(), [2, 4])
+
+    def test_bands(self):
+        """Test that values go to the band of the greatest lower bound not above them."""
+        self.assertEqual(bands(np.array([-1, 0, 49, 50, 2000]), [0, 50, 100]).tolist(), [0, 0, 0, 1, 2])
+
+    def test_slices(self):
+        """Test the contract slices and the attendee bands, with their filters."""
+        rows = self.snapshot.slice("month")
+        self.assertEqual(
+            [(row.key, row.contracts, row.signed_contracts) for row in rows], [("2026-01", 2, 2), ("2026-02", 1, 0)]
+        )
+        self.assertEqual((rows[0].total_amount, rows[0].amount_due), (Decimal("1001.49"), Decimal("500.99")))
+
+        rows = self.snapshot.slice("commercial", signed=False)
+        self.assertEqual([(row.key, row.total_amount) for row in rows], [(None, Decimal("20.00"))])
+
+        rows = self.snapshot.slice("signed", date_from=date(2026, 1, 10), date_to=date(2026, 2, 1))
+        self.assertEqual([(row.key, row.contracts) for row in rows], [(False, 1), (True, 1)])
+
+        rows = self.snapshot.slice("attendees")
+        self.assertEqual([tuple(row) for row in rows], [("50-99", 2, 135), ("1000+", 1, 1200)])
+        rows = self.snapshot.slice("attendees", signed=True, date_to=date(2026, 4, 1))
+        self.assertEqual([tuple(row) for row in rows], [("50-99", 1, 75)])
+
+    def test_cache(self):
+        """Test that the cache is memory-mapped back while its stamp matches, and ignored otherwise."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsNone(AnalyticsSnapshot.load(directory, self.snapshot.stamp))
+            self.snapshot.save(directory)
+
+            snapshot = AnalyticsSnapshot.load(directory, self.snapshot.stamp)
+            self.assertIsInstance(snapshot.contracts["total_cents"], np.memmap)
+            self.assertEqual(snapshot.slice("commercial"), self.snapshot.slice("commercial"))
+            self.assertEqual(snapshot.events["start"].dtype, np.dtype("datetime64[s]"))
+
+            stale = {"contracts": [4, "2026-04-02T00:00:00"], "events": [3, None]}
+            self.assertIsNone(AnalyticsSnapshot.load(directory, stale))
+
+
+if __name__ == "__main__":
+    unittest.main()
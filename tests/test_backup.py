@@ -0,0 +1,133 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, datetime
+from base_test import BaseTest
+from controllers.main_controller import MainController
+from models.client import Client
+from models.user import User
+from utils.backup_manager import MANIFEST_NAME, BackupManager, _ChunkWriter
+
+
+class TestBackupFiles(unittest.TestCase):
+    """
+    TestBackupFiles checks that the backup files restore the values with their types.
+    """
+
+    def test_round_trip(self):
+        """Test that NULL, empty strings, dates and booleans survive both formats."""
+        columns = ["id", "date_created", "last_contact_date", "signed", "notes"]
+        converters = [int, date, datetime, bool, str]
+        rows = [(1, date(2024, 7, 1), None, True, ""), (2, date(2024, 7, 2), datetime(2024, 7, 3, 9, 30), False, "a,b")]
+        with tempfile.TemporaryDirectory() as directory:
+            for output_format in ("jsonl", "csv"):
+                path = os.path.join(directory, f"table.{output_format}.gz")
+                writer = _ChunkWriter(path, output_format, columns)
+                for row in rows:
+                    writer.write(row)
+                entry = writer.close()
+                self.assertEqual(entry["rows"], 2)
+                restored = list(BackupManager._read_rows(path, output_format, columns, converters))
+                self.assertEqual(restored, [dict(zip(columns, row)) for row in rows], output_format)
+
+
+class TestBackup(BaseTest):
+    """
+    TestBackup performs integration tests for the export and restore of the database.
+    """
+
+    def test_export_and_restore(self):
+        """Test that a restore brings back the exported rows and replaces those created since."""
+
+        # Authenticate as a commercial user and create a client
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Backup Client", email="backupclient@example.com", phone="1234567890", company_name="Company"
+        )
+
+        # Export as a management user
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        with tempfile.TemporaryDirectory() as directory:
+            result = MainController.export_database(directory, "csv", rows_per_file=2)
+            print("Export result:", result)
+            self.assertIn("successfully", result)
+            with open(os.path.join(directory, MANIFEST_NAME)) as file:
+                manifest = json.load(file)
+            table_names = [entry["name"] for entry in manifest["tables"]]
+            # The summary tables are derived, and rebuilt by the restore
+            self.assertEqual(table_names, ["Department", "User", "Client", "Contract", "Event", "EventArchive"])
+            users = next(entry for entry in manifest["tables"] if entry["name"] == "User")
+            self.assertEqual(len(users["files"]), 2, "3 users with 2 rows per file should give 2 files")
+
+            # Change the database, then restore the backup
+            self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+            MainController.create_client(
+                full_name="Later Client", email="laterclient@example.com", phone="1234567890", company_name="Company"
+            )
+            self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+            result = MainController.restore_database(directory, workers=2)
+            print("Restore result:", result)
+            self.assertIn("successfully", result)
+
+        self.session.commit()
+        self.reopen_session()
+        emails = {client.email for client in self.session.query(Client)}
+        self.assertEqual(emails, {"backupclient@example.com"})
+        self.assertEqual(self.session.query(User).count(), 3)
+        self.assertEqual(BackupManager.find_orphans([Client.__table__]), {})
+
+    def test_restore_corrupted_backup_should_fail(self):
+        """Test that a backup whose files do not match the manifest is refused before touching the database."""
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        with tempfile.TemporaryDirectory() as directory:
+            MainController.export_database(directory)
+            with open(os.path.join(directory, "User-00001.jsonl.gz"), "ab") as file:
+                file.write(b"garbage")
+            result = MainController.restore_database(directory)
+        self.assertIn("missing or corrupted", result)
+        self.assertEqual(self.session.query(User).count(), 3)
+
+
+    def test_export_changes(self):
+        """Test that each incremental export only contains the rows modified since the previous one."""
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="First Client", email="firstclient@example.com", phone="1234567890", company_name="Company"
+        )
+        MainController.create_client(
+            full_name="Second Client", email="secondclient@example.com", phone="1234567890", company_name="Company"
+        )
+        self.session.commit()
+        self.reopen_session()
+        first = self.session.query(Client).filter_by(email="firstclient@example.com").one()
+        self.assertIsNotNone(first.created_at)
+        self.assertEqual(first.created_at, first.updated_at)
+
+        with tempfile.TemporaryDirectory() as directory:
+            time.sleep(2)
+            self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+            result = MainController.export_changes(directory, lag_seconds=1)
+            print("First export result:", result)
+            self.assertIn("Client: 2", result)
+
+            self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+            MainController.update_client(first.id, phone="0987654321")
+            time.sleep(2)
+            self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+            manifest = BackupManager.export_changes(directory, "csv", lag_seconds=1)
+
+            clients = next(entry for entry in manifest["tables"] if entry["name"] == "Client")
+            self.assertEqual(clients["rows"], 1, "Only the updated client should be exported")
+            change_sets = sorted(name for name in os.listdir(directory) if name.startswith("changes-"))
+            change_directory = os.path.join(directory, change_sets[-1])
+            with gzip.open(os.path.join(change_directory, clients["files"][0]["name"]), "rt") as file:
+                rows = list(csv.DictReader(file))
+            self.assertEqual([row["phone"] for row in rows], ["0987654321"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from datetime import datetime
+from utils.batch_validator import BatchValidator
+from utils.data_validator import DataValidator
+
+
+class TestBatchValidator(unittest.TestCase):
+    """
+    TestBatchValidator checks that the column checks apply the same rules as DataValidator.
+    """
+
+    def test_same_messages_as_data_validator(self):
+        """Test that each invalid value gets the message DataValidator would print."""
+        emails = ["alice@example.com", "not-an-email", ""]
+        errors = BatchValidator.check_emails(emails)
+        self.assertEqual([error.row for error in errors], [1, 2])
+        self.assertEqual([error.message for error in errors], [DataValidator.check_email(emails[1])] * 2)
+
+        amounts = ["10", "-1", "0", "abc", "nan", "1e20"]
+        errors = BatchValidator.check_floats(amounts, "Amount Due", positive=False, allow_zero=True)
+        expected = [DataValidator.check_float(value, "Amount Due", False, True) for value in amounts]
+        self.assertEqual([error.message for error in errors], [message for message in expected if message])
+
+    def test_edge_cases_match_data_validator(self):
+        """Test the vectorized checks on values at the edges of the rules, value by value."""
+        cases = [
+            (
+                BatchValidator.check_emails,
+                DataValidator.check_email,
+                ["a@b.co", "_a@b.co", ".a@b.co", "a@.co", "a@b.c", "a@b.c|m", "a@b.coé", "é@b.co", "a@b@c.co", None],
+            ),
+            (
+                BatchValidator.check_phones,
+                DataValidator.check_phone,
+                ["+33 6", "33\t6", "+", "++33", "3+3", "06\n", "٣٣", None],
+            ),
+            (
+                lambda values: BatchValidator.check_ids(values, "ID"),
+                lambda value: DataValidator.check_id(value, "ID"),
+                ["7", " 7 ", "+7", "-7", "0", "1_000", "٣", "7.0", "9" * 30, ""],
+            ),
+            (
+                lambda values: BatchValidator.check_floats(values, "Total"),
+                lambda value: DataValidator.check_float(value, "Total"),
+                ["0.005", "0.004", ".5", "5.", "-0", "1_000.5", "2e3", "999999999999.994", "999999999999.995", None],
+            ),
+        ]
+        for batch_check, check, values in cases:
+            messages = {error.row: error.message for error in batch_check(values)}
+            self.assertEqual([messages.get(row) for row in range(len(values))], [check(value) for value in values])
+
+        self.assertEqual(BatchValidator.parse_ints(["12", " -3 ", "x", "9" * 30]), [12, -3, None, int("9" * 30)])
+        self.assertEqual(
+            BatchValidator.parse_datetimes(["2028-02-29 23:59:59", "2027-02-29 10:00:00", "2030-01-01T09:00:00"]),
+            [datetime(2028, 2, 29, 23, 59, 59), None, None],
+        )
+
+        # strptime also accepts fields without their leading zero, and whitespace runs for the space
+        dates = ["2030-01-05 9:30:00", "2030-1-5 09:30:00", "2030-01-05  09:30:00", "2030-01- 5 09:30:00", "2030-01-05"]
+        messages = {error.row: error.message for error in BatchValidator.check_datetimes(dates, "Event Date Start")}
+        expected = [DataValidator.check_datetime(value, "Event Date Start") for value in dates]
+        self.assertEqual([messages.get(row) for row in range(len(dates))], expected)
+        self.assertEqual(expected[:4], [None] * 4)
+        self.assertEqual(BatchValidator.parse_datetimes(dates[:2]), [datetime(2030, 1, 5, 9, 30)] * 2)
+
+    def test_datetimes(self):
+        """Test the datetime format, the lower bound and the ranges."""
+        starts = [
+            "2030-01-01 09:00:00",
+            "2030-01-01",
+            "2020-01-01 09:00:00",
+            "2030-01-02 09:00:00",
+            "2030-01-01 09:00:00",
+        ]
+        ends = [
+            "2030-01-01 18:00:00",
+            "2030-01-01 18:00:00",
+            "2020-01-01 18:00:00",
+            "2030-01-01 18:00:00",
+            "2030-02-01 09:00:01",
+        ]
+        errors = BatchValidator.check_datetimes(starts, "Event Date Start", not_before=datetime(2025, 1, 1))
+        self.assertEqual([error.row for error in errors], [1, 2])
+        self.assertIn("Invalid datetime format", errors[0].message)
+        self.assertEqual(errors[1].message, "Event Date Start cannot be in the past.")
+
+        errors = BatchValidator.check_datetime_ranges(starts, ends)
+        self.assertEqual([error.row for error in errors], [3, 4])
+        expected = [DataValidator.check_datetime(ends[row], "Event Date End", starts[row]) for row in (3, 4)]
+        self.assertEqual([error.message for error in errors], expected)
+        self.assertEqual(errors[0].message, "Event Date End cannot be before Event Date Start.")
+        self.assertEqual(errors[1].message, "Event Date End cannot be more than 31 days after Event Date Start.")
+
+    def test_validate_orders_errors_by_row(self):
+        """Test that validate runs every rule and orders the errors by row."""
+        columns = BatchValidator.to_columns(
+            [
+                {"full_name": "", "phone": "+33 6 00 00 00 00"},
+                {"full_name": "Bob", "phone": "call me"},
+                {"full_name": " ", "phone": None},
+            ],
+            ["full_name", "phone"],
+        )
+        errors = BatchValidator.validate(
+            columns,
+            [
+                ("full_name", BatchValidator.check_strings, {"field_name": "Full Name"}),
+                ("phone", BatchValidator.check_phones, {}),
+            ],
+        )
+        self.assertEqual(
+            [(error.row, error.field) for error in errors],
+            [(0, "Full Name"), (1, "Phone"), (2, "Full Name"), (2, "Phone")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import csv
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from models.import_progress import ImportProgress
+from utils.batch_validator import ValidationError
+from utils.bulk_import import RejectWriter, group_errors, read_csv_chunks, read_csv_column
+from utils.import_checkpoint import ImportCheckpoint
+
+
+class TestBulkImport(unittest.TestCase):
+    """
+    TestBulkImport checks the CSV helpers shared by the bulk imports.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "clients.csv")
+        with open(self.path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["full_name", "email"])
+            for i in range(5):
+                writer.writerow([f"Client {i}", f"client{i}@example.com"])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_csv_chunks(self):
+        """Test that chunks carry the line number of their first row."""
+        chunks = list(read_csv_chunks(self.path, ["full_name", "email"], chunk_size=2))
+        self.assertEqual([(line, len(rows)) for line, rows in chunks], [(2, 2), (4, 2), (6, 1)])
+        self.assertEqual(chunks[2][1][0]["email"], "client4@example.com")
+
+    def test_read_csv_chunks_from_line(self):
+        """Test that reading can start at a given line, to resume an import."""
+        chunks = list(read_csv_chunks(self.path, ["email"], chunk_size=2, start_line=5))
+        self.assertEqual(
+            [(line, [row["full_name"] for row in rows]) for line, rows in chunks], [(5, ["Client 3", "Client 4"])]
+        )
+        self.assertEqual(read_csv_column(self.path, "full_name", start_line=6), {"Client 4"})
+
+    def test_checkpoint(self):
+        """Test that the checkpoint is restored for the same file and refused once the file changed."""
+        engine = create_engine("sqlite://")
+        ImportProgress.__table__.create(engine)
+        session = Session(engine)
+        checkpoint = ImportCheckpoint("clients", self.path)
+        self.assertIsNone(checkpoint.load(session))
+
+        # The progress is only saved with the transaction it was added to
+        checkpoint.save(session, line=4, imported=2, rejected=0)
+        session.rollback()
+        self.assertIsNone(checkpoint.load(session))
+        checkpoint.save(session, line=4, imported=2, rejected=0)
+        session.commit()
+        progress = ImportCheckpoint("clients", self.path).load(session)
+        self.assertEqual(progress, {"line": 4, "imported": 2, "rejected": 0})
+
+        with open(self.path, "a", newline="") as file:
+            csv.writer(file).writerow(["Client 5", "client5@example.com"])
+        with self.assertRaises(ValueError):
+            checkpoint.load(session)
+        checkpoint.clear(session)
+        self.assertEqual(session.query(ImportProgress).count(), 0)
+        session.close()
+
+    def test_missing_columns(self):
+        """Test that a file without the required columns is refused before reading rows."""
+        with self.assertRaises(ValueError):
+            list(read_csv_chunks(self.path, ["full_name", "phone"]))
+
+    def test_reject_writer(self):
+        """Test that rejected rows are written with their line and error, and that errors are grouped by row."""
+        messages = group_errors(
+            [
+                ValidationError(1, "Email", "x", "Invalid email format."),
+                ValidationError(1, "Phone", "y", "Invalid phone number format."),
+            ]
+        )
+        self.assertEqual(messages, {1: "Invalid email format. Invalid phone number format."})
+
+        reject_path = os.path.join(self.directory.name, "rejects.csv")
+        with RejectWriter(reject_path, ["full_name", "email"]) as rejects:
+            rejects.write(3, {"full_name": "Client 1", "email": "x"}, messages[1])
+        self.assertEqual(rejects.count, 1)
+        with open(reject_path, newline="") as file:
+            self.assertEqual(
+                list(csv.DictReader(file)),
+                [{"line": "3", "full_name": "Client 1", "email": "x", "error": messages[1]}],
+            )
+
+    def test_reject_writer_without_file(self):
+        """Test that rejected rows are only counted when no reject file is given."""
+        with RejectWriter(None, ["full_name"]) as rejects:
+            rejects.write(2, {"full_name": ""}, "Full Name cannot be empty.")
+        self.assertEqual(rejects.count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,20 @@
+import csv
+import tempfile
 import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import event
 from models.client import Client
+from models.contract import Contract
 from base_test import BaseTest
 from controllers.main_controller import MainController
 import os
 import pexpect
 import sys
+from click.testing import CliRunner
 from config import Config
+from views.main_views import cli
+from controllers.event_controller import EventController
+from utils.session_manager import get_session_factory
 
 
 class TestClient(BaseTest):
@@ -236,6 +245,127 @@ class TestClient(BaseTest):
         self.assertEqual(client.phone, "1234567890")
         self.assertEqual(client.company_name, "Interaction Company")
 
+    def test_create_client_command(self):
+        """Test creating a client with the non-interactive command as a commercial user."""
+
+        # Authenticate as a commercial user
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+
+        # Invalid options are rejected before reaching the controller
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["client", "create", "--full-name", "Command Client", "--email", "invalid", "--phone", "1234567890",
+             "--company-name", "Command Company"],
+        )
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Invalid email format.", result.output)
+
+        result = runner.invoke(
+            cli,
+            ["client", "create", "--full-name", "Command Client", "--email", "commandclient@example.com",
+             "--phone", "1234567890", "--company-name", "Command Company"],
+        )
+        print("Create client command output:", result.output)
+        self.assertEqual(result.exit_code, 0, "Failed to create client with the command")
+
+        # Verify that the client was created in the database
+        self.session.commit()
+        self.reopen_session()
+        client = self.session.query(Client).filter_by(email="commandclient@example.com").first()
+        self.assertIsNotNone(client, "Client not found in the database")
+        self.assertEqual(client.full_name, "Command Client")
+
+
+    def test_import_clients(self):
+        """Test importing clients from a CSV file, with rejected rows written to the reject file."""
+
+        # Authenticate as a commercial user
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Existing Client", email="existing@example.com", phone="1234567890", company_name="Company"
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clients.csv")
+            reject_path = os.path.join(directory, "rejects.csv")
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["full_name", "email", "phone", "company_name"])
+                writer.writerow(["Imported 1", "imported1@example.com", "+33 6 00 00 00 01", "Company 1"])
+                writer.writerow(["Imported 2", "not-an-email", "+33 6 00 00 00 02", "Company 2"])
+                writer.writerow(["Imported 3", "EXISTING@example.com", "+33 6 00 00 00 03", "Company 3"])
+                writer.writerow(["Imported 4", "imported1@example.com", "+33 6 00 00 00 04", "Company 4"])
+                writer.writerow(["Imported 5", "imported5@example.com", "+33 6 00 00 00 05", "Company 5"])
+
+            result = MainController.import_clients(path, chunk_size=2, reject_path=reject_path)
+            print("Import clients result:", result)
+            self.assertEqual(result, f"2 clients imported successfully. 3 rows rejected, see {reject_path}.")
+
+            with open(reject_path, newline="") as file:
+                rejects = list(csv.DictReader(file))
+            self.assertEqual([reject["line"] for reject in rejects], ["3", "4", "5"])
+            self.assertEqual(rejects[1]["error"], "A client with this email already exists.")
+            self.assertEqual(rejects[2]["error"], "Duplicate email in the file.")
+
+        # Verify that only the valid clients were created
+        self.session.commit()
+        self.reopen_session()
+        emails = {client.email for client in self.session.query(Client).filter(Client.full_name.like("Imported%"))}
+        self.assertEqual(emails, {"imported1@example.com", "imported5@example.com"})
+
+    def test_client_detail_query_count(self):
+        """Test that the client detail is loaded with the same number of queries whatever the client holds."""
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Detail Client", email="detailclient@example.com", phone="1234567890", company_name="Co"
+        )
+        client = self.session.query(Client).filter_by(email="detailclient@example.com").one()
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        for amount in (1000.0, 2000.0, 3000.0):
+            MainController.create_contract(client_id=client.id, total_amount=amount, amount_due=500.0, signed=True)
+        self.session.commit()
+        self.reopen_session()
+        contracts = self.session.query(Contract).filter_by(client_id=client.id).all()
+
+        start = datetime.now().replace(microsecond=0) + timedelta(days=30)
+        session = self.Session()
+        EventController.insert_events(
+            session,
+            [
+                {
+                    "contract_id": contract.id,
+                    "client_id": client.id,
+                    "event_name": f"Detail Event {contract.id}",
+                    "event_date_start": start,
+                    "event_date_end": start + timedelta(hours=4),
+                    "support_contact_id": None,
+                    "location": "Lille",
+                    "attendees": 10,
+                    "notes": "",
+                }
+                for contract in contracts
+            ],
+        )
+        session.commit()
+        session.close()
+
+        statements = []
+        engine = get_session_factory("test").kw["bind"]
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            detail = MainController.get_client_detail(full_name="Detail Client")
+            self.assertEqual(detail.commercial_contact.username, os.getenv("USER1_USERNAME"))
+            self.assertEqual(sum(contract.total_amount for contract in detail.contracts), 6000.0)
+            self.assertEqual([event.support_contact for event in detail.events], [None] * 3)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        self.assertEqual(len(statements), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+import numpy as np
+from utils.commissions import CommissionRule, compute_commissions, load_rules, parse_rules, tiered_commission
+
+
+class TestCommissions(unittest.TestCase):
+    """
+    TestCommissions checks the commission rules and their vectorized computation.
+    """
+
+    def test_parse_rules(self):
+        """Test that percentages and tiers are read as basis points and cents."""
+        rules = parse_rules(
+            {"default": 5, "commercials": {"3": [{"from": 0, "rate": 3}, {"from": "50000", "rate": 7.25}]}}
+        )
+        self.assertEqual(rules.default, CommissionRule((0,), (500,)))
+        self.assertEqual(rules.commercials, {3: CommissionRule((0, 5000000), (300, 725))})
+        self.assertEqual(parse_rules({}).default, None)
+
+    def test_invalid_rules(self):
+        """Test that malformed rules are refused with a message."""
+        invalid = [
+            [],
+            {"bonus": 5},
+            {"default": "abc"},
+            {"default": 101},
+            {"default": 1.234},
+            {"default": True},
+            {"default": [{"from": 10, "rate": 1}]},
+            {"default": [{"from": 0, "rate": 1}, {"from": 0, "rate": 2}]},
+            {"default": [{"from": 0}]},
+            {"commercials": {"abc": 5}},
+            {"commercials": [5]},
+        ]
+        for content in invalid:
+            with self.assertRaises(ValueError, msg=content):
+                parse_rules(content)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rules.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("{not json")
+            with self.assertRaises(ValueError):
+                load_rules(path)
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"default": 2.5}, file)
+            self.assertEqual(load_rules(path).default, CommissionRule((0,), (250,)))
+
+    def test_tiered_commission(self):
+        """Test that each rate applies to the part of the amount within its tier, rounded half up to the cent."""
+        rule = CommissionRule((0, 5000000, 10000000), (300, 500, 750))
+        amounts = np.array([0, 4000000, 5000000, 12000000, 1])
+        self.assertEqual(tiered_commission(amounts, rule).tolist(), [0, 120000, 150000, 550000, 0])
+        # 2.5% of 0.50 is 0.0125, and 2.5% of 0.60 is 0.015, rounded up to 0.02
+        self.assertEqual(tiered_commission(np.array([50, 60]), CommissionRule((0,), (250,))).tolist(), [1, 2])
+
+    def test_compute_commissions(self):
+        """Test the breakdown per commercial, with the default rule and the contracts without a commercial."""
+        rules = parse_rules({"default": 10, "commercials": {"3": [{"from": 0, "rate": 3}, {"from": 500, "rate": 5}]}})
+        commercial_ids = np.array([3, 4, 0, 3, 5])
+        amounts = np.array([40000, 12345, 99900, 30000, 100])
+        rows = compute_commissions(commercial_ids, amounts, rules, {3: "Alice"})
+        self.assertEqual([row.commercial_contact_id for row in rows], [3, 4, 5])
+        alice = rows[0]
+        self.assertEqual((alice.commercial_name, alice.contracts, alice.signed_amount), ("Alice", 2, Decimal("700.00")))
+        self.assertEqual((alice.commission, alice.effective_rate), (Decimal("25.00"), 0.0357))
+        self.assertEqual(alice.rule, "3% from 0.00, 5% from 500.00")
+        self.assertEqual((rows[1].commission, rows[1].rule), (Decimal("12.35"), "10%"))
+
+        rows = compute_commissions(commercial_ids, amounts, parse_rules({}))
+        self.assertEqual([(row.commission, row.rule) for row in rows], [(Decimal("0.00"), "no rule")] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
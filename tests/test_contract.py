@@ -1,9 +1,17 @@
+import csv
+import tempfile
 import unittest
 from models.contract import Contract
 from models.client import Client
 from models.department import Department
+from models.user import User
 from base_test import BaseTest
+from controllers.client_controller import ClientController
 from controllers.main_controller import MainController
+from models.import_progress import ImportProgress
+from utils.import_checkpoint import ImportCheckpoint
+from datetime import date
+from decimal import Decimal
 import os
 
 
@@ -425,5 +433,107 @@ class TestContract(BaseTest):
             self.fail(f"Permission error: {e}")
 
 
+    def test_import_contracts_resumes_from_checkpoint(self):
+        """Test importing contracts from a CSV file, resuming after the last committed chunk."""
+
+        # Create a client as a commercial user
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Import Client", email="importclient@example.com", phone="1234567890", company_name="Company"
+        )
+        client = self.session.query(Client).filter_by(email="importclient@example.com").first()
+
+        # Authenticate as a management user
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "contracts.csv")
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["client_id", "total_amount", "amount_due", "signed"])
+                writer.writerow([client.id, "1000", "1000", "true"])
+                writer.writerow([999999, "2000", "0", "false"])
+                writer.writerow([client.id, "3000", "0", "True"])
+
+            # Simulate a run interrupted after committing the first row
+            ImportCheckpoint("contracts", path).save(self.session, line=3, imported=1, rejected=0)
+            self.session.commit()
+
+            result = MainController.import_contracts(path, chunk_size=1, checkpoint_name="contracts")
+            print("Import contracts result:", result)
+            self.assertEqual(result, "2 contracts imported successfully. 1 rows rejected.")
+            self.session.commit()
+            self.assertIsNone(
+                self.session.get(ImportProgress, "contracts"), "The checkpoint should be removed once complete"
+            )
+
+        # Verify that only the rows after the checkpoint were imported, assigned to the client's commercial
+        self.session.commit()
+        self.reopen_session()
+        contracts = self.session.query(Contract).filter_by(client_id=client.id).all()
+        self.assertEqual([contract.total_amount for contract in contracts], [3000.0])
+        self.assertEqual(contracts[0].commercial_contact_id, client.commercial_contact_id)
+        self.assertTrue(contracts[0].signed)
+
+    def test_bulk_contract_updates_as_commercial(self):
+        """Test signing, adjusting and settling several contracts at once, limited to the user's own contracts."""
+
+        # Create a client of the commercial user and a client of another collaborator
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Bulk Client", email="bulkclient@example.com", phone="1234567890", company_name="Co"
+        )
+        other = self.session.query(User).filter_by(username=os.getenv("USER3_USERNAME")).one()
+        ClientController.create_client(
+            "Other Client", "otherclient@example.com", "1234567890", "Co", date.today(), other.id
+        )
+        self.session.commit()
+        self.reopen_session()
+        client = self.session.query(Client).filter_by(email="bulkclient@example.com").one()
+        other_client = self.session.query(Client).filter_by(email="otherclient@example.com").one()
+
+        # Create two unsigned contracts for the commercial user and one for the other collaborator
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        for client_id in (client.id, client.id, other_client.id):
+            MainController.create_contract(client_id=client_id, total_amount=1000.0, amount_due=500.0, signed=False)
+        self.session.commit()
+        self.reopen_session()
+        first, second = self.session.query(Contract).filter_by(client_id=client.id).order_by(Contract.id).all()
+        foreign = self.session.query(Contract).filter_by(client_id=other_client.id).one()
+
+        # Sign the contracts as the commercial user: the other collaborator's contract and unknown IDs are skipped
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        result = MainController.sign_contracts([first.id, second.id, foreign.id, 999999])
+        print("Sign contracts result:", result)
+        self.assertEqual(
+            result,
+            "2 contracts updated successfully. "
+            f"Left unchanged (not found, not yours or already up to date): {foreign.id}, 999999.",
+        )
+
+        # Signing again changes nothing
+        result = MainController.sign_contracts([first.id])
+        self.assertNotIn("successfully", result)
+
+        # Adjust the amounts of the first contract and settle the second one
+        self.assertIn("successfully", MainController.adjust_contracts([first.id], 10))
+        self.assertIn("successfully", MainController.settle_contracts([second.id]))
+
+        self.session.commit()
+        self.reopen_session()
+        first, second, foreign = (self.session.get(Contract, contract.id) for contract in (first, second, foreign))
+        self.assertTrue(first.signed and second.signed)
+        self.assertFalse(foreign.signed)
+        self.assertEqual((first.total_amount, first.amount_due), (1100.0, 550.0))
+        self.assertEqual((second.total_amount, second.amount_due), (1000.0, 0.0))
+
+        # Amounts are rounded to the cent by the database, without binary floating point error
+        self.assertIn("successfully", MainController.adjust_contracts([first.id], 3.33))
+        self.session.commit()
+        self.reopen_session()
+        first = self.session.get(Contract, first.id)
+        self.assertEqual((first.total_amount, first.amount_due), (Decimal("1136.63"), Decimal("568.32")))
+
+
 if __name__ == "__main__":
     unittest.main()
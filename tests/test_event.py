@@ -1,8 +1,14 @@
+import csv
+import tempfile
 import unittest
+from datetime import datetime, timedelta
 from models.event import Event
+from models.event_archive import EventArchive
 from models.client import Client
 from models.contract import Contract
+from models.department import Department
 from base_test import BaseTest
+from controllers.event_controller import EventController
 from controllers.main_controller import MainController
 from models.user import User
 import os
@@ -183,5 +189,322 @@ class TestEvent(BaseTest):
         )
 
 
+    def test_import_events(self):
+        """Test importing events, rejecting unsigned contracts and invalid date ranges."""
+
+        # Create a client as a commercial user
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Import Events Client", email="importevents@example.com", phone="1234567890", company_name="Co"
+        )
+        client = self.session.query(Client).filter_by(email="importevents@example.com").first()
+
+        # Create a signed and an unsigned contract as a management user
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        MainController.create_contract(client_id=client.id, total_amount=1000.0, amount_due=0.0, signed=True)
+        MainController.create_contract(client_id=client.id, total_amount=2000.0, amount_due=0.0, signed=False)
+        self.session.commit()
+        self.reopen_session()
+        signed, unsigned = self.session.query(Contract).filter_by(client_id=client.id).order_by(Contract.id).all()
+
+        # Import the events as the commercial user
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.csv")
+            reject_path = os.path.join(directory, "rejects.csv")
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                start, end = "2099-06-01 18:00:00", "2099-06-02 02:00:00"
+                writer.writerow(
+                    ["contract_id", "event_name", "event_date_start", "event_date_end", "location", "attendees"]
+                )
+                writer.writerow([signed.id, "Imported Gala", start, end, "Paris", "150"])
+                writer.writerow([unsigned.id, "Unsigned", start, end, "Paris", "150"])
+                writer.writerow([signed.id, "Backwards", end, start, "Lyon", "20"])
+                writer.writerow([999999, "No Contract", start, end, "Nice", "20"])
+
+            result = MainController.import_events(path, reject_path=reject_path)
+            print("Import events result:", result)
+            self.assertEqual(result, f"1 events imported successfully. 3 rows rejected, see {reject_path}.")
+
+            with open(reject_path, newline="") as file:
+                errors = [reject["error"] for reject in csv.DictReader(file)]
+            self.assertEqual(
+                errors,
+                [
+                    "The contract is not signed.",
+                    "Event Date End cannot be before Event Date Start.",
+                    "Contract not found.",
+                ],
+            )
+
+        # Verify that the event was created with the client of its contract
+        self.session.commit()
+        self.reopen_session()
+        event = self.session.query(Event).filter_by(event_name="Imported Gala").one()
+        self.assertEqual(event.client_id, client.id)
+        self.assertIsNone(event.support_contact_id)
+
+    def test_archive_events(self):
+        """Test moving past events to the archive and finding them again with a date range."""
+
+        # Create a client and a signed contract
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Archive Client", email="archiveclient@example.com", phone="1234567890", company_name="Co"
+        )
+        client = self.session.query(Client).filter_by(email="archiveclient@example.com").first()
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        MainController.create_contract(client_id=client.id, total_amount=1000.0, amount_due=0.0, signed=True)
+        MainController.create_collaborator(
+            username="archive_support",
+            password="password123",
+            email="archive_support@example.com",
+            name="Archive Support",
+            department_id=self.session.query(Department).filter_by(name="Support").one().id,
+        )
+        self.session.commit()
+        self.reopen_session()
+        contract = self.session.query(Contract).filter_by(client_id=client.id).one()
+        support_user = self.session.query(User).filter_by(username="archive_support").one()
+
+        # Insert an event that ended two years ago and an upcoming one
+        past = datetime.now().replace(microsecond=0) - timedelta(days=730)
+        upcoming = datetime.now().replace(microsecond=0) + timedelta(days=30)
+        session = self.Session()
+        EventController.insert_events(
+            session,
+            [
+                {
+                    "contract_id": contract.id,
+                    "client_id": client.id,
+                    "event_name": name,
+                    "event_date_start": start,
+                    "event_date_end": start + timedelta(hours=4),
+                    "support_contact_id": support_id,
+                    "location": "Paris",
+                    "attendees": 10,
+                    "notes": "",
+                }
+                for name, start, support_id in (
+                    ("Past Event", past, support_user.id),
+                    ("Upcoming Event", upcoming, None),
+                )
+            ],
+        )
+        session.commit()
+        session.close()
+
+        # Archive the events that ended more than a year ago
+        result = MainController.archive_events(older_than_days=365)
+        print("Archive events result:", result)
+        self.assertEqual(result, "1 events archived successfully.")
+
+        self.session.commit()
+        self.reopen_session()
+        self.assertIsNone(self.session.query(Event).filter_by(event_name="Past Event").first())
+        archived = self.session.query(EventArchive).filter_by(event_name="Past Event").one()
+        self.assertEqual(archived.event_date_start, past)
+        self.assertEqual(archived.support_contact_id, support_user.id)
+
+        # Without a date range only the live events are read; a range reaching into the archive reads both
+        names = [event.event_name for event in MainController.filter_events({"location": "Paris"})]
+        self.assertEqual(names, ["Upcoming Event"])
+        filters = {"location": "Paris", "date_start": (past - timedelta(days=1)).date()}
+        names = [event.event_name for event in MainController.filter_events(filters, stream=True)]
+        self.assertEqual(names, ["Past Event", "Upcoming Event"])
+
+        # The archived event outlives its support contact
+        self.assertIn("successfully", MainController.delete_collaborator(support_user.id))
+        self.session.commit()
+        self.reopen_session()
+        archived = self.session.query(EventArchive).filter_by(event_name="Past Event").one()
+        self.assertIsNone(archived.support_contact_id)
+
+    def test_auto_assign_events(self):
+        """Test that the automatic assignment never gives a support contact two overlapping events."""
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Auto Assign Client", email="autoassignclient@example.com", phone="1234567890", company_name="Co"
+        )
+        client = self.session.query(Client).filter_by(email="autoassignclient@example.com").first()
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        MainController.create_contract(client_id=client.id, total_amount=1000.0, amount_due=0.0, signed=True)
+        self.session.commit()
+        self.reopen_session()
+        contract = self.session.query(Contract).filter_by(client_id=client.id).one()
+
+        # Two overlapping events and a later one, none of them assigned
+        start = datetime.now().replace(microsecond=0) + timedelta(days=60)
+        session = self.Session()
+        EventController.insert_events(
+            session,
+            [
+                {
+                    "contract_id": contract.id,
+                    "client_id": client.id,
+                    "event_name": name,
+                    "event_date_start": start + timedelta(hours=offset),
+                    "event_date_end": start + timedelta(hours=offset + 4),
+                    "location": "Lyon",
+                    "attendees": 10,
+                    "notes": "",
+                }
+                for name, offset in (("Morning Event", 0), ("Noon Event", 2), ("Next Day Event", 24))
+            ],
+        )
+        session.commit()
+        session.close()
+
+        result = MainController.auto_assign_events()
+        print("Auto assign result:", result)
+        self.assertIn("successfully", result)
+
+        self.session.commit()
+        self.reopen_session()
+        support_ids = {
+            event.event_name: event.support_contact_id
+            for event in self.session.query(Event).filter_by(location="Lyon").all()
+        }
+        self.assertIsNotNone(support_ids["Morning Event"])
+        self.assertIsNotNone(support_ids["Next Day Event"])
+        self.assertNotEqual(support_ids["Morning Event"], support_ids["Noon Event"])
+
+    def test_support_contact_conflicts(self):
+        """Test that a support contact cannot be given two overlapping events, and that the report finds them."""
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Conflict Client", email="conflictclient@example.com", phone="1234567890", company_name="Co"
+        )
+        client = self.session.query(Client).filter_by(email="conflictclient@example.com").first()
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        MainController.create_contract(client_id=client.id, total_amount=1000.0, amount_due=0.0, signed=True)
+        self.session.commit()
+        self.reopen_session()
+        contract = self.session.query(Contract).filter_by(client_id=client.id).one()
+        support_user = self.session.query(User).filter_by(username=os.getenv("USER2_USERNAME")).one()
+
+        start = datetime.now().replace(microsecond=0) + timedelta(days=90)
+        session = self.Session()
+        EventController.insert_events(
+            session,
+            [
+                {
+                    "contract_id": contract.id,
+                    "client_id": client.id,
+                    "event_name": name,
+                    "event_date_start": start + timedelta(hours=offset),
+                    "event_date_end": start + timedelta(hours=offset + duration),
+                    "support_contact_id": None,
+                    "location": "Nantes",
+                    "attendees": 10,
+                    "notes": "",
+                }
+                for name, offset, duration in (
+                    ("First Event", 0, 4),
+                    ("Overlapping Event", 2, 4),
+                    ("Evening Event", 4, 4),
+                    ("Long Event", 24, 10),
+                    ("Short Event", 26, 1),
+                    ("Late Event", 29, 1),
+                )
+            ],
+        )
+        session.commit()
+        session.close()
+        events = {event.event_name: event.id for event in self.session.query(Event).filter_by(location="Nantes")}
+
+        # The first event is assigned, the overlapping one is refused, the one starting at its end is accepted
+        result = MainController.update_event(event_id=events["First Event"], support_contact_id=support_user.id)
+        self.assertIn("successfully", result)
+        result = MainController.update_event(event_id=events["Overlapping Event"], support_contact_id=support_user.id)
+        print("Update event result:", result)
+        self.assertIn("Validation Error", result)
+        self.assertIn(f"event {events['First Event']}", result)
+        result = MainController.update_event(event_id=events["Evening Event"], support_contact_id=support_user.id)
+        self.assertIn("successfully", result)
+
+        # An overlap written behind the application's back is found by the report
+        session = self.Session()
+        session.query(Event).filter_by(id=events["Overlapping Event"]).update({"support_contact_id": support_user.id})
+        session.commit()
+        session.close()
+        conflicts = [
+            (conflict.event_id, conflict.conflicting_event_id)
+            for conflict in MainController.find_event_conflicts()
+            if conflict.support_contact_id == support_user.id
+        ]
+        self.assertIn((events["First Event"], events["Overlapping Event"]), conflicts)
+
+        # An event inside a long one is refused even when a shorter event starts between them
+        result = MainController.update_event(event_id=events["Long Event"], support_contact_id=support_user.id)
+        self.assertIn("successfully", result)
+        result = MainController.update_event(event_id=events["Short Event"], support_contact_id=support_user.id)
+        self.assertIn("Validation Error", result)
+        session = self.Session()
+        session.query(Event).filter_by(id=events["Short Event"]).update({"support_contact_id": support_user.id})
+        session.commit()
+        session.close()
+        result = MainController.update_event(event_id=events["Late Event"], support_contact_id=support_user.id)
+        self.assertIn("Validation Error", result)
+        self.assertIn(f"event {events['Long Event']}", result)
+
+    def test_export_calendar(self):
+        """Test the iCalendar export of a support contact's events, then an incremental update of the file."""
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Calendar Client", email="calendarclient@example.com", phone="1234567890", company_name="Co"
+        )
+        client = self.session.query(Client).filter_by(email="calendarclient@example.com").first()
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        MainController.create_contract(client_id=client.id, total_amount=1000.0, amount_due=0.0, signed=True)
+        self.session.commit()
+        self.reopen_session()
+        contract = self.session.query(Contract).filter_by(client_id=client.id).one()
+        support_user = self.session.query(User).filter_by(username=os.getenv("USER2_USERNAME")).one()
+
+        start = datetime.now().replace(microsecond=0) + timedelta(days=120)
+        session = self.Session()
+        EventController.insert_events(
+            session,
+            [
+                {
+                    "contract_id": contract.id,
+                    "client_id": client.id,
+                    "event_name": "Calendar Event",
+                    "event_date_start": start,
+                    "event_date_end": start + timedelta(hours=4),
+                    "support_contact_id": support_user.id,
+                    "location": "Bordeaux",
+                    "attendees": 10,
+                    "notes": "",
+                }
+            ],
+        )
+        session.commit()
+        session.close()
+        event = self.session.query(Event).filter_by(event_name="Calendar Event").one()
+
+        # The support contact exports their own feed
+        self.authenticate_user(os.getenv("USER2_USERNAME"), os.getenv("USER2_PASSWORD"))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "support.ics")
+            result = MainController.export_calendar(path=path)
+            print("Export calendar result:", result)
+            self.assertIn("successfully", result)
+            with open(path, encoding="utf-8") as file:
+                content = file.read()
+            self.assertIn(f"UID:event-{event.id}@epicevents", content)
+            self.assertIn("LOCATION:Bordeaux", content)
+
+            # The incremental export keeps the event, regenerated or not, and does not duplicate it
+            result = MainController.export_calendar(path=path, incremental=True)
+            self.assertIn("0 removed, 1 in the calendar", result)
+
+        # Support contacts cannot export the feed of a client
+        result = MainController.export_calendar(client_id=client.id, path=os.devnull)
+        self.assertEqual(result, "You are not authorized to export this calendar.")
+
+
 if __name__ == "__main__":
     unittest.main()
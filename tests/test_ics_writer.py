@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from utils.ics_writer import FEED_PROPERTY, escape_text, fold, format_event, read_calendar, write_calendar_file
+
+
+class TestIcsWriter(unittest.TestCase):
+    """
+    TestIcsWriter checks the iCalendar formatting and the reading back of the calendars for incremental exports.
+    """
+
+    def test_escape_and_fold(self):
+        """Test the escaping of TEXT values and the folding of long lines on character boundaries."""
+        self.assertEqual(escape_text("a;b,c\\d\ne"), "a\\;b\\,c\\\\d\\ne")
+        self.assertEqual(fold("SUMMARY:short"), "SUMMARY:short\r\n")
+
+        line = "DESCRIPTION:" + "é" * 100
+        folded = fold(line)
+        parts = folded.split("\r\n")[:-1]
+        self.assertTrue(all(len(part.encode("utf-8")) <= 75 for part in parts))
+        self.assertEqual(parts[0] + "".join(part[1:] for part in parts[1:]), line)
+
+    def test_write_and_read_calendar(self):
+        """Test that a written calendar gives back its feed and its VEVENT blocks by UID."""
+        stamp = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        blocks = [
+            format_event(event_id, f"Event {event_id}", datetime(2030, 2, day, 9), datetime(2030, 2, day, 18), stamp)
+            for event_id, day in ((1, 1), (2, 2))
+        ]
+        self.assertIn("DTSTART:20300201T090000\r\n", blocks[0])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "support.ics")
+            self.assertEqual(write_calendar_file(path, blocks, "Support", {FEED_PROPERTY: "support-3"}), 2)
+            with open(path, encoding="utf-8", newline="") as file:
+                content = file.read()
+            self.assertTrue(content.startswith("BEGIN:VCALENDAR\r\n") and content.endswith("END:VCALENDAR\r\n"))
+
+            properties, read_blocks = read_calendar(path)
+        self.assertEqual(properties, {FEED_PROPERTY: "support-3"})
+        self.assertEqual(list(read_blocks), ["event-1@epicevents", "event-2@epicevents"])
+        self.assertEqual(list(read_blocks.values()), blocks)
+
+
+if __name__ == "__main__":
+    unittest.main()
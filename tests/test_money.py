@@ -0,0 +1,34 @@
+import unittest
+from decimal import Decimal
+from utils.money import to_cents, to_money
+
+
+class TestMoney(unittest.TestCase):
+    """
+    TestMoney checks the conversion of amounts to Decimal cents.
+    """
+
+    def test_to_money(self):
+        """Test that amounts are rounded half up to the cent from their decimal representation."""
+        self.assertEqual(to_money(0.1), Decimal("0.10"))
+        self.assertEqual(to_money(0.1 + 0.2), Decimal("0.30"))
+        self.assertEqual(to_money("2.675"), Decimal("2.68"))
+        self.assertEqual(to_money(2.675), Decimal("2.68"))
+        self.assertEqual(to_money(5000), Decimal("5000.00"))
+        self.assertEqual(str(to_money(Decimal("1.5"))), "1.50")
+
+    def test_invalid_amounts(self):
+        """Test that values which are not finite numbers are refused."""
+        for value in ("abc", "nan", "inf", float("nan"), None):
+            with self.assertRaises(ValueError):
+                to_money(value)
+
+    def test_to_cents(self):
+        """Test the conversion to an integer number of cents."""
+        self.assertEqual(to_cents("1136.625"), 113663)
+        self.assertEqual(to_cents(0), 0)
+        self.assertIsInstance(to_cents(12.5), int)
+
+
+if __name__ == "__main__":
+    unittest.main()
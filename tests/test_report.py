@@ -0,0 +1,170 @@
+import tempfile
+import unittest
+from datetime import date, timedelta
+from base_test import BaseTest
+from controllers.main_controller import MainController
+from models.client import Client
+from models.contract import Contract
+from models.summary import CommercialSummary
+from models.user import User
+from utils.commissions import parse_rules
+import os
+
+
+class TestReport(BaseTest):
+    """
+    TestReport class performs integration tests for the management reports of the EpicEvents application.
+    """
+
+    def create_contracts(self):
+        """Create a client of the commercial user with a signed and an unsigned contract."""
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        MainController.create_client(
+            full_name="Report Client", email="reportclient@example.com", phone="1234567890", company_name="Co"
+        )
+        client = self.session.query(Client).filter_by(email="reportclient@example.com").first()
+
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        MainController.create_contract(client_id=client.id, total_amount=1000.0, amount_due=250.0, signed=True)
+        MainController.create_contract(client_id=client.id, total_amount=3000.0, amount_due=3000.0, signed=False)
+        self.session.commit()
+
+    def test_revenue_by_commercial(self):
+        """Test the revenue totals of each commercial contact."""
+        self.create_contracts()
+        commercial = self.session.query(User).filter_by(username=os.getenv("USER1_USERNAME")).one()
+
+        rows = list(MainController.revenue_report("commercial"))
+        print("Revenue by commercial:", rows)
+        row = next(row for row in rows if row.commercial_contact_id == commercial.id)
+        self.assertEqual(row.commercial_name, commercial.name)
+        self.assertEqual((row.contracts, row.signed_contracts, row.signed_ratio), (2, 1, 0.5))
+        self.assertEqual((row.total_amount, row.signed_amount, row.amount_due), (4000.0, 1000.0, 3250.0))
+
+    def test_revenue_by_month(self):
+        """Test the monthly revenue, with the signed amount accumulated over the months."""
+        self.create_contracts()
+
+        rows = list(MainController.revenue_report("month"))
+        print("Revenue by month:", rows)
+        self.assertEqual(rows[-1].month, date.today().strftime("%Y-%m"))
+        self.assertEqual((rows[-1].contracts, rows[-1].total_amount), (2, 4000.0))
+        self.assertEqual(rows[-1].cumulative_signed_amount, sum(row.signed_amount for row in rows))
+
+    def test_revenue_as_commercial_should_fail(self):
+        """Test that the reports are reserved to the management department."""
+        self.create_contracts()
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        self.assertEqual(list(MainController.revenue_report("commercial")), [])
+
+    def test_aging_report(self):
+        """Test that the amounts due move to older buckets as the contracts age."""
+        self.create_contracts()
+        client = self.session.query(Client).filter_by(email="reportclient@example.com").one()
+
+        rows = list(MainController.aging_report("client"))
+        print("Aging by client:", rows)
+        row = next(row for row in rows if row.id == client.id)
+        self.assertEqual((row.name, row.contracts, row.total_due), ("Report Client", 2, 3250.0))
+        self.assertEqual((row.days_0_30, row.days_31_60, row.days_61_90, row.days_over_90), (3250.0, 0, 0, 0))
+
+        rows = list(MainController.aging_report("commercial", date.today() + timedelta(days=45)))
+        commercial = self.session.query(User).filter_by(username=os.getenv("USER1_USERNAME")).one()
+        row = next(row for row in rows if row.id == commercial.id)
+        self.assertEqual((row.days_0_30, row.days_31_60, row.total_due), (0, 3250.0, 3250.0))
+
+        rows = list(MainController.aging_report("client", date.today() + timedelta(days=91)))
+        row = next(row for row in rows if row.id == client.id)
+        self.assertEqual(row.days_over_90, 3250.0)
+
+    def test_analytics_report(self):
+        """Test that the snapshot slices match the SQL reports, and that a stale cache is reloaded."""
+        self.create_contracts()
+        client = self.session.query(Client).filter_by(email="reportclient@example.com").one()
+        commercial = self.session.query(User).filter_by(username=os.getenv("USER1_USERNAME")).one()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rows = MainController.analytics_report("commercial", cache_dir=cache_dir)
+            print("Analytics by commercial:", rows)
+            expected = [
+                (row.commercial_contact_id, row.contracts, row.signed_contracts, row.total_amount, row.amount_due)
+                for row in MainController.revenue_report("commercial")
+            ]
+            self.assertEqual(
+                [(row.key, row.contracts, row.signed_contracts, row.total_amount, row.amount_due) for row in rows],
+                expected,
+            )
+
+            # The cached snapshot is reused until a write changes the tables
+            rows = MainController.analytics_report("commercial", signed=False, cache_dir=cache_dir)
+            row = next(row for row in rows if row.key == commercial.id)
+            self.assertEqual((row.contracts, row.total_amount), (1, 3000.0))
+            MainController.create_contract(client_id=client.id, total_amount=500.0, amount_due=500.0, signed=False)
+            self.session.commit()
+            rows = MainController.analytics_report("commercial", signed=False, cache_dir=cache_dir)
+            row = next(row for row in rows if row.key == commercial.id)
+            self.assertEqual((row.contracts, row.total_amount), (2, 3500.0))
+
+        rows = MainController.analytics_report("month", date_from=date.today(), date_to=date.today())
+        self.assertEqual([(row.key, row.contracts) for row in rows], [(date.today().strftime("%Y-%m"), 3)])
+
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        self.assertEqual(MainController.analytics_report("month"), [])
+
+    def test_commission_report(self):
+        """Test the commissions on the signed contracts of the period, with a tiered rule."""
+        self.create_contracts()
+        commercial = self.session.query(User).filter_by(username=os.getenv("USER1_USERNAME")).one()
+        tiers = [{"from": 0, "rate": 2}, {"from": 500, "rate": 4}]
+        rules = parse_rules({"default": 5, "commercials": {str(commercial.id): tiers}})
+
+        rows = MainController.commission_report(rules, date_from=date.today(), date_to=date.today())
+        print("Commissions:", rows)
+        row = next(row for row in rows if row.commercial_contact_id == commercial.id)
+        self.assertEqual((row.commercial_name, row.contracts, row.signed_amount), (commercial.name, 1, 1000.0))
+        self.assertEqual((row.commission, row.effective_rate), (30.0, 0.03))
+
+        # The contracts of another period are left out
+        rows = MainController.commission_report(rules, date_to=date.today() - timedelta(days=1))
+        self.assertNotIn(commercial.id, [row.commercial_contact_id for row in rows])
+
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        self.assertEqual(MainController.commission_report(rules), [])
+
+    def test_dashboard_follows_writes(self):
+        """Test that the commercial summary is updated by each write and matches a rebuild."""
+        self.create_contracts()
+        commercial = self.session.query(User).filter_by(username=os.getenv("USER1_USERNAME")).one()
+
+        # The summary was maintained by the client and contract creations
+        self.authenticate_user(os.getenv("USER1_USERNAME"), os.getenv("USER1_PASSWORD"))
+        commercials, supports = MainController.get_dashboard()
+        self.assertEqual(supports, [])
+        summary = commercials[0]
+        self.assertEqual(summary.user_id, commercial.id)
+        self.assertEqual((summary.client_count, summary.contract_count), (1, 2))
+        self.assertEqual((summary.signed_total, summary.outstanding), (1000.0, 3250.0))
+
+        # Settling a contract updates the outstanding amount
+        contract = self.session.query(Contract).filter_by(commercial_contact_id=commercial.id, signed=False).one()
+        self.assertIn("successfully", MainController.settle_contracts([contract.id]))
+        commercials, _ = MainController.get_dashboard()
+        self.assertEqual(commercials[0].outstanding, 250.0)
+
+        # Commercials cannot read the figures of another collaborator
+        self.assertEqual(MainController.get_dashboard(commercial.id + 1000), ([], []))
+
+        # A rebuild gives the same figures
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        result = MainController.rebuild_summaries()
+        print("Rebuild summaries result:", result)
+        self.assertIn("successfully", result)
+        self.session.commit()
+        self.reopen_session()
+        summary = self.session.get(CommercialSummary, commercial.id)
+        self.assertEqual((summary.client_count, summary.contract_count), (1, 2))
+        self.assertEqual((summary.signed_total, summary.outstanding), (1000.0, 250.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
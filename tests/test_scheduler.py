@@ -0,0 +1,58 @@
+import unittest
+from datetime import datetime, timedelta
+from utils.scheduler import IntervalIndex, Slot, find_overlaps, schedule
+
+MONDAY = datetime(2030, 1, 7, 9)
+
+
+def slot(event_id: int, start_hour: int, duration: int) -> Slot:
+    start = MONDAY + timedelta(hours=start_hour)
+    return Slot(event_id, start, start + timedelta(hours=duration))
+
+
+class TestScheduler(unittest.TestCase):
+    """
+    TestScheduler checks the interval index and the greedy assignment of events to support contacts.
+    """
+
+    def test_interval_index(self):
+        """Test the overlap checks, with half-open ranges and merged overlapping ranges."""
+        index = IntervalIndex([(1, 3), (2, 5), (8, 10)])
+        self.assertEqual((index.starts, index.ends), ([1, 8], [5, 10]))
+        self.assertTrue(index.overlaps(4, 6))
+        self.assertFalse(index.overlaps(5, 8))
+        self.assertFalse(index.overlaps(0, 1))
+
+        index.add(5, 8)
+        self.assertEqual((index.starts, index.ends), ([1, 5, 8], [5, 8, 10]))
+        index.add(4, 9)
+        self.assertEqual((index.starts, index.ends), ([1], [10]))
+        index.add(12, 13)
+        self.assertEqual(len(index), 2)
+
+    def test_balances_hours(self):
+        """Test that each event goes to the support contact with the fewest scheduled hours."""
+        busy = {1: [(MONDAY - timedelta(days=1), MONDAY - timedelta(days=1) + timedelta(hours=6))], 2: []}
+        result = schedule([slot(10, 0, 4), slot(11, 24, 4), slot(12, 48, 4)], busy)
+        self.assertEqual(result.assignments, {1: [12], 2: [10, 11]})
+        self.assertEqual(result.unassigned, [])
+
+    def test_avoids_overlaps(self):
+        """Test that overlapping events go to different contacts, or stay unassigned when no one is free."""
+        events = [slot(10, 0, 4), slot(11, 2, 4), slot(12, 3, 2), slot(13, 4, 2)]
+        result = schedule(events, {1: [], 2: []})
+        self.assertEqual(result.assignments, {1: [10, 13], 2: [11]})
+        self.assertEqual(result.unassigned, [12])
+
+        self.assertEqual(schedule(events, {}).unassigned, [10, 11, 12, 13])
+
+    def test_find_overlaps(self):
+        """Test that the sweep reports each event overlapping an earlier one, against the one ending last."""
+        slots = [slot(10, 0, 8), slot(11, 1, 2), slot(12, 4, 2), slot(13, 8, 2), slot(14, 9, 1)]
+        pairs = [(earlier.id, later.id) for earlier, later in find_overlaps(slots)]
+        self.assertEqual(pairs, [(10, 11), (10, 12), (13, 14)])
+        self.assertEqual(list(find_overlaps([])), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
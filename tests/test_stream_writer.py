@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+import unittest
+from datetime import date, datetime
+from utils.stream_writer import write_rows
+
+
+class TestStreamWriter(unittest.TestCase):
+    """
+    TestStreamWriter checks the machine-readable output formats of the list and filter commands.
+    """
+
+    rows = [
+        {"id": 1, "full_name": "Alice", "date_created": date(2024, 7, 1), "last_contact_date": None},
+        {"id": 2, "full_name": "Bob, Jr", "date_created": date(2024, 7, 2), "last_contact_date": datetime(2024, 7, 3)},
+    ]
+
+    def write(self, output_format, rows=None):
+        stream = io.StringIO()
+        count = write_rows(iter(self.rows if rows is None else rows), output_format, stream)
+        return count, stream.getvalue()
+
+    def test_json(self):
+        """Test that the JSON array is valid and serializes dates."""
+        count, output = self.write("json")
+        self.assertEqual(count, 2)
+        self.assertEqual(json.loads(output)[1]["last_contact_date"], "2024-07-03T00:00:00")
+
+    def test_json_empty(self):
+        """Test that an empty result is still a valid JSON document."""
+        count, output = self.write("json", [])
+        self.assertEqual(count, 0)
+        self.assertEqual(json.loads(output), [])
+
+    def test_jsonl(self):
+        """Test that every row is written as one JSON document per line."""
+        count, output = self.write("jsonl")
+        lines = output.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["date_created"], "2024-07-01")
+
+    def test_csv_and_tsv(self):
+        """Test that delimited outputs start with a header and quote values when needed."""
+        for output_format, delimiter in (("csv", ","), ("tsv", "\t")):
+            count, output = self.write(output_format)
+            parsed = list(csv.reader(io.StringIO(output), delimiter=delimiter))
+            self.assertEqual(parsed[0], ["id", "full_name", "date_created", "last_contact_date"])
+            self.assertEqual(parsed[2][1], "Bob, Jr")
+            self.assertEqual(count, 2)
+
+    def test_unsupported_format(self):
+        """Test that an unknown format is rejected."""
+        with self.assertRaises(ValueError):
+            self.write("xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+from utils.table_printer import TablePager
+
+
+class TestTablePager(unittest.TestCase):
+    """
+    TestTablePager checks that the paged table renderer only pulls and formats the rows of the visible page.
+    """
+
+    def test_iterable_source_is_consumed_lazily(self):
+        """Test that a lazy iterable is only consumed up to the requested page."""
+        consumed = []
+
+        def rows():
+            for i in range(1000):
+                consumed.append(i)
+                yield {"ID": i}
+
+        pager = TablePager(rows(), page_size=10)
+        page_rows, has_next = pager.get_page(0)
+
+        self.assertEqual([row["ID"] for row in page_rows], list(range(10)))
+        self.assertTrue(has_next)
+        self.assertEqual(len(consumed), 11)
+
+    def test_callable_source_fetches_one_page(self):
+        """Test that a paginated fetcher receives the page offset and a limit of one extra row."""
+        calls = []
+
+        def fetch(offset, limit):
+            calls.append((offset, limit))
+            return [{"ID": i} for i in range(offset, min(offset + limit, 25))]
+
+        pager = TablePager(fetch, page_size=10)
+        page_rows, has_next = pager.get_page(2)
+
+        self.assertEqual(calls, [(20, 11)])
+        self.assertEqual([row["ID"] for row in page_rows], list(range(20, 25)))
+        self.assertFalse(has_next)
+
+    def test_navigation(self):
+        """Test next, previous and jump commands render the expected pages, and other words are rejected."""
+        pager = TablePager([{"ID": i} for i in range(45)], page_size=10)
+        rendered = []
+
+        with patch.object(pager, "render", lambda rows: rendered.append(rows[0]["ID"])), patch(
+            "builtins.input", side_effect=["n", "n", "p", "j 5", "j 9", "jump 2", "j", "3", "pj 1", "jam 4", "n 2", "q"]
+        ):
+            self.assertTrue(pager.run())
+
+        self.assertEqual(rendered, [0, 10, 20, 10, 40, 10, 20])
+
+    def test_empty_source(self):
+        """Test that an empty source is reported without prompting."""
+        with patch("builtins.input") as mocked_input:
+            self.assertFalse(TablePager([], page_size=10).run())
+        mocked_input.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import click
+from click.testing import CliRunner
+from config import Config
+from utils.telemetry import FileSink, SentrySink, Telemetry
+from views.telemetry_command import TelemetryGroup
+
+
+class RecordingSink:
+    """
+    Sink keeping the reported exceptions and finished spans in memory.
+    """
+
+    records_sql = True
+
+    def __init__(self):
+        self.started = False
+        self.exceptions = []
+        self.spans = []
+
+    def start(self):
+        self.started = True
+
+    def capture_exception(self, error):
+        self.exceptions.append(error)
+
+    def start_span(self, op, description, parent):
+        return {"op": op, "description": description, "parent": parent}
+
+    def finish_span(self, span, duration, error=None):
+        self.spans.append(span)
+
+
+class TestTelemetry(unittest.TestCase):
+    """
+    TestTelemetry checks the error capture policy and the span sampling.
+    """
+
+    def setUp(self):
+        self.sink = RecordingSink()
+        Telemetry.set_sink(self.sink)
+
+    def tearDown(self):
+        Telemetry.set_sink(None)
+
+    def test_exception_reported_once(self):
+        """Test that an exception caught and reported by several layers is sent once."""
+        error = ValueError("boom")
+        Telemetry.capture_exception(error)
+        Telemetry.capture_exception(error)
+        self.assertEqual(self.sink.exceptions, [error])
+
+    def test_expected_errors_rate_limited(self):
+        """Test that identical expected errors are reported at most once per interval."""
+        with mock.patch.object(Config, "EXPECTED_ERROR_INTERVAL", 300):
+            Telemetry.capture_exception(ValueError("Token has expired"), expected=True)
+            Telemetry.capture_exception(ValueError("Token has expired"), expected=True)
+            Telemetry.capture_exception(ValueError("Other"), expected=True)
+        self.assertEqual([str(e) for e in self.sink.exceptions], ["Token has expired", "Other"])
+
+    def test_expected_errors_disabled(self):
+        """Test that expected errors are dropped when CAPTURE_EXPECTED_ERRORS is off."""
+        with mock.patch.object(Config, "CAPTURE_EXPECTED_ERRORS", False):
+            Telemetry.capture_exception(ValueError("Invalid"), expected=True)
+        self.assertEqual(self.sink.exceptions, [])
+
+    def test_unsampled_operation_records_nothing(self):
+        """Test that no span is recorded when the operation is not sampled."""
+        with mock.patch.object(Config, "TRACES_SAMPLE_RATE", 0.0):
+            with Telemetry.span("controller", "outer"):
+                with Telemetry.span("db", "SELECT 1"):
+                    pass
+        self.assertEqual(self.sink.spans, [])
+
+    def test_sampled_operation_records_children(self):
+        """Test that child spans are recorded inside a sampled root span."""
+        with mock.patch.object(Config, "TRACES_SAMPLE_RATE", 1.0):
+            with Telemetry.span("controller", "outer"):
+                with Telemetry.span("db", "SELECT 1"):
+                    pass
+        self.assertEqual([span["description"] for span in self.sink.spans], ["SELECT 1", "outer"])
+        self.assertEqual(self.sink.spans[0]["parent"]["description"], "outer")
+
+    def test_file_sink(self):
+        """Test that the file sink writes one JSON line per record."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "telemetry.jsonl")
+            Telemetry.set_sink(FileSink(path))
+            with mock.patch.object(Config, "TRACES_SAMPLE_RATE", 1.0):
+                with Telemetry.span("controller", "get_clients"):
+                    pass
+            Telemetry.capture_exception(RuntimeError("down"))
+            with open(path, encoding="utf-8") as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual([record["type"] for record in records], ["span", "exception"])
+        self.assertEqual(records[0]["description"], "get_clients")
+
+    def test_start(self):
+        """Test that starting the telemetry initializes the Sentry SDK once, before any report."""
+        Telemetry.start()
+        self.assertTrue(self.sink.started)
+
+        sentry_sdk = mock.Mock()
+        with mock.patch.dict(sys.modules, {"sentry_sdk": sentry_sdk}):
+            Telemetry.set_sink(SentrySink("https://key@sentry.example.com/1"))
+            Telemetry.start()
+            sentry_sdk.init.assert_called_once()
+            Telemetry.capture_exception(RuntimeError("down"))
+        sentry_sdk.init.assert_called_once()
+        sentry_sdk.capture_exception.assert_called_once()
+
+
+    def test_commands_start_telemetry(self):
+        """Test that the commands start the telemetry before running, but not for their help pages."""
+
+        @click.group(cls=TelemetryGroup)
+        def group():
+            pass
+
+        @group.command()
+        def run():
+            click.echo(self.sink.started)
+
+        result = CliRunner().invoke(group, ["run", "--help"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertFalse(self.sink.started)
+
+        result = CliRunner().invoke(group, ["run"])
+        self.assertEqual(result.output, "True\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 import unittest
 from base_test import BaseTest
 from controllers.main_controller import MainController
+from controllers.client_controller import ClientController
+from models.client import Client
+from models.contract import Contract
 from models.user import User
 from models.department import Department
+from datetime import date
 import os
 
 
@@ -208,6 +212,122 @@ class TestUser(BaseTest):
         collaborator = self.session.query(User).filter_by(id=collaborator_id).first()
         self.assertIsNotNone(collaborator, "Collaborator should still be found in the database")
 
+    def test_delete_collaborator_in_chunks(self):
+        """Test deleting a collaborator and their portfolio by chunks."""
+
+        # Authenticate as a management user and create a commercial with three clients, each with a contract
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        department_id = self.session.query(Department).filter_by(name="Commercial").first().id
+        MainController.create_collaborator(
+            username="large_portfolio",
+            password="password123",
+            email="large_portfolio@example.com",
+            name="Large Portfolio",
+            department_id=department_id,
+        )
+        self.session.commit()
+        self.reopen_session()
+        collaborator = self.session.query(User).filter_by(username="large_portfolio").one()
+        for index in range(3):
+            ClientController.create_client(
+                f"Portfolio Client {index}",
+                f"portfolio{index}@example.com",
+                "1234567890",
+                "Co",
+                date.today(),
+                collaborator.id,
+            )
+        self.session.commit()
+        self.reopen_session()
+        clients = self.session.query(Client).filter_by(commercial_contact_id=collaborator.id).all()
+        client_ids = [client.id for client in clients]
+        for client_id in client_ids:
+            MainController.create_contract(client_id=client_id, total_amount=1000.0, amount_due=0.0, signed=True)
+
+        # Delete the collaborator two clients at a time
+        result = MainController.delete_collaborator(collaborator.id, chunk_size=2)
+        print("Delete collaborator result:", result)
+        self.assertIn("successfully", result)
+
+        # The clients and their contracts were deleted by the database cascades
+        self.session.commit()
+        self.reopen_session()
+        self.assertIsNone(self.session.query(User).filter_by(id=collaborator.id).first())
+        self.assertEqual(self.session.query(Client).filter(Client.id.in_(client_ids)).count(), 0)
+        self.assertEqual(self.session.query(Contract).filter(Contract.client_id.in_(client_ids)).count(), 0)
+
+    def test_reassign_collaborator_as_management(self):
+        """Test moving the portfolio of a departing commercial to two other commercials."""
+
+        # Authenticate as a management user and create three commercials
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        department_id = self.session.query(Department).filter_by(name="Commercial").first().id
+        for username in ("departing_commercial", "first_target", "second_target"):
+            MainController.create_collaborator(
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+                name=username.replace("_", " ").title(),
+                department_id=department_id,
+            )
+        self.session.commit()
+        self.reopen_session()
+        departing, first_target, second_target = (
+            self.session.query(User).filter_by(username=username).one()
+            for username in ("departing_commercial", "first_target", "second_target")
+        )
+
+        # Give three clients with a contract each to the departing commercial, and one client to the second target
+        for index in range(3):
+            ClientController.create_client(
+                f"Departing Client {index}",
+                f"departing{index}@example.com",
+                "1234567890",
+                "Co",
+                date.today(),
+                departing.id,
+            )
+        ClientController.create_client(
+            "Existing Client", "existing@example.com", "1234567890", "Co", date.today(), second_target.id
+        )
+        self.session.commit()
+        self.reopen_session()
+        for client in self.session.query(Client).filter(Client.email.like("departing%")).all():
+            MainController.create_contract(client_id=client.id, total_amount=1000.0, amount_due=0.0, signed=True)
+
+        # Reassign with load balancing and a chunk size forcing several transactions
+        result = MainController.reassign_collaborator(
+            departing.id, [first_target.id, second_target.id], balance=True, chunk_size=2
+        )
+        print("Reassign collaborator result:", result)
+        self.assertIn("successfully", result)
+        self.assertIn("3 clients, 3 contracts, 0 events and 0 archived events", result)
+
+        # The least loaded target received more clients, and the contracts followed their client
+        self.session.commit()
+        self.reopen_session()
+        self.assertIsNone(self.session.query(User).filter_by(id=departing.id).first())
+        clients = self.session.query(Client).filter(Client.email.like("departing%")).all()
+        owners = [client.commercial_contact_id for client in clients]
+        self.assertEqual(owners.count(first_target.id), 2)
+        self.assertEqual(owners.count(second_target.id), 1)
+        for client in clients:
+            contract = self.session.query(Contract).filter_by(client_id=client.id).one()
+            self.assertEqual(contract.commercial_contact_id, client.commercial_contact_id)
+
+    def test_reassign_collaborator_to_another_department_should_fail(self):
+        """Test reassigning a commercial's portfolio to a support collaborator should fail."""
+
+        self.authenticate_user(os.getenv("USER3_USERNAME"), os.getenv("USER3_PASSWORD"))
+        commercial = self.session.query(User).filter_by(username=os.getenv("USER1_USERNAME")).one()
+        support = self.session.query(User).filter_by(username=os.getenv("USER2_USERNAME")).one()
+
+        result = MainController.reassign_collaborator(commercial.id, [support.id])
+        print("Reassign collaborator result:", result)
+        self.assertEqual(result, "Validation Error: Target collaborators must belong to the same department.")
+        self.session.commit()
+        self.assertIsNotNone(self.session.query(User).filter_by(id=commercial.id).first())
+
 
 if __name__ == "__main__":
     unittest.main()